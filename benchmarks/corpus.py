@@ -0,0 +1,205 @@
+# Copyright 2018 Digital Domain 3.0
+#
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#
+# 6. Trademarks. This License does not grant permission to use the trade
+#    names, trademarks, service marks, or product names of the Licensor
+#    and its affiliates, except as required to comply with Section 4(c) of
+#    the License and to reproduce the content of the NOTICE file.
+#
+# You may obtain a copy of the Apache License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+"""
+corpus generates PyQt4 and PySide sources of a set size that use the
+features that qt_py_convert has to convert.
+"""
+import random
+
+
+# The features that a source can be made with. Each one is a function that
+#   writes the lines of one method body.
+FEATURES = (
+    "imports",
+    "star_imports",
+    "signals",
+    "qvariant",
+    "tometh",
+    "pyuic",
+)
+
+BINDINGS = ("PyQt4", "PySide")
+
+_WIDGETS = (
+    "QLineEdit", "QPushButton", "QLabel", "QComboBox", "QCheckBox",
+    "QSpinBox", "QTreeWidget", "QTextEdit",
+)
+_SIGNALS = (
+    "clicked()", "textChanged(QString)", "currentIndexChanged(int)",
+    "toggled(bool)", "valueChanged(int)",
+)
+_TOMETH = ("toString", "toInt", "toBool", "toPyObject", "toFloat")
+
+
+def _imports_body(rand, number):
+    widget = rand.choice(_WIDGETS)
+    return [
+        "widget = QtGui.{widget}(self)".format(widget=widget),
+        "layout = QtGui.QVBoxLayout(self)",
+        "layout.addWidget(widget)",
+        "self.setSizePolicy(QtGui.QSizePolicy.Expanding, "
+        "QtGui.QSizePolicy.Fixed)",
+        "return QtGui.QWidget.sizeHint(widget)",
+    ]
+
+
+def _star_imports_body(rand, number):
+    widget = rand.choice(_WIDGETS)
+    return [
+        "widget = {widget}(self)".format(widget=widget),
+        "layout = QVBoxLayout(self)",
+        "layout.addWidget(widget)",
+        "timer = QTimer(self)",
+        "return QSize(widget.width(), {number})".format(number=number),
+    ]
+
+
+def _signals_body(rand, number):
+    return [
+        "button = QtGui.QPushButton(self)",
+        "self.connect(button, QtCore.SIGNAL('{signal}'), self.on_{number})"
+        .format(signal=rand.choice(_SIGNALS), number=number),
+        "self.connect(button, QtCore.SIGNAL('clicked()'), self, "
+        "QtCore.SLOT('close()'))",
+        "self.emit(QtCore.SIGNAL('changed(int)'), {number})".format(
+            number=number
+        ),
+        "return button",
+    ]
+
+
+def _qvariant_body(rand, number):
+    return [
+        "value = QtCore.QVariant({number})".format(number=number),
+        "name = QtCore.QString('item_{number}')".format(number=number),
+        "empty = QtCore.QVariant()",
+        "letter = QtCore.QChar('a')",
+        "return value, name, empty, letter",
+    ]
+
+
+def _tometh_body(rand, number):
+    return [
+        "data = self.model.data(self.index, {number})".format(number=number),
+        "text = data.{method}()".format(method=rand.choice(_TOMETH)),
+        "other = self.settings.value('key_{number}').{method}()".format(
+            number=number, method=rand.choice(_TOMETH)
+        ),
+        "label = QtGui.QLabel(text)",
+        "return label, other",
+    ]
+
+
+def _pyuic_body(rand, number):
+    widget = rand.choice(_WIDGETS)
+    name = "{widget}_{number}".format(widget=widget[1:].lower(), number=number)
+    return [
+        "self.{name} = QtGui.{widget}(Form)".format(name=name, widget=widget),
+        "self.{name}.setGeometry(QtCore.QRect(10, {y}, 120, 24))".format(
+            name=name, y=number * 30
+        ),
+        "self.{name}.setObjectName(_fromUtf8('{name}'))".format(name=name),
+        "self.{name}.setToolTip(QtGui.QApplication.translate('Form', "
+        "'{name}', None, QtGui.QApplication.UnicodeUTF8))".format(name=name),
+        "QtCore.QMetaObject.connectSlotsByName(Form)",
+    ]
+
+
+_BODIES = {
+    "imports": _imports_body,
+    "star_imports": _star_imports_body,
+    "signals": _signals_body,
+    "qvariant": _qvariant_body,
+    "tometh": _tometh_body,
+    "pyuic": _pyuic_body,
+}
+
+
+def _filler(rand, number):
+    """A line of plain python, for the parts of a source without any Qt."""
+    return "total_{number} = sum(range({value})) * {value}".format(
+        number=number, value=rand.randint(1, 100)
+    )
+
+
+def _header(binding, features):
+    lines = []
+    if "star_imports" in features:
+        lines.append("from {binding}.QtGui import *".format(binding=binding))
+        lines.append("from {binding}.QtCore import *".format(binding=binding))
+    lines.append("from {binding} import QtGui, QtCore".format(binding=binding))
+    if "pyuic" in features:
+        lines.extend([
+            "",
+            "try:",
+            "    _fromUtf8 = QtCore.QString.fromUtf8",
+            "except AttributeError:",
+            "    def _fromUtf8(s):",
+            "        return s",
+        ])
+    return lines
+
+
+def generate(lines, features=FEATURES, density=1.0, binding="PyQt4", seed=0):
+    """
+    generate writes a source file of about the given number of lines.
+    It is a module level class with one method per block of features, the
+    same arguments always give the same source.
+
+    :param lines: The number of lines to generate, at least.
+    :type lines: int
+    :param features: The features to use, from FEATURES. The methods cycle
+        through them.
+    :type features: tuple[str...]
+    :param density: The share of the methods that use Qt. The rest only have
+        plain python in them.
+    :type density: float
+    :param binding: The binding to write the source for, from BINDINGS.
+    :type binding: str
+    :param seed: Seed for the choices of widgets, signals and methods.
+    :type seed: int
+    :return: The source.
+    :rtype: str
+    """
+    for feature in features:
+        if feature not in _BODIES:
+            raise ValueError(
+                "Unknown feature \"{feature}\", expected one of {known}."
+                .format(feature=feature, known=", ".join(FEATURES))
+            )
+    rand = random.Random(seed)
+    source = _header(binding, features)
+    source.extend(["", "", "class Generated(QtGui.QWidget):"])
+    number = 0
+    while len(source) < lines:
+        if rand.random() < density:
+            body = _BODIES[features[number % len(features)]](rand, number)
+        else:
+            body = [_filler(rand, number + offset) for offset in range(4)]
+            body.append("return None")
+        source.append("")
+        source.append("    def method_{number}(self, Form=None):".format(
+            number=number
+        ))
+        source.extend("        " + line for line in body)
+        number += 1
+    return "\n".join(source) + "\n"
@@ -0,0 +1,347 @@
+# Copyright 2018 Digital Domain 3.0
+#
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#
+# 6. Trademarks. This License does not grant permission to use the trade
+#    names, trademarks, service marks, or product names of the Licensor
+#    and its affiliates, except as required to comply with Section 4(c) of
+#    the License and to reproduce the content of the NOTICE file.
+#
+# You may obtain a copy of the Apache License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+"""
+runner times qt_py_convert.run and each of its stages on the sources from
+corpus, and writes the results out as json to compare between commits.
+"""
+import argparse
+import imp
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import timeit
+
+import qt_py_convert
+from qt_py_convert.profiling import ConversionProfile
+from qt_py_convert.run import run
+
+from benchmarks import corpus
+
+DEFAULT_SIZES = (50, 100, 200, 400)
+MIXED = "mixed"
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+def benchmark(source, repeat=3, **flags):
+    """
+    benchmark converts source repeat times.
+
+    :param source: The source to convert.
+    :type source: str
+    :param repeat: The number of times to convert it.
+    :type repeat: int
+    :param flags: Flags for qt_py_convert.run.run.
+    :return: The total times of every conversion and the median time of
+        every stage, see qt_py_convert.profiling.
+    :rtype: tuple[list[float...],dict]
+    """
+    times = []
+    stages = []
+    for _ in range(repeat):
+        profile = ConversionProfile()
+        start = timeit.default_timer()
+        run(source, profile=profile, **flags)
+        total = timeit.default_timer() - start
+        timings = {}
+        for entry in profile.stages:
+            timings[entry["name"]] = \
+                timings.get(entry["name"], 0.0) + entry["seconds"]
+        # Whatever run does between its stages.
+        timings["other"] = max(0.0, total - sum(
+            entry["seconds"] for entry in profile.stages
+            if entry["parent"] is None
+        ))
+        times.append(total)
+        stages.append(timings)
+    names = set(name for timings in stages for name in timings)
+    return times, dict(
+        (name, _median([timings.get(name, 0.0) for timings in stages]))
+        for name in names
+    )
+
+
+def _exponent(points):
+    """
+    _exponent fits time = a * lines ** k to points and returns k. 1 is
+    linear, anything above it grows faster than the size of the file.
+
+    :param points: (lines, seconds) pairs.
+    :type points: list[tuple[int,float]]
+    :rtype: None|float
+    """
+    points = [(math.log(x), math.log(y)) for x, y in points if x > 0 < y]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if not spread:
+        return None
+    return sum(
+        (x - mean_x) * (y - mean_y) for x, y in points
+    ) / spread
+
+
+def _commit():
+    """The commit that qt_py_convert was loaded from, if it is in git."""
+    folder = os.path.dirname(os.path.abspath(qt_py_convert.__file__))
+    try:
+        process = subprocess.Popen(
+            ["git", "rev-parse", "HEAD"], cwd=folder,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+    except OSError:
+        return None
+    out = process.communicate()[0].strip()
+    return out or None
+
+
+def run_suite(sizes=DEFAULT_SIZES, features=corpus.FEATURES, repeat=3,
+              binding="PyQt4", density=1.0, engine="redbaron", log=None):
+    """
+    run_suite benchmarks a source for every feature on its own and one with
+    all of them, at every size.
+
+    :param sizes: The number of lines of the sources.
+    :type sizes: tuple[int...]
+    :param features: The features to benchmark, from corpus.FEATURES.
+    :type features: tuple[str...]
+    :param repeat: The number of times to convert every source.
+    :type repeat: int
+    :param binding: The binding to write the sources for.
+    :type binding: str
+    :param density: The share of the methods that use Qt.
+    :type density: float
+    :param engine: The engine to convert with, see qt_py_convert.run.run.
+    :type engine: str
+    :param log: If passed, a file to write the progress to.
+    :type log: None|file
+    :return: The results, ready to be dumped to json.
+    :rtype: dict
+    """
+    skipped = []
+    if "star_imports" in features:
+        # Star imports are expanded by importing the binding.
+        try:
+            imp.find_module(binding)
+        except ImportError:
+            skipped.append("star_imports")
+            features = tuple(
+                feature for feature in features if feature != "star_imports"
+            )
+            if log is not None:
+                log.write(
+                    "Skipping star_imports, {binding} can not be imported.\n"
+                    .format(binding=binding)
+                )
+
+    groups = [(feature, (feature,)) for feature in features]
+    if len(features) > 1:
+        groups.append((MIXED, tuple(features)))
+
+    cases = []
+    scaling = {}
+    for group, group_features in groups:
+        points = []
+        for size in sizes:
+            source = corpus.generate(
+                size, features=group_features, density=density,
+                binding=binding
+            )
+            times, stages = benchmark(
+                source, repeat=repeat, skip_lineno=True,
+                tometh_flag="tometh" in group_features, engine=engine
+            )
+            case = {
+                "name": "{group}-{size}".format(group=group, size=size),
+                "group": group,
+                "features": list(group_features),
+                "lines": source.count("\n"),
+                "bytes": len(source),
+                "times": times,
+                "min": min(times),
+                "median": _median(times),
+                "stages": stages,
+            }
+            cases.append(case)
+            points.append((case["lines"], case["median"]))
+            if log is not None:
+                log.write("{name:<24} {median:9.4f}s\n".format(**case))
+        scaling[group] = {"exponent": _exponent(points)}
+
+    return {
+        "meta": {
+            "qt_py_convert": qt_py_convert.__version__,
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "binding": binding,
+            "density": density,
+            "engine": engine,
+            "repeat": repeat,
+            "skipped": skipped,
+        },
+        "cases": cases,
+        "scaling": scaling,
+    }
+
+
+def compare(baseline, results, threshold=1.1):
+    """
+    compare lines up the cases of two runs of run_suite.
+
+    :param baseline: The results to compare against.
+    :type baseline: dict
+    :param results: The new results.
+    :type results: dict
+    :param threshold: The ratio of the medians above which a case counts as
+        slower.
+    :type threshold: float
+    :return: (name, old median, new median, ratio, slower) for every case
+        that is in both.
+    :rtype: list[tuple[str,float,float,float,bool]]
+    """
+    old = dict((case["name"], case["median"]) for case in baseline["cases"])
+    rows = []
+    for case in results["cases"]:
+        if case["name"] not in old:
+            continue
+        ratio = case["median"] / old[case["name"]] if old[case["name"]] \
+            else float("inf")
+        rows.append((
+            case["name"], old[case["name"]], case["median"], ratio,
+            ratio > threshold
+        ))
+    return rows
+
+
+def _csv(value):
+    return tuple(part for part in value.split(",") if part)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser("python -m benchmarks")
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: tuple(int(size) for size in _csv(value)),
+        default=DEFAULT_SIZES,
+        help="Comma separated numbers of lines to generate the sources at.",
+    )
+    parser.add_argument(
+        "--features",
+        type=_csv,
+        default=corpus.FEATURES,
+        help="Comma separated features to benchmark, from: %s." %
+             ", ".join(corpus.FEATURES),
+    )
+    parser.add_argument(
+        "--binding",
+        default="PyQt4",
+        choices=corpus.BINDINGS,
+        help="The binding to generate the sources for.",
+    )
+    parser.add_argument(
+        "--density",
+        type=float,
+        default=1.0,
+        help="The share of the generated methods that use Qt.",
+    )
+    parser.add_argument(
+        "--engine",
+        default="redbaron",
+        choices=("redbaron", "tokens"),
+        help="The engine to convert with.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="The number of times to convert every source.",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Write the results to this json file.",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        help="Results of an earlier run to compare against. Exits with 1 "
+             "if any case got slower than \"--threshold\".",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.1,
+        help="Ratio of the median times above which a case counts as "
+             "slower than the baseline.",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_suite(
+        sizes=args.sizes,
+        features=args.features,
+        repeat=args.repeat,
+        binding=args.binding,
+        density=args.density,
+        engine=args.engine,
+        log=sys.stdout,
+    )
+    sys.stdout.write("\n")
+    for group, scaling in sorted(results["scaling"].items()):
+        if scaling["exponent"] is not None:
+            sys.stdout.write("{group:<24} time ~ lines ** {exp:.2f}\n".format(
+                group=group, exp=scaling["exponent"]
+            ))
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        slower = False
+        sys.stdout.write("\n")
+        for name, old, new, ratio, is_slower in compare(
+                baseline, results, threshold=args.threshold):
+            slower = slower or is_slower
+            sys.stdout.write(
+                "{name:<24} {old:9.4f}s -> {new:9.4f}s {ratio:6.2f}x{flag}\n"
+                .format(
+                    name=name, old=old, new=new, ratio=ratio,
+                    flag="  SLOWER" if is_slower else ""
+                )
+            )
+        if slower:
+            return 1
+    return 0
@@ -24,9 +24,10 @@ The imports module is designed to fix the import statements.
 """
 import traceback
 
-from qt_py_convert.general import ALIAS_DICT, change, supported_binding
+from qt_py_convert.general import change, supported_binding, get_context
 from qt_py_convert.color import color_text, ANSI
 from qt_py_convert.log import get_logger
+from qt_py_convert.node_index import get_index
 
 
 EXPAND_STARS_LOG = get_logger("expand_stars")
@@ -90,7 +91,7 @@ class Processes(object):
         return mappings
 
     @classmethod
-    def _process_star(cls, red, stars, skip_lineno=False):
+    def _process_star(cls, red, stars, skip_lineno=False, context=None):
         """
         _process_star is designed to replace from X import * methods.
 
@@ -98,6 +99,8 @@ class Processes(object):
         :type red: redbardon.RedBaron
         :param stars: List of redbaron nodes that matched for this proc.
         :type stars: list
+        :param context: The conversion that we are recording into.
+        :type context: None|qt_py_convert.general.ConversionContext
         """
         mappings = {}
         for star in stars:
@@ -121,7 +124,8 @@ class Processes(object):
                 logger=EXPAND_STARS_LOG,
                 node=star.parent,
                 replacement=text,
-                skip_lineno=skip_lineno
+                skip_lineno=skip_lineno,
+                context=context
             )
             mappings.update(children)
             # star.replace(
@@ -151,7 +155,7 @@ def star_process(store):
     return filter_function
 
 
-def process(red, skip_lineno=False, **kwargs):
+def process(red, skip_lineno=False, context=None, **kwargs):
     """
     process is the main function for the import process.
 
@@ -164,6 +168,8 @@ def process(red, skip_lineno=False, **kwargs):
         show the line numbers. This can give great performance increases
         because redbaron has trouble calculating the line number sometimes.
     :type skip_lineno: bool
+    :param context: The conversion that we are recording into.
+    :type context: None|qt_py_convert.general.ConversionContext
     :param kwargs: Any other kwargs will be ignored.
     :type kwargs: dict
     """
@@ -178,9 +184,12 @@ def process(red, skip_lineno=False, **kwargs):
         text="This will be very slow. It's your own fault.",
         color=ANSI.colors.red,
     ))
-    values = red.find_all("FromImportNode", value=star_process(issues))
+    values = get_index(red, context).find_all(
+        "FromImportNode", value=star_process(issues)
+    )
 
     mappings = getattr(Processes, Processes.EXPAND_STR)(
-        red, issues[Processes.EXPAND_STR], skip_lineno=skip_lineno
+        red, issues[Processes.EXPAND_STR], skip_lineno=skip_lineno,
+        context=context
     )
-    return ALIAS_DICT, mappings
+    return get_context(context), mappings
@@ -23,9 +23,10 @@
 The from_imports module is designed to fix the from import statements.
 """
 from qt_py_convert._modules.expand_stars import process as stars_process
-from qt_py_convert.general import __supported_bindings__, ALIAS_DICT, change, \
-    supported_binding
+from qt_py_convert.general import __supported_bindings__, change, \
+    supported_binding, get_context
 from qt_py_convert.log import get_logger
+from qt_py_convert.node_index import get_index
 
 
 FROM_IMPORTS_LOG = get_logger("from_imports")
@@ -39,7 +40,8 @@ class Processes(object):
         return node.dumps().replace(binding, "").lstrip(".").split(".")
 
     @staticmethod
-    def _no_second_level_module(node, _parts, skip_lineno=False):
+    def _no_second_level_module(node, _parts, index, skip_lineno=False,
+                                context=None):
         text = "from Qt import {key}".format(
             key=", ".join([target.value for target in node.targets])
         )
@@ -48,24 +50,28 @@ class Processes(object):
             logger=FROM_IMPORTS_LOG,
             node=node,
             replacement=text,
-            skip_lineno=skip_lineno
+            skip_lineno=skip_lineno,
+            context=context
         )
 
-        node.replace(text)
+        index.replace(node, text)
 
     @classmethod
-    def _process_import(cls, red, objects, skip_lineno=False):
+    def _process_import(cls, red, objects, skip_lineno=False, context=None):
         """
         _process_import is designed to replace from import methods.
 
-        :param red: redbaron process. Unused in this method.
+        :param red: redbaron process. Used to get the NodeIndex.
         :type red: redbardon.RedBaron
         :param objects: List of redbaron nodes that matched for this proc.
         :type objects: list
         :param skip_lineno: Global "skip_lineno" flag.
         :type skip_lineno: bool
+        :param context: The conversion that we are recording into.
+        :type context: qt_py_convert.general.ConversionContext
         """
-        binding_aliases = ALIAS_DICT
+        binding_aliases = context
+        index = get_index(red, context)
         mappings = {}
 
         # Replace each node
@@ -77,7 +83,9 @@ class Processes(object):
                 cls._no_second_level_module(
                     node.parent,
                     from_import_parts,
-                    skip_lineno=skip_lineno
+                    index,
+                    skip_lineno=skip_lineno,
+                    context=context
                 )
                 binding_aliases["bindings"].add(binding)
                 for target in node.parent.targets:
@@ -90,7 +98,7 @@ class Processes(object):
                 if _from_as_name.type == "star":
                     # TODO: Make this a flag and make use the expand module.
                     _, star_mappings = stars_process(
-                        red
+                        red, context=context
                     )
                     mappings.update(star_mappings)
                 else:
@@ -105,9 +113,10 @@ class Processes(object):
                 logger=FROM_IMPORTS_LOG,
                 node=node.parent,
                 replacement=replacement,
-                skip_lineno=skip_lineno
+                skip_lineno=skip_lineno,
+                context=context
             )
-            node.parent.replace(replacement)
+            index.replace(node.parent, replacement)
             binding_aliases["bindings"].add(binding)
             for target in node.parent.targets:
                 binding_aliases["root_aliases"].add(target.value)
@@ -148,7 +157,7 @@ def import_process(store):
     return filter_function
 
 
-def process(red, skip_lineno=False, **kwargs):
+def process(red, skip_lineno=False, context=None, **kwargs):
     """
     process is the main function for the import process.
 
@@ -161,17 +170,24 @@ def process(red, skip_lineno=False, **kwargs):
         show the line numbers. This can give great performance increases
         because redbaron has trouble calculating the line number sometimes.
     :type skip_lineno: bool
+    :param context: The conversion that we are recording into.
+    :type context: None|qt_py_convert.general.ConversionContext
     :param kwargs: Any other kwargs will be ignored.
     :type kwargs: dict
     """
+    context = get_context(context)
     issues = {
         Processes.FROM_IMPORT_STR: set(),
     }
-    red.find_all("FromImportNode", value=import_process(issues))
+    get_index(red, context).find_all(
+        "FromImportNode", value=import_process(issues)
+    )
 
     key = Processes.FROM_IMPORT_STR
 
     if issues[key]:
-        return getattr(Processes, key)(red, issues[key], skip_lineno=skip_lineno)
+        return getattr(Processes, key)(
+            red, issues[key], skip_lineno=skip_lineno, context=context
+        )
     else:
-        return ALIAS_DICT, {}
+        return context, {}
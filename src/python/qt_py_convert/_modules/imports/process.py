@@ -22,9 +22,10 @@
 """
 The imports module is designed to fix the import statements.
 """
-from qt_py_convert.general import __supported_bindings__, ALIAS_DICT, change, \
-    supported_binding
+from qt_py_convert.general import __supported_bindings__, change, \
+    supported_binding, get_context
 from qt_py_convert.log import get_logger
+from qt_py_convert.node_index import get_index
 
 IMPORTS_LOG = get_logger("imports")
 
@@ -36,29 +37,34 @@ class Processes(object):
         return ".".join([child_part.dumps() for child_part in child.value])
 
     @staticmethod
-    def _no_second_level_module(node, _child_parts, skip_lineno=False):
+    def _no_second_level_module(node, _child_parts, index,
+                                skip_lineno=False, context=None):
         replacement = "import Qt"
         change(
             logger=IMPORTS_LOG,
             node=node,
             replacement=replacement,
-            skip_lineno=skip_lineno
+            skip_lineno=skip_lineno,
+            context=context
         )
-        node.replace(replacement)
+        index.replace(node, replacement)
 
     @classmethod
-    def _process_import(cls, red, objects, skip_lineno=False):
+    def _process_import(cls, red, objects, skip_lineno=False, context=None):
         """
         _process_import is designed to replace import methods.
 
-        :param red: redbaron process. Unused in this method.
+        :param red: redbaron process. Used to get the NodeIndex.
         :type red: redbardon.RedBaron
         :param objects: List of redbaron nodes that matched for this proc.
         :type objects: list
         :param skip_lineno: Global "skip_lineno" flag.
         :type skip_lineno: bool
+        :param context: The conversion that we are recording into.
+        :type context: qt_py_convert.general.ConversionContext
         """
-        binding_aliases = ALIAS_DICT
+        binding_aliases = context
+        index = get_index(red, context)
         mappings = {}
 
         # Replace each node
@@ -80,7 +86,9 @@ class Processes(object):
                 else:
                     if len(node) == 1:
                         # Only one in the import: "import PySide"
-                        cls._no_second_level_module(node.parent, _child_parts)
+                        cls._no_second_level_module(
+                            node.parent, _child_parts, index, context=context
+                        )
                     else:
                         # Multiple in the import: "import PySide, os"
                         node_parent = node.parent
@@ -91,10 +99,11 @@ class Processes(object):
                             logger=IMPORTS_LOG,
                             node=node_parent,
                             replacement=repl,
-                            skip_lineno=skip_lineno
+                            skip_lineno=skip_lineno,
+                            context=context
                         )
 
-                        node.parent.replace(repl)
+                        index.replace(node_parent, repl)
                     if _child_as_name:
                         mappings[_child_as_name] = "Qt"
                     else:
@@ -112,10 +121,12 @@ class Processes(object):
                     replacement="from Qt import {key}".format(
                         key=second_level_module
                     ),
-                    skip_lineno=skip_lineno
+                    skip_lineno=skip_lineno,
+                    context=context
                 )
 
-                node.parent.replace(
+                index.replace(
+                    node.parent,
                     "from Qt import {key}".format(key=second_level_module)
                 )
                 binding_aliases["bindings"].add(binding)
@@ -154,7 +165,7 @@ def import_process(store):
     return filter_function
 
 
-def process(red, skip_lineno=False, **kwargs):
+def process(red, skip_lineno=False, context=None, **kwargs):
     """
     process is the main function for the import process.
 
@@ -167,16 +178,23 @@ def process(red, skip_lineno=False, **kwargs):
         show the line numbers. This can give great performance increases
         because redbaron has trouble calculating the line number sometimes.
     :type skip_lineno: bool
+    :param context: The conversion that we are recording into.
+    :type context: None|qt_py_convert.general.ConversionContext
     :param kwargs: Any other kwargs will be ignored.
     :type kwargs: dict
     """
+    context = get_context(context)
     issues = {
         Processes.IMPORT_STR: set(),
     }
-    red.find_all("ImportNode", value=import_process(issues))
+    get_index(red, context).find_all(
+        "ImportNode", value=import_process(issues)
+    )
     key = Processes.IMPORT_STR
 
     if issues[key]:
-        return getattr(Processes, key)(red, issues[key], skip_lineno=skip_lineno)
+        return getattr(Processes, key)(
+            red, issues[key], skip_lineno=skip_lineno, context=context
+        )
     else:
-        return ALIAS_DICT, {}
+        return context, {}
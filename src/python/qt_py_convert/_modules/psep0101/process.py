@@ -31,8 +31,10 @@ __author__ = 'ahughes'
 import re
 import sys
 
-from qt_py_convert.general import change, ErrorClass
+from qt_py_convert.general import change, ErrorClass, get_context
 from qt_py_convert.log import get_logger
+from qt_py_convert.node_index import get_index
+from qt_py_convert.profiling import stage
 from qt_py_convert._modules.psep0101 import _qsignal
 from qt_py_convert._modules.psep0101 import _conversion_methods
 
@@ -50,24 +52,28 @@ text_type = str if sys.version_info[0] == 3 else unicode
 class Processes(object):
     """Processes class for psesp0101"""
     @staticmethod
-    def _process_qvariant(red, objects, skip_lineno=False, **kwargs):
+    def _process_qvariant(red, objects, skip_lineno=False, context=None, **kwargs):
         """
         _process_qvariant is designed to replace QVariant code.
 
-        :param red: redbaron process. Unused in this method.
+        :param red: redbaron process. Used to get the NodeIndex.
         :type red: redbardon.RedBaron
         :param objects: List of redbaron nodes that matched for this proc.
         :type objects: list
         :param skip_lineno: Global "skip_lineno" flag.
         :type skip_lineno: bool
+        :param context: The conversion that we are recording into.
+        :type context: qt_py_convert.general.ConversionContext
         """
         qvariant_expr = re.compile(
             r"(?:QtCore\.)?QVariant(?P<is_instance>\((?P<value>.*)\))?"
         )
 
+        index = get_index(red, context)
+
         # Replace each node
         for node in objects:
-            raw = node.parent.dumps()
+            raw = index.dumps(node.parent)
             matched = qvariant_expr.search(raw)
             if matched:
                 if not matched.groupdict()["is_instance"]:
@@ -77,6 +83,7 @@ class Processes(object):
                     # We are adding it to warnings and continuing on.
                     ErrorClass.from_node(
                         node=node,
+                        context=context,
                         reason="""
 As of api v2.0, there is no concept of a "QVariant" object.
 Usage of the class object directly cannot be translated into something that \
@@ -108,24 +115,30 @@ You will probably want to remove the usage of this entirely."""
                         node=node.parent,
                         replacement=changed.strip(" "),
                         skip_lineno=skip_lineno,
+                        context=context,
                     )
-                    node.parent.replace(changed.strip(" "))
+                    index.replace(node.parent, changed.strip(" "))
 
     @staticmethod
-    def _process_qstring(red, objects, skip_lineno=False, **kwargs):
+    def _process_qstring(red, objects, skip_lineno=False, context=None,
+                         **kwargs):
         """
         _process_qstring is designed to replace QString code.
 
-        :param red: redbaron process. Unused in this method.
+        :param red: redbaron process. Used to get the NodeIndex.
         :type red: redbardon.RedBaron
         :param objects: List of redbaron nodes that matched for this proc.
         :type objects: list
         :param skip_lineno: Global "skip_lineno" flag.
         :type skip_lineno: bool
+        :param context: The conversion that we are recording into.
+        :type context: qt_py_convert.general.ConversionContext
         """
+        index = get_index(red, context)
+
         # Replace each node
         for node in objects:
-            raw = node.parent.dumps()
+            raw = index.dumps(node.parent)
             changed = re.sub(
                 r"((?:QtCore\.)?QString(?:\.fromUtf8)?)",
                 text_type.__name__,
@@ -137,27 +150,33 @@ You will probably want to remove the usage of this entirely."""
                     node=node.parent,
                     replacement=changed,
                     skip_lineno=skip_lineno,
+                    context=context,
                 )
 
-                node.parent.replace(changed)
+                index.replace(node.parent, changed)
 
     @staticmethod
-    def _process_qstringlist(red, objects, skip_lineno=False, **kwargs):
+    def _process_qstringlist(red, objects, skip_lineno=False, context=None,
+                             **kwargs):
         """
         _process_qstringlist is designed to replace QStringList code.
 
-        :param red: redbaron process. Unused in this method.
+        :param red: redbaron process. Used to get the NodeIndex.
         :type red: redbardon.RedBaron
         :param objects: List of redbaron nodes that matched for this proc.
         :type objects: list
         :param skip_lineno: Global "skip_lineno" flag.
         :type skip_lineno: bool
+        :param context: The conversion that we are recording into.
+        :type context: qt_py_convert.general.ConversionContext
         """
         # TODO: Find different usage cases of QStringList.
         #       Probably just need support for construction and isinstance.
+        index = get_index(red, context)
+
         # Replace each node
         for node in objects:
-            raw = node.parent.dumps()
+            raw = index.dumps(node.parent)
             changed = re.sub(
                 r"((?:QtCore\.)?QStringList)",
                 "list",
@@ -169,25 +188,31 @@ You will probably want to remove the usage of this entirely."""
                     node=node.parent,
                     replacement=changed,
                     skip_lineno=skip_lineno,
+                    context=context,
                 )
 
-                node.parent.replace(changed)
+                index.replace(node.parent, changed)
 
     @staticmethod
-    def _process_qchar(red, objects, skip_lineno=False, **kwargs):
+    def _process_qchar(red, objects, skip_lineno=False, context=None,
+                       **kwargs):
         """
         _process_qchar is designed to replace QChar code.
 
-        :param red: redbaron process. Unused in this method.
+        :param red: redbaron process. Used to get the NodeIndex.
         :type red: redbardon.RedBaron
         :param objects: List of redbaron nodes that matched for this proc.
         :type objects: list
         :param skip_lineno: Global "skip_lineno" flag.
         :type skip_lineno: bool
+        :param context: The conversion that we are recording into.
+        :type context: qt_py_convert.general.ConversionContext
         """
+        index = get_index(red, context)
+
         # Replace each node
         for node in objects:
-            raw = node.parent.dumps()
+            raw = index.dumps(node.parent)
             changed = re.sub(
                 r"((?:QtCore\.)?QChar)",
                 text_type.__name__,
@@ -199,25 +224,30 @@ You will probably want to remove the usage of this entirely."""
                     node=node.parent,
                     replacement=changed,
                     skip_lineno=skip_lineno,
+                    context=context,
                 )
 
-                node.parent.replace(changed)
+                index.replace(node.parent, changed)
 
     @staticmethod
-    def _process_to_methods(red, objects, skip_lineno=False, **kwargs):
+    def _process_to_methods(red, objects, skip_lineno=False, context=None,
+                            **kwargs):
         """
         Attempts at fixing the "toString" "toBool" "toPyObject" etc
         PyQt4-apiv1.0 helper methods.
 
-        :param red: redbaron process. Unused in this method.
+        :param red: redbaron process. Used to get the NodeIndex.
         :type red: redbardon.RedBaron
         :param objects: List of redbaron nodes that matched for this proc.
         :type objects: list
         :param skip_lineno: Global "skip_lineno" flag.
         :type skip_lineno: bool
+        :param context: The conversion that we are recording into.
+        :type context: qt_py_convert.general.ConversionContext
         """
+        index = get_index(red, context)
         for node in objects:
-            raw = node.parent.dumps()
+            raw = index.dumps(node.parent)
             changed = _conversion_methods.to_methods(raw)
             if changed != raw:
                     change(
@@ -225,27 +255,31 @@ You will probably want to remove the usage of this entirely."""
                         node=node.parent,
                         replacement=changed,
                         skip_lineno=skip_lineno,
+                        context=context,
                     )
 
-                    node.parent.replace(changed)
+                    index.replace(node.parent, changed)
                     continue
 
     @staticmethod
-    def _process_qsignal(red, objects, skip_lineno=False, explicit_signals_flag=False):
+    def _process_qsignal(red, objects, skip_lineno=False, explicit_signals_flag=False, context=None, **kwargs):
         """
         _process_qsignal is designed to replace QSignal code.
         It calls out to the _qsignal module and can fix disconnects, connects,
         and emits.
 
-        :param red: redbaron process. Unused in this method.
+        :param red: redbaron process. Used to get the NodeIndex.
         :type red: redbardon.RedBaron
         :param objects: List of redbaron nodes that matched for this proc.
         :type objects: list
         :param skip_lineno: Global "skip_lineno" flag.
         :type skip_lineno: bool
+        :param context: The conversion that we are recording into.
+        :type context: qt_py_convert.general.ConversionContext
         """
+        index = get_index(red, context)
         for node in objects:
-            raw = node.parent.dumps()
+            raw = index.dumps(node.parent)
 
             if "disconnect" in raw:
                 changed = _qsignal.process_disconnect(raw, explicit=explicit_signals_flag)
@@ -255,9 +289,10 @@ You will probably want to remove the usage of this entirely."""
                         node=node.parent,
                         replacement=changed,
                         skip_lineno=skip_lineno,
+                        context=context,
                     )
 
-                    node.parent.replace(changed)
+                    index.replace(node.parent, changed)
                     continue
             if "connect" in raw:
                 changed = _qsignal.process_connect(raw, explicit=explicit_signals_flag)
@@ -267,8 +302,9 @@ You will probably want to remove the usage of this entirely."""
                         node=node.parent,
                         replacement=changed,
                         skip_lineno=skip_lineno,
+                        context=context,
                     )
-                    node.parent.replace(changed)
+                    index.replace(node.parent, changed)
                     continue
             if "emit" in raw:
                 changed = _qsignal.process_emit(raw, explicit=explicit_signals_flag)
@@ -279,25 +315,31 @@ You will probably want to remove the usage of this entirely."""
                         node=node.parent,
                         replacement=changed,
                         skip_lineno=skip_lineno,
+                        context=context,
                     )
-                    node.parent.replace(changed)
+                    index.replace(node.parent, changed)
                     continue
 
     @staticmethod
-    def _process_qstringref(red, objects, skip_lineno=False, **kwargs):
+    def _process_qstringref(red, objects, skip_lineno=False, context=None,
+                            **kwargs):
         """
         _process_qstringref is designed to replace QStringRefs
 
-        :param red: redbaron process. Unused in this method.
+        :param red: redbaron process. Used to get the NodeIndex.
         :type red: redbardon.RedBaron
         :param objects: List of redbaron nodes that matched for this proc.
         :type objects: list
         :param skip_lineno: Global "skip_lineno" flag.
         :type skip_lineno: bool
+        :param context: The conversion that we are recording into.
+        :type context: qt_py_convert.general.ConversionContext
         """
+        index = get_index(red, context)
+
         # Replace each node
         for node in objects:
-            raw = node.parent.dumps()
+            raw = index.dumps(node.parent)
             changed = re.sub(
                 r"((?:QtCore\.)?QStringRef)",
                 text_type.__name__,
@@ -309,8 +351,9 @@ You will probably want to remove the usage of this entirely."""
                     node=node.parent,
                     replacement=changed,
                     skip_lineno=skip_lineno,
+                    context=context,
                 )
-                node.parent.replace(changed)
+                index.replace(node.parent, changed)
 
     QSTRING_PROCESS_STR = "QSTRING_PROCESS"
     QSTRINGLIST_PROCESS_STR = "QSTRINGLIST_PROCESS"
@@ -328,12 +371,14 @@ You will probably want to remove the usage of this entirely."""
     TOMETHOD_PROCESS = _process_to_methods
 
 
-def psep_process(store):
+def psep_process(store, index=None):
     """
     psep_process is one of the more complex handlers for the _modules.
 
     :param store: Store is the psep_issues dict defined in "process"
     :type store: dict
+    :param index: The NodeIndex to get the source of the nodes from.
+    :type index: None|qt_py_convert.node_index.NodeIndex
     :return: The filter_function callable.
     :rtype: callable
     """
@@ -365,26 +410,27 @@ def psep_process(store):
         filter them out if they match something that has changed in psep0101.
         """
         found = False
-        if _qstring_expression.search(value.dumps()):
+        text = value.dumps() if index is None else index.dumps(value)
+        if _qstring_expression.search(text):
             store[Processes.QSTRING_PROCESS_STR].add(value)
             found = True
-        if _qstringlist_expression.search(value.dumps()):
+        if _qstringlist_expression.search(text):
             store[Processes.QSTRINGLIST_PROCESS_STR].add(value)
             found = True
-        if _qchar_expression.search(value.dumps()):
+        if _qchar_expression.search(text):
             store[Processes.QCHAR_PROCESS_STR].add(value)
             found = True
-        if _qstringref_expression.search(value.dumps()):
+        if _qstringref_expression.search(text):
             store[Processes.QSTRINGREF_PROCESS_STR].add(value)
             found = True
-        if _qsignal_expression.search(value.dumps()):
+        if _qsignal_expression.search(text):
             store[Processes.QSIGNAL_PROCESS_STR].add(value)
             found = True
-        if _qvariant_expression.search(value.dumps()):
+        if _qvariant_expression.search(text):
             store[Processes.QVARIANT_PROCESS_STR].add(value)
             found = True
         if Processes.TOMETHOD_PROCESS_STR in store:
-            if _to_method_expression.search(value.dumps()):
+            if _to_method_expression.search(text):
                 store[Processes.TOMETHOD_PROCESS_STR].add(value)
                 found = True
         if found:
@@ -392,7 +438,7 @@ def psep_process(store):
     return filter_function
 
 
-def process(red, skip_lineno=False, tometh_flag=False, explicit_signals_flag=False, **kwargs):
+def process(red, skip_lineno=False, tometh_flag=False, explicit_signals_flag=False, context=None, **kwargs):
     """
     process is the main function for the psep0101 process.
 
@@ -411,9 +457,12 @@ def process(red, skip_lineno=False, tometh_flag=False, explicit_signals_flag=Fal
         confirm that you don't have any custom objects with the same method
         signature to PyQt4's apiv1.0 ones.
     :type tometh_flag: bool
+    :param context: The conversion that we are recording into.
+    :type context: None|qt_py_convert.general.ConversionContext
     :param kwargs: Any other kwargs will be ignored.
     :type kwargs: dict
     """
+    context = get_context(context)
     psep_issues = {
         Processes.QSTRING_PROCESS_STR: set(),
         Processes.QSTRINGLIST_PROCESS_STR: set(),
@@ -427,19 +476,22 @@ def process(red, skip_lineno=False, tometh_flag=False, explicit_signals_flag=Fal
     if tometh_flag:
         psep_issues[Processes.TOMETHOD_PROCESS_STR] = set()
 
-    red.find_all("AtomTrailersNode", value=psep_process(psep_issues))
-    red.find_all("DottedNameNode", value=psep_process(psep_issues))
+    index = get_index(red, context)
+    filter_function = psep_process(psep_issues, index=index)
+    index.find_all("AtomTrailersNode", value=filter_function)
+    index.find_all("DottedNameNode", value=filter_function)
 
-    name_nodes = red.find_all("NameNode")
-    filter_function = psep_process(psep_issues)
+    name_nodes = index.find_all("NameNode")
     for name in name_nodes:
         filter_function(name)
 
     for issue in psep_issues:
         if psep_issues[issue]:
-            getattr(Processes, issue)(
-                red,
-                psep_issues[issue],
-                skip_lineno=skip_lineno,
-                explicit_signals_flag=explicit_signals_flag
-            )
+            with stage(context, "psep0101." + issue):
+                getattr(Processes, issue)(
+                    red,
+                    psep_issues[issue],
+                    skip_lineno=skip_lineno,
+                    explicit_signals_flag=explicit_signals_flag,
+                    context=context
+                )
@@ -21,16 +21,18 @@
 # language governing permissions and limitations under the Apache License.
 import re
 
-from qt_py_convert.general import ALIAS_DICT, ErrorClass
+from qt_py_convert.general import ErrorClass, get_context
+from qt_py_convert.node_index import get_index
 
 
 class Processes(object):
 
     @staticmethod
-    def _process_load_ui_type(red, objects, skip_lineno=False):
+    def _process_load_ui_type(red, objects, skip_lineno=False, context=None):
         for node in objects:
             ErrorClass.from_node(
                 node=node,
+                context=context,
                 reason="""
     The Qt.py module does not support uic.loadUiType as it is not a method in PySide.
     Please see: https://github.com/mottosso/Qt.py/issues/237
@@ -43,12 +45,14 @@ class Processes(object):
     LOADUITYPE = _process_load_ui_type
 
 
-def unsupported_process(store):
+def unsupported_process(store, index=None):
     """
     unsupported_process is one of the more complex handlers for the _modules.
 
     :param store: Store is the issues dict defined in "process"
     :type store: dict
+    :param index: The NodeIndex to get the source of the nodes from.
+    :type index: None|qt_py_convert.node_index.NodeIndex
     :return: The filter_function callable.
     :rtype: callable
     """
@@ -62,7 +66,8 @@ def unsupported_process(store):
         filter them out if they match something that is unsupported in Qt.py
         """
         found = False
-        if _loaduitype_expression.search(value.dumps()):
+        text = value.dumps() if index is None else index.dumps(value)
+        if _loaduitype_expression.search(text):
             store[Processes.LOADUITYPE_STR].add(value)
             found = True
         if found:
@@ -70,7 +75,7 @@ def unsupported_process(store):
     return filter_function
 
 
-def process(red, skip_lineno=False, **kwargs):
+def process(red, skip_lineno=False, context=None, **kwargs):
     """
     process is the main function for the import process.
 
@@ -83,19 +88,25 @@ def process(red, skip_lineno=False, **kwargs):
         show the line numbers. This can give great performance increases
         because redbaron has trouble calculating the line number sometimes.
     :type skip_lineno: bool
+    :param context: The conversion that we are recording into.
+    :type context: None|qt_py_convert.general.ConversionContext
     :param kwargs: Any other kwargs will be ignored.
     :type kwargs: dict
     """
+    context = get_context(context)
     issues = {
         Processes.LOADUITYPE_STR: set(),
     }
 
-    red.find_all("AtomTrailersNode", value=unsupported_process(issues))
-    red.find_all("DottedNameNode", value=unsupported_process(issues))
+    index = get_index(red, context)
+    filter_function = unsupported_process(issues, index=index)
+    index.find_all("AtomTrailersNode", value=filter_function)
+    index.find_all("DottedNameNode", value=filter_function)
     key = Processes.LOADUITYPE_STR
 
     if issues[key]:
         return getattr(Processes, key)(red, issues[key],
-                                       skip_lineno=skip_lineno)
+                                       skip_lineno=skip_lineno,
+                                       context=context)
     else:
-        return ALIAS_DICT, {}
+        return context, {}
@@ -0,0 +1,212 @@
+# Copyright 2018 Digital Domain 3.0
+#
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#
+# 6. Trademarks. This License does not grant permission to use the trade
+#    names, trademarks, service marks, or product names of the Licensor
+#    and its affiliates, except as required to comply with Section 4(c) of
+#    the License and to reproduce the content of the NOTICE file.
+#
+# You may obtain a copy of the Apache License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+"""
+cache is an on disk store of conversion results.
+Results are keyed on everything that can change the output of a conversion,
+so an unchanged file can be written out again without being parsed.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+from qt_py_convert import __version__
+from qt_py_convert.external import Qt
+from qt_py_convert.general import __supported_bindings__, \
+    _custom_misplaced_members, ErrorClass
+from qt_py_convert.log import get_logger
+
+CACHE_LOG = get_logger("cache")
+
+
+def _pack(value):
+    """
+    json only holds unicode. latin-1 maps every byte to a code point and
+    back, so the str in value get through unchanged.
+    """
+    if isinstance(value, str):
+        return value.decode("latin-1")
+    if isinstance(value, dict):
+        return dict(
+            (_pack(key), _pack(item)) for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_pack(item) for item in value]
+    return value
+
+
+def _unpack(value):
+    """The reverse of _pack, sets come back as lists."""
+    if isinstance(value, unicode):
+        return value.encode("latin-1")
+    if isinstance(value, dict):
+        return dict(
+            (_unpack(key), _unpack(item)) for key, item in value.items()
+        )
+    if isinstance(value, list):
+        return [_unpack(item) for item in value]
+    return value
+
+
+class ConversionCache(object):
+    """
+    ConversionCache stores the result of run for a source file in a folder.
+
+    Every entry is two files named after its key. "<key>.py" holds the
+    converted code and "<key>.json" holds the aliases, mappings and errors,
+    with their str read as latin-1 so that any bytes in them come back as
+    the same str. The json is written last, so an entry only exists once
+    it is complete.
+    """
+    def __init__(self, root):
+        """
+        :param root: The folder to keep the cache in.
+        :type root: str
+        """
+        super(ConversionCache, self).__init__()
+        self.root = root
+
+    @staticmethod
+    def key(source, skip_lineno=False, tometh_flag=False,
+            explicit_signals_flag=False, engine="redbaron", chunk_lines=None):
+        """
+        key builds the cache key for a source file and the flags it is
+        converted with.
+
+        :param source: Text from a python file that you want to process.
+        :type source: str
+        :param skip_lineno: Global "skip_lineno" flag.
+        :type skip_lineno: bool
+        :param tometh_flag: Global "tometh_flag" flag.
+        :type tometh_flag: bool
+        :param explicit_signals_flag: Global "explicit_signals_flag" flag.
+        :type explicit_signals_flag: bool
+        :param engine: The engine that it is converted with.
+        :type engine: str
+        :param chunk_lines: The chunk_lines that it is converted with.
+        :type chunk_lines: None|int
+        :return: A hex digest.
+        :rtype: str
+        """
+        settings = json.dumps([
+            __version__,
+            Qt.__version__,
+            bool(skip_lineno),
+            bool(tometh_flag),
+            bool(explicit_signals_flag),
+            engine,
+            chunk_lines or None,
+            list(__supported_bindings__),
+            _custom_misplaced_members,
+        ], sort_keys=True)
+        digest = hashlib.sha1(settings.encode("utf-8"))
+        digest.update(source)
+        return digest.hexdigest()
+
+    def _path(self, key, ext):
+        return os.path.join(self.root, key[:2], key + ext)
+
+    def get(self, key, context):
+        """
+        get loads a cached result and restores its errors into context.
+
+        :param key: The key from ConversionCache.key.
+        :type key: str
+        :param context: The context to restore the errors into.
+        :type context: qt_py_convert.general.ConversionContext
+        :return: None on a cache miss, otherwise the same tuple as run.
+        :rtype: None|tuple[dict,dict,str]
+        """
+        try:
+            with open(self._path(key, ".json"), "rb") as fh:
+                data = _unpack(json.loads(fh.read().decode("utf-8")))
+            with open(self._path(key, ".py"), "rb") as fh:
+                code = fh.read()
+        except (IOError, OSError, ValueError):
+            return None
+
+        aliases = dict(
+            (name, set(values)) for name, values in data["aliases"].items()
+        )
+        for row, row_to, reason in data["errors"]:
+            ErrorClass(
+                row_from=row, row_to=row_to, reason=reason, context=context
+            )
+        return aliases, data["mappings"], code
+
+    def set(self, key, aliases, mappings, code, context):
+        """
+        set stores the result of run.
+
+        :param key: The key from ConversionCache.key.
+        :type key: str
+        :param aliases: The aliases that run returned.
+        :type aliases: dict
+        :param mappings: The mappings that run returned.
+        :type mappings: dict
+        :param code: The converted code.
+        :type code: str
+        :param context: The context that run recorded into.
+        :type context: qt_py_convert.general.ConversionContext
+        """
+        data = _pack({
+            "aliases": dict(
+                (name, sorted(values)) for name, values in aliases.items()
+                if isinstance(values, set) and name != context.ERRORS
+            ),
+            "mappings": mappings,
+            "errors": [
+                (error.row, error.row_to, error.reason)
+                for error in context["errors"]
+            ],
+        })
+        try:
+            folder = os.path.dirname(self._path(key, ""))
+            if not os.path.isdir(folder):
+                try:
+                    os.makedirs(folder)
+                except OSError:
+                    # Another process may have just made it.
+                    if not os.path.isdir(folder):
+                        raise
+            self._write(self._path(key, ".py"), code)
+            self._write(
+                self._path(key, ".json"),
+                json.dumps(data, sort_keys=True).encode("utf-8")
+            )
+        except (IOError, OSError, TypeError, ValueError) as err:
+            CACHE_LOG.warning(
+                "Could not write to the cache: {err}".format(err=err)
+            )
+
+    @staticmethod
+    def _write(path, data):
+        """Write through a temporary file so readers never see half of it."""
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(handle, "wb") as fh:
+                fh.write(data)
+            os.rename(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
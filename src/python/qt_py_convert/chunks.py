@@ -0,0 +1,156 @@
+# Copyright 2018 Digital Domain 3.0
+#
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#
+# 6. Trademarks. This License does not grant permission to use the trade
+#    names, trademarks, service marks, or product names of the Licensor
+#    and its affiliates, except as required to comply with Section 4(c) of
+#    the License and to reproduce the content of the NOTICE file.
+#
+# You may obtain a copy of the Apache License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+"""
+chunks splits a module into blocks of top-level statements with tokenize,
+so run can parse and convert a very large module a block at a time.
+"""
+import tokenize
+from StringIO import StringIO
+
+from qt_py_convert.general import supported_binding, \
+    __suplimentary_bindings__
+
+# Lines at the top level that carry on the statement before them.
+_CONTINUATIONS = ("else", "elif", "except", "finally")
+
+
+def _is_binding(name):
+    return name == "Qt" or name in __suplimentary_bindings__ or \
+        supported_binding(name) is not None
+
+
+class _Statement(object):
+    """A statement at the top level of a module."""
+    def __init__(self, row, keyword):
+        # The first line of the statement, counted from 1.
+        self.row = row
+        self.keyword = keyword
+        # Does it import a binding, anywhere inside of it?
+        self.imports = False
+        # Is its last line a decorator?
+        self.decorated = keyword == "@"
+
+
+def _statements(text):
+    """
+    _statements reads the top-level statements of text.
+
+    :return: The statements, or None if a binding is star imported.
+    :rtype: None|list[_Statement...]
+    :raises tokenize.TokenError: If text can't be tokenized.
+    """
+    statements = []
+    depth = 0
+    line = []
+    for token in tokenize.generate_tokens(StringIO(text).readline):
+        kind, string, (row, _) = token[:3]
+        if kind == tokenize.INDENT:
+            depth += 1
+        elif kind == tokenize.DEDENT:
+            depth -= 1
+        elif kind in (tokenize.NL, tokenize.COMMENT):
+            pass
+        elif kind in (tokenize.NEWLINE, tokenize.ENDMARKER):
+            # The last line has no NEWLINE without a newline at the end.
+            names = [value for kind, value in line if kind == tokenize.NAME]
+            if "import" in names and any(_is_binding(n) for n in names):
+                if "*" in [value for _, value in line]:
+                    # Expanding a star import looks through the whole module.
+                    return None
+                statements[-1].imports = True
+            line = []
+        else:
+            if not line and depth == 0:
+                if not statements or string not in _CONTINUATIONS and \
+                        not statements[-1].decorated:
+                    statements.append(_Statement(row, string))
+                else:
+                    statements[-1].decorated = string == "@"
+            line.append((kind, string))
+    return statements
+
+
+def split(text, chunk_lines):
+    """
+    split cuts text into chunks of whole top-level statements that are
+    about chunk_lines long. Blank and comment lines stay with the statement
+    before them.
+
+    Every statement that imports a binding, the Qt module or sip/shiboken
+    is in a single chunk, the head, which is cleaned up after all of the
+    others are converted. The head does not end on one of those imports at
+    the top level, and a head at the end of the module takes in the chunk
+    before it, so it always has statements that are not removed. No chunk
+    but the last ends on an if statement or a line of whitespace, which
+    redbaron changes at the end of a module that it removed statements from.
+
+    :param text: Text from a python file that you want to process.
+    :type text: str
+    :param chunk_lines: The number of lines to aim for in a chunk.
+    :type chunk_lines: int
+    :return: The first line of every chunk with its text, and the position
+        of the head, None if there are no imports. None if text should not
+        be split.
+    :rtype: None|tuple[list[tuple[int,str]...],None|int]
+    """
+    try:
+        statements = _statements(text)
+    except (tokenize.TokenError, IndentationError):
+        return None
+    if not statements:
+        return None
+    lines = StringIO(text).readlines()
+    rows = [statement.row for statement in statements] + [len(lines) + 1]
+    rows[0] = 1
+
+    imports = [
+        i for i, statement in enumerate(statements) if statement.imports
+    ]
+
+    chunks = []
+    head = None
+    start = 0
+    for i in range(len(statements)):
+        last = i == len(statements) - 1
+        end = lines[rows[i + 1] - 2]
+        if not last and (
+                rows[i + 1] - rows[start] < chunk_lines or
+                imports and imports[0] <= i < imports[-1] or
+                imports and start <= imports[0] <= i and
+                statements[i].imports and
+                statements[i].keyword in ("import", "from") or
+                statements[i].keyword == "if" or
+                not end.strip() and end.strip("\r\n")):
+            continue
+        if imports and start <= imports[0] <= i:
+            head = len(chunks)
+        chunks.append(
+            (rows[start], "".join(lines[rows[start] - 1:rows[i + 1] - 1]))
+        )
+        start = i + 1
+    if head is not None and head > 0 and head == len(chunks) - 1:
+        row, text_before = chunks[head - 1]
+        chunks[head - 1:] = [(row, text_before + chunks[head][1])]
+        head -= 1
+    if len(chunks) < 2 or "".join(chunk for _, chunk in chunks) != text:
+        return None
+    return chunks, head
@@ -23,6 +23,9 @@ import os
 import subprocess
 import sys
 
+# Caches the result of supports_color for this process and its children.
+#   Set it to "0" or "1" to skip the check.
+COLOR_ENV = "QT_PY_CONVERT_COLOR"
 
 class ANSI(object):
     """ANSI is a namespace object. Useful for passing values into "_color" """
@@ -53,10 +56,14 @@ def supports_color():
     plat = sys.platform
     supported_platform = plat != 'Pocket PC' and (plat != 'win32' or
                                                   'ANSICON' in os.environ)
-    p = subprocess.Popen(
-        ["tput", "colors"], stdout=subprocess.PIPE, stderr=subprocess.PIPE
-    )
-    has_colors = p.communicate()[0].strip("\n")
+    try:
+        p = subprocess.Popen(
+            ["tput", "colors"], stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        has_colors = p.communicate()[0].strip("\n")
+    except OSError:
+        # There is no tput.
+        has_colors = ""
     try:
         has_colors = int(has_colors)
     except:
@@ -69,7 +76,27 @@ def supports_color():
     return True
 
 
-SUPPORTS_COLOR = supports_color()
+_SUPPORTS_COLOR = None
+
+
+def has_color():
+    """
+    has_color is a cached supports_color. The check only runs the first time
+    that it is needed, and the result is kept in $QT_PY_CONVERT_COLOR so
+    that child processes do not run it again.
+
+    :return: True if the text should be colored.
+    :rtype: bool
+    """
+    global _SUPPORTS_COLOR
+    if _SUPPORTS_COLOR is None:
+        cached = os.environ.get(COLOR_ENV)
+        if cached in ("0", "1"):
+            _SUPPORTS_COLOR = cached == "1"
+        else:
+            _SUPPORTS_COLOR = supports_color()
+            os.environ[COLOR_ENV] = "1" if _SUPPORTS_COLOR else "0"
+    return _SUPPORTS_COLOR
 
 
 def color_text(color=ANSI.colors.white, text="", style=ANSI.styles.plain):
@@ -83,7 +110,7 @@ def color_text(color=ANSI.colors.white, text="", style=ANSI.styles.plain):
     :return: The colored version of the text
     :rtype: str
     """
-    if not SUPPORTS_COLOR:
+    if not has_color():
         return text
     return "\033[{color};{style}m{message}\033[0m".format(
         style=style, color=color, message=text
@@ -0,0 +1,381 @@
+# Copyright 2018 Digital Domain 3.0
+#
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#
+# 6. Trademarks. This License does not grant permission to use the trade
+#    names, trademarks, service marks, or product names of the Licensor
+#    and its affiliates, except as required to comply with Section 4(c) of
+#    the License and to reproduce the content of the NOTICE file.
+#
+# You may obtain a copy of the Apache License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+"""
+daemon keeps qt_py_convert loaded in a process that converts files for
+clients on a unix socket, so converting a few files does not pay for
+starting up every time.
+The client side only uses the standard library. The conversion modules are
+imported by the server alone.
+"""
+import errno
+import json
+import os
+import signal
+import socket
+import SocketServer
+import tempfile
+import traceback
+
+SOCKET_ENV = "QT_PY_CONVERT_SOCKET"
+
+# Converted before serving so the parser and the member tables are built.
+_WARMUP_SOURCE = "from PyQt4 import QtGui\n\nw = QtGui.QWidget()\n"
+
+
+class DaemonUnavailable(Exception):
+    """
+    DaemonUnavailable is raised by the client when there is no server
+    listening on the socket.
+    """
+
+
+def default_socket_path():
+    """
+    default_socket_path returns the socket that the server and the client
+    use when they are not given one.
+
+    :return: $QT_PY_CONVERT_SOCKET, or a socket per user in the temp folder.
+    :rtype: str
+    """
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    return os.path.join(
+        tempfile.gettempdir(), "qt_py_convert-%d.sock" % os.getuid()
+    )
+
+
+def _pack(text):
+    """
+    json only holds unicode. latin-1 maps every byte to a code point and
+    back, so any str gets through unchanged.
+    """
+    if isinstance(text, str):
+        return text.decode("latin-1")
+    return text
+
+
+def _unpack(text):
+    """The reverse of _pack."""
+    if isinstance(text, unicode):
+        return text.encode("latin-1")
+    return text
+
+
+def _send(fh, message):
+    fh.write(json.dumps(message) + "\n")
+    fh.flush()
+
+
+def _receive(fh):
+    line = fh.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def _process(request):
+    """
+    _process converts the file or folder of a request the same way the
+    qt_py_convert command line tool does.
+
+    :param request: The request that a client sent.
+    :type request: dict
+    :return: The results of the processed files, in order.
+    :rtype: generator[qt_py_convert.run.FileResult]
+    """
+    from qt_py_convert.general import WriteFlag
+    from qt_py_convert.run import _folder_files, _process_file
+
+    src_path = _unpack(request["path"])
+    abs_path = os.path.abspath(src_path)
+    write_path = _unpack(request.get("write_path"))
+    src_root = _unpack(request.get("src_root"))
+    if src_root is None:
+        src_root = abs_path if os.path.isdir(abs_path) else \
+            os.path.dirname(abs_path)
+    if request.get("diff"):
+        write_mode = WriteFlag.WRITE_DIFF
+    elif request.get("stdout"):
+        write_mode = WriteFlag.WRITE_TO_STDOUT
+    elif request.get("check"):
+        write_mode = WriteFlag.WRITE_NOTHING
+    else:
+        write_mode = WriteFlag.WRITE_TO_FILE
+    kwargs = {
+        "write_mode": write_mode,
+        "path": (src_root, write_path) if write_path else None,
+        "backup": request.get("backup", False),
+        "skip_lineno": request.get("skip_lineno", False),
+        "tometh_flag": request.get("tometh_flag", False),
+        "explicit_signals_flag": request.get("explicit_signals_flag", False),
+        "cache_dir": _unpack(request.get("cache_dir")),
+        "engine": request.get("engine", "redbaron"),
+        "chunk_lines": request.get("chunk_lines"),
+    }
+    if os.path.isdir(abs_path):
+        files = _folder_files(
+            src_path,
+            recursive=request.get("recursive", False),
+            exclude=[
+                _unpack(pattern) for pattern in request.get("exclude", [])
+            ],
+            default_excludes=request.get("default_excludes", True),
+            follow_symlinks=request.get("follow_symlinks", False),
+        )
+    else:
+        files = [src_path]
+    for fp in files:
+        result = _process_file(fp, **kwargs)
+        if result is not None:
+            yield result
+
+
+class _RequestHandler(SocketServer.StreamRequestHandler):
+    """
+    Every connection sends one json request line and gets back a json line
+    per converted file, followed by a line with either "done" or "error".
+    """
+    def handle(self):
+        request = _receive(self.rfile)
+        if request is None:
+            return
+        try:
+            # The server handles one request at a time, so it can move into
+            #   the folder of the client for relative paths to resolve.
+            os.chdir(_unpack(request["cwd"]))
+            for result in _process(request):
+                _send(self.wfile, {
+                    "path": _pack(result.path),
+                    "output": _pack(result.output),
+                    "errors": [_pack(error) for error in result.errors],
+                    "changed": result.changed,
+                })
+        except Exception:
+            _send(self.wfile, {"error": _pack(traceback.format_exc())})
+        else:
+            _send(self.wfile, {"done": True})
+
+
+class ConversionServer(SocketServer.UnixStreamServer):
+    """
+    ConversionServer converts files for clients on a unix socket. Requests
+    are handled one at a time.
+    """
+    def __init__(self, socket_path):
+        """
+        :param socket_path: The socket to listen on.
+        :type socket_path: str
+        """
+        self.socket_path = socket_path
+        _remove_stale_socket(socket_path)
+        SocketServer.UnixStreamServer.__init__(
+            self, socket_path, _RequestHandler
+        )
+        # Only the user that started the server may connect to it.
+        os.chmod(socket_path, 0o600)
+
+    def server_close(self):
+        SocketServer.UnixStreamServer.server_close(self)
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+def _remove_stale_socket(socket_path):
+    """
+    _remove_stale_socket removes a socket that was left behind by a server
+    that is not running anymore.
+
+    :param socket_path: The socket to check.
+    :type socket_path: str
+    :raises socket.error: If a server is still listening on it.
+    """
+    if not os.path.exists(socket_path):
+        return
+    try:
+        _connect(socket_path).close()
+    except DaemonUnavailable:
+        os.remove(socket_path)
+    else:
+        raise socket.error(
+            errno.EADDRINUSE,
+            "A server is already listening on {path}".format(
+                path=socket_path
+            )
+        )
+
+
+def serve(socket_path=None):
+    """
+    serve converts files for clients until it is interrupted or terminated.
+
+    :param socket_path: The socket to listen on, default_socket_path if None.
+    :type socket_path: None|str
+    """
+    from qt_py_convert.log import get_logger
+    from qt_py_convert.run import run
+
+    logger = get_logger("daemon")
+    if socket_path is None:
+        socket_path = default_socket_path()
+
+    run(_WARMUP_SOURCE, skip_lineno=True)
+    server = ConversionServer(socket_path)
+    logger.info("Listening on {path}".format(path=socket_path))
+
+    def _terminate(signum, frame):
+        raise SystemExit(0)
+
+    # A server started in the background ignores SIGINT, so it is usually
+    #   stopped with SIGTERM and has to clean up its socket for that too.
+    signal.signal(signal.SIGTERM, _terminate)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def _connect(socket_path):
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(socket_path)
+    except socket.error as err:
+        connection.close()
+        raise DaemonUnavailable(
+            "No server on {path}: {err}".format(path=socket_path, err=err)
+        )
+    return connection
+
+
+def convert(src_path, socket_path=None, recursive=False, stdout=False,
+            write_path=None, backup=False, skip_lineno=False,
+            tometh_flag=False, explicit_signals_flag=False, cache_dir=None,
+            engine="redbaron", diff=False, check=False, exclude=None,
+            default_excludes=True, follow_symlinks=False, chunk_lines=None,
+            src_root=None):
+    """
+    convert asks the server to process a file or folder, with the same
+    arguments as process_file and process_folder.
+
+    :param src_path: The file or folder to convert.
+    :type src_path: str
+    :param socket_path: The socket of the server, default_socket_path if
+        None.
+    :type socket_path: None|str
+    :param recursive: Recurse into the sub-folders of a folder?
+    :type recursive: bool
+    :param stdout: Return the converted code instead of writing it.
+    :type stdout: bool
+    :param write_path: If passed, the root to write the converted files in.
+    :type write_path: None|str
+    :param src_root: The folder that the converted files keep their place
+        under in write_path. The folder itself, or the folder of the file,
+        if None.
+    :type src_root: None|str
+    :param backup: Create a ".bak" file beside the converted files.
+    :type backup: bool
+    :param skip_lineno: Global "skip_lineno" flag.
+    :type skip_lineno: bool
+    :param tometh_flag: Global "tometh_flag" flag.
+    :type tometh_flag: bool
+    :param explicit_signals_flag: Global "explicit_signals_flag" flag.
+    :type explicit_signals_flag: bool
+    :param cache_dir: If passed, the folder that the server caches in.
+    :type cache_dir: None|str
+    :param engine: The engine that the server converts with, see
+        qt_py_convert.run.run.
+    :type engine: str
+    :param diff: Return a unified diff of the changed files instead of
+        writing them.
+    :type diff: bool
+    :param check: Do not write anything, only tell which files would change.
+    :type check: bool
+    :param exclude: Glob patterns of the files and folders to skip.
+    :type exclude: None|list[str...]
+    :param default_excludes: Also skip qt_py_convert.walk.DEFAULT_EXCLUDES?
+    :type default_excludes: bool
+    :param follow_symlinks: Walk into the symlinks to folders?
+    :type follow_symlinks: bool
+    :param chunk_lines: If passed, the server converts the files that are
+        longer than this in chunks, see qt_py_convert.run.run.
+    :type chunk_lines: None|int
+    :return: The path, stdout output, error messages and whether it changed
+        of every processed file, in order.
+    :rtype: generator[tuple[str,None|str,list[str...],bool]]
+    :raises DaemonUnavailable: If there is no server.
+    :raises RuntimeError: From the generator, if the server failed.
+    """
+    if socket_path is None:
+        socket_path = default_socket_path()
+    # Connect before returning, so a missing server is raised here and not
+    #   on the first result.
+    connection = _connect(socket_path)
+    request = {
+        "cwd": _pack(os.getcwd()),
+        "path": _pack(src_path),
+        "recursive": recursive,
+        "stdout": stdout,
+        "write_path": _pack(write_path),
+        "src_root": _pack(src_root),
+        "backup": backup,
+        "skip_lineno": skip_lineno,
+        "tometh_flag": tometh_flag,
+        "explicit_signals_flag": explicit_signals_flag,
+        "cache_dir": _pack(cache_dir),
+        "engine": engine,
+        "diff": diff,
+        "check": check,
+        "exclude": [_pack(pattern) for pattern in exclude or []],
+        "default_excludes": default_excludes,
+        "follow_symlinks": follow_symlinks,
+        "chunk_lines": chunk_lines,
+    }
+    return _results(connection, request, socket_path)
+
+
+def _results(connection, request, socket_path):
+    """Send request and yield the results that come back for convert."""
+    try:
+        fh = connection.makefile("rwb")
+        _send(fh, request)
+        while True:
+            message = _receive(fh)
+            if message is None:
+                raise DaemonUnavailable(
+                    "The server on {path} closed the connection.".format(
+                        path=socket_path
+                    )
+                )
+            elif "error" in message:
+                raise RuntimeError(_unpack(message["error"]))
+            elif message.get("done"):
+                return
+            yield (
+                _unpack(message["path"]),
+                _unpack(message["output"]),
+                [_unpack(error) for error in message["errors"]],
+                message["changed"],
+            )
+    finally:
+        connection.close()
@@ -19,7 +19,9 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
 # KIND, either express or implied. See the Apache License for the specific
 # language governing permissions and limitations under the Apache License.
-from qt_py_convert.color import ANSI, SUPPORTS_COLOR, color_text
+import difflib
+
+from qt_py_convert.color import ANSI, color_text, has_color
 
 
 class Chunk(object):
@@ -136,7 +138,7 @@ def _equalize(first, second, sep=(" ", ".", ",", "(")):
 
 
 def highlight_diffs(first, second, sep=(" ", ".", ",", "(")):
-    if not SUPPORTS_COLOR:
+    if not has_color():
         return first, second
     first_chunks, second_chunks = _equalize(first, second, sep=sep)
     first_out = ""
@@ -189,3 +191,37 @@ def highlight_diffs(first, second, sep=(" ", ".", ",", "(")):
                     text=second_chunk.sep,
                 )
     return first_out, second_out
+
+
+def _lines(text):
+    """Split text into lines on newlines only, unlike str.splitlines."""
+    lines = [line + "\n" for line in text.split("\n")]
+    lines[-1] = lines[-1][:-1]
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def unified_diff(path, before, after):
+    """
+    unified_diff builds a unified diff of a file, with the "a/" and "b/"
+    prefixes that "git apply" and "patch -p1" expect.
+
+    :param path: The path of the file.
+    :type path: str
+    :param before: The text of the file.
+    :type before: str
+    :param after: The new text of the file.
+    :type after: str
+    :return: The diff, or an empty str if nothing changed.
+    :rtype: str
+    """
+    path = path.lstrip("/")
+    out = []
+    for line in difflib.unified_diff(
+            _lines(before), _lines(after),
+            fromfile="a/" + path, tofile="b/" + path):
+        out.append(line)
+        if not line.endswith("\n"):
+            out.append("\n\\ No newline at end of file\n")
+    return "".join(out)
@@ -1,3 +1,17 @@
 # This is a temp hac until we can either stand up our own patched Qt.py
 #   or get these changes merged into mottosso/master.
-from Qt_py import Qt
+# Qt is the snapshot of the Qt.py tables, which loads without a Qt binding,
+#   unless there is none or $QT_PY_CONVERT_IMPORT_QT_PY is "1".
+#   See qt_py_convert.external.snapshot.
+import os
+
+from qt_py_convert.external.snapshot import IMPORT_QT_PY_ENV, import_qt_py
+
+Qt = None
+if os.environ.get(IMPORT_QT_PY_ENV) != "1":
+    try:
+        from qt_py_convert.external import _qt_snapshot as Qt
+    except ImportError:
+        pass
+if Qt is None:
+    Qt = import_qt_py()
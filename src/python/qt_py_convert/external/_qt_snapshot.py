@@ -0,0 +1,125 @@
+# Written by qt_py_convert.external.snapshot from Qt.py 1.3.10.
+#   Do not edit, write it again when Qt.py is updated.
+
+__version__ = '1.3.10'
+__binding__ = 'None'
+_common_members = {
+    'QtSql': ['QSql', 'QSqlDatabase', 'QSqlDriver', 'QSqlDriverCreatorBase', 'QSqlError', 'QSqlField', 'QSqlIndex', 'QSqlQuery', 'QSqlQueryModel', 'QSqlRecord', 'QSqlRelation', 'QSqlRelationalDelegate', 'QSqlRelationalTableModel', 'QSqlResult', 'QSqlTableModel'],
+    'QtXmlPatterns': ['QAbstractMessageHandler', 'QAbstractUriResolver', 'QAbstractXmlNodeModel', 'QAbstractXmlReceiver', 'QSourceLocation', 'QXmlFormatter', 'QXmlItem', 'QXmlName', 'QXmlNamePool', 'QXmlNodeModelIndex', 'QXmlQuery', 'QXmlResultItems', 'QXmlSchema', 'QXmlSchemaValidator', 'QXmlSerializer'],
+    'QtSvg': ['QGraphicsSvgItem', 'QSvgGenerator', 'QSvgRenderer', 'QSvgWidget'],
+    'QtWidgets': ['QAbstractButton', 'QAbstractGraphicsShapeItem', 'QAbstractItemDelegate', 'QAbstractItemView', 'QAbstractScrollArea', 'QAbstractSlider', 'QAbstractSpinBox', 'QAction', 'QActionGroup', 'QApplication', 'QBoxLayout', 'QButtonGroup', 'QCalendarWidget', 'QCheckBox', 'QColorDialog', 'QColumnView', 'QComboBox', 'QCommandLinkButton', 'QCommonStyle', 'QCompleter', 'QDataWidgetMapper', 'QDateEdit', 'QDateTimeEdit', 'QDesktopWidget', 'QDial', 'QDialog', 'QDialogButtonBox', 'QDirModel', 'QDockWidget', 'QDoubleSpinBox', 'QErrorMessage', 'QFileDialog', 'QFileIconProvider', 'QFileSystemModel', 'QFocusFrame', 'QFontComboBox', 'QFontDialog', 'QFormLayout', 'QFrame', 'QGesture', 'QGestureEvent', 'QGestureRecognizer', 'QGraphicsAnchor', 'QGraphicsAnchorLayout', 'QGraphicsBlurEffect', 'QGraphicsColorizeEffect', 'QGraphicsDropShadowEffect', 'QGraphicsEffect', 'QGraphicsEllipseItem', 'QGraphicsGridLayout', 'QGraphicsItem', 'QGraphicsItemGroup', 'QGraphicsLayout', 'QGraphicsLayoutItem', 'QGraphicsLineItem', 'QGraphicsLinearLayout', 'QGraphicsObject', 'QGraphicsOpacityEffect', 'QGraphicsPathItem', 'QGraphicsPixmapItem', 'QGraphicsPolygonItem', 'QGraphicsProxyWidget', 'QGraphicsRectItem', 'QGraphicsRotation', 'QGraphicsScale', 'QGraphicsScene', 'QGraphicsSceneContextMenuEvent', 'QGraphicsSceneDragDropEvent', 'QGraphicsSceneEvent', 'QGraphicsSceneHelpEvent', 'QGraphicsSceneHoverEvent', 'QGraphicsSceneMouseEvent', 'QGraphicsSceneMoveEvent', 'QGraphicsSceneResizeEvent', 'QGraphicsSceneWheelEvent', 'QGraphicsSimpleTextItem', 'QGraphicsTextItem', 'QGraphicsTransform', 'QGraphicsView', 'QGraphicsWidget', 'QGridLayout', 'QGroupBox', 'QHBoxLayout', 'QHeaderView', 'QInputDialog', 'QItemDelegate', 'QItemEditorCreatorBase', 'QItemEditorFactory', 'QKeyEventTransition', 'QLCDNumber', 'QLabel', 'QLayout', 'QLayoutItem', 'QLineEdit', 'QListView', 'QListWidget', 'QListWidgetItem', 'QMainWindow', 'QMdiArea', 'QMdiSubWindow', 'QMenu', 'QMenuBar', 'QMessageBox', 'QMouseEventTransition', 'QPanGesture', 'QPinchGesture', 'QPlainTextDocumentLayout', 'QPlainTextEdit', 'QProgressBar', 'QProgressDialog', 'QPushButton', 'QRadioButton', 'QRubberBand', 'QScrollArea', 'QScrollBar', 'QShortcut', 'QSizeGrip', 'QSizePolicy', 'QSlider', 'QSpacerItem', 'QSpinBox', 'QSplashScreen', 'QSplitter', 'QSplitterHandle', 'QStackedLayout', 'QStackedWidget', 'QStatusBar', 'QStyle', 'QStyleFactory', 'QStyleHintReturn', 'QStyleHintReturnMask', 'QStyleHintReturnVariant', 'QStyleOption', 'QStyleOptionButton', 'QStyleOptionComboBox', 'QStyleOptionComplex', 'QStyleOptionDockWidget', 'QStyleOptionFocusRect', 'QStyleOptionFrame', 'QStyleOptionGraphicsItem', 'QStyleOptionGroupBox', 'QStyleOptionHeader', 'QStyleOptionMenuItem', 'QStyleOptionProgressBar', 'QStyleOptionRubberBand', 'QStyleOptionSizeGrip', 'QStyleOptionSlider', 'QStyleOptionSpinBox', 'QStyleOptionTab', 'QStyleOptionTabBarBase', 'QStyleOptionTabWidgetFrame', 'QStyleOptionTitleBar', 'QStyleOptionToolBar', 'QStyleOptionToolBox', 'QStyleOptionToolButton', 'QStyleOptionViewItem', 'QStylePainter', 'QStyledItemDelegate', 'QSwipeGesture', 'QSystemTrayIcon', 'QTabBar', 'QTabWidget', 'QTableView', 'QTableWidget', 'QTableWidgetItem', 'QTableWidgetSelectionRange', 'QTapAndHoldGesture', 'QTapGesture', 'QTextBrowser', 'QTextEdit', 'QTimeEdit', 'QToolBar', 'QToolBox', 'QToolButton', 'QToolTip', 'QTreeView', 'QTreeWidget', 'QTreeWidgetItem', 'QTreeWidgetItemIterator', 'QUndoCommand', 'QUndoGroup', 'QUndoStack', 'QUndoView', 'QVBoxLayout', 'QWhatsThis', 'QWidget', 'QWidgetAction', 'QWidgetItem', 'QWizard', 'QWizardPage'],
+    'QtHelp': ['QHelpContentItem', 'QHelpContentModel', 'QHelpContentWidget', 'QHelpEngine', 'QHelpEngineCore', 'QHelpIndexModel', 'QHelpIndexWidget', 'QHelpSearchEngine', 'QHelpSearchQuery', 'QHelpSearchQueryWidget', 'QHelpSearchResultWidget'],
+    'QtOpenGL': ['QGL', 'QGLContext', 'QGLFormat', 'QGLWidget'],
+    'QtGui': ['QAbstractTextDocumentLayout', 'QActionEvent', 'QBitmap', 'QBrush', 'QClipboard', 'QCloseEvent', 'QColor', 'QConicalGradient', 'QContextMenuEvent', 'QCursor', 'QDesktopServices', 'QDoubleValidator', 'QDrag', 'QDragEnterEvent', 'QDragLeaveEvent', 'QDragMoveEvent', 'QDropEvent', 'QFileOpenEvent', 'QFocusEvent', 'QFont', 'QFontDatabase', 'QFontInfo', 'QFontMetrics', 'QFontMetricsF', 'QGradient', 'QHelpEvent', 'QHideEvent', 'QHoverEvent', 'QIcon', 'QIconDragEvent', 'QIconEngine', 'QImage', 'QImageIOHandler', 'QImageReader', 'QImageWriter', 'QInputEvent', 'QInputMethodEvent', 'QIntValidator', 'QKeyEvent', 'QKeySequence', 'QLinearGradient', 'QMatrix2x2', 'QMatrix2x3', 'QMatrix2x4', 'QMatrix3x2', 'QMatrix3x3', 'QMatrix3x4', 'QMatrix4x2', 'QMatrix4x3', 'QMatrix4x4', 'QMouseEvent', 'QMoveEvent', 'QMovie', 'QPaintDevice', 'QPaintEngine', 'QPaintEngineState', 'QPaintEvent', 'QPainter', 'QPainterPath', 'QPainterPathStroker', 'QPalette', 'QPen', 'QPicture', 'QPictureIO', 'QPixmap', 'QPixmapCache', 'QPolygon', 'QPolygonF', 'QQuaternion', 'QRadialGradient', 'QRegExpValidator', 'QRegion', 'QResizeEvent', 'QSessionManager', 'QShortcutEvent', 'QShowEvent', 'QStandardItem', 'QStandardItemModel', 'QStatusTipEvent', 'QSyntaxHighlighter', 'QTabletEvent', 'QTextBlock', 'QTextBlockFormat', 'QTextBlockGroup', 'QTextBlockUserData', 'QTextCharFormat', 'QTextCursor', 'QTextDocument', 'QTextDocumentFragment', 'QTextFormat', 'QTextFragment', 'QTextFrame', 'QTextFrameFormat', 'QTextImageFormat', 'QTextInlineObject', 'QTextItem', 'QTextLayout', 'QTextLength', 'QTextLine', 'QTextList', 'QTextListFormat', 'QTextObject', 'QTextObjectInterface', 'QTextOption', 'QTextTable', 'QTextTableCell', 'QTextTableCellFormat', 'QTextTableFormat', 'QTouchEvent', 'QTransform', 'QValidator', 'QVector2D', 'QVector3D', 'QVector4D', 'QWhatsThisClickedEvent', 'QWheelEvent', 'QWindowStateChangeEvent', 'qAlpha', 'qBlue', 'qGray', 'qGreen', 'qIsGray', 'qRed', 'qRgb', 'qRgba'],
+    'QtMultimedia': ['QAbstractVideoBuffer', 'QAbstractVideoSurface', 'QAudio', 'QAudioDeviceInfo', 'QAudioFormat', 'QAudioInput', 'QAudioOutput', 'QVideoFrame', 'QVideoSurfaceFormat'],
+    'QtX11Extras': ['QX11Info'],
+    'QtTest': ['QTest'],
+    'QtXml': ['QDomAttr', 'QDomCDATASection', 'QDomCharacterData', 'QDomComment', 'QDomDocument', 'QDomDocumentFragment', 'QDomDocumentType', 'QDomElement', 'QDomEntity', 'QDomEntityReference', 'QDomImplementation', 'QDomNamedNodeMap', 'QDomNode', 'QDomNodeList', 'QDomNotation', 'QDomProcessingInstruction', 'QDomText', 'QXmlAttributes', 'QXmlContentHandler', 'QXmlDTDHandler', 'QXmlDeclHandler', 'QXmlDefaultHandler', 'QXmlEntityResolver', 'QXmlErrorHandler', 'QXmlInputSource', 'QXmlLexicalHandler', 'QXmlLocator', 'QXmlNamespaceSupport', 'QXmlParseException', 'QXmlReader', 'QXmlSimpleReader'],
+    'QtPrintSupport': ['QAbstractPrintDialog', 'QPageSetupDialog', 'QPrintDialog', 'QPrintEngine', 'QPrintPreviewDialog', 'QPrintPreviewWidget', 'QPrinter', 'QPrinterInfo'],
+    'QtCore': ['QAbstractAnimation', 'QAbstractEventDispatcher', 'QAbstractItemModel', 'QAbstractListModel', 'QAbstractState', 'QAbstractTableModel', 'QAbstractTransition', 'QAnimationGroup', 'QBasicTimer', 'QBitArray', 'QBuffer', 'QByteArray', 'QByteArrayMatcher', 'QChildEvent', 'QCoreApplication', 'QCryptographicHash', 'QDataStream', 'QDate', 'QDateTime', 'QDir', 'QDirIterator', 'QDynamicPropertyChangeEvent', 'QEasingCurve', 'QElapsedTimer', 'QEvent', 'QEventLoop', 'QEventTransition', 'QFile', 'QFileInfo', 'QFileSystemWatcher', 'QFinalState', 'QGenericArgument', 'QGenericReturnArgument', 'QHistoryState', 'QItemSelectionRange', 'QIODevice', 'QLibraryInfo', 'QLine', 'QLineF', 'QLocale', 'QMargins', 'QMetaClassInfo', 'QMetaEnum', 'QMetaMethod', 'QMetaObject', 'QMetaProperty', 'QMimeData', 'QModelIndex', 'QMutex', 'QMutexLocker', 'QObject', 'QParallelAnimationGroup', 'QPauseAnimation', 'QPersistentModelIndex', 'QPluginLoader', 'QPoint', 'QPointF', 'QProcess', 'QProcessEnvironment', 'QPropertyAnimation', 'QReadLocker', 'QReadWriteLock', 'QRect', 'QRectF', 'QRegExp', 'QResource', 'QRunnable', 'QSemaphore', 'QSequentialAnimationGroup', 'QSettings', 'QSignalMapper', 'QSignalTransition', 'QSize', 'QSizeF', 'QSocketNotifier', 'QState', 'QStateMachine', 'QSysInfo', 'QSystemSemaphore', 'QT_TRANSLATE_NOOP', 'QT_TR_NOOP', 'QT_TR_NOOP_UTF8', 'QTemporaryFile', 'QTextBoundaryFinder', 'QTextCodec', 'QTextDecoder', 'QTextEncoder', 'QTextStream', 'QTextStreamManipulator', 'QThread', 'QThreadPool', 'QTime', 'QTimeLine', 'QTimer', 'QTimerEvent', 'QTranslator', 'QUrl', 'QVariantAnimation', 'QWaitCondition', 'QWriteLocker', 'QXmlStreamAttribute', 'QXmlStreamAttributes', 'QXmlStreamEntityDeclaration', 'QXmlStreamEntityResolver', 'QXmlStreamNamespaceDeclaration', 'QXmlStreamNotationDeclaration', 'QXmlStreamReader', 'QXmlStreamWriter', 'Qt', 'QtCriticalMsg', 'QtDebugMsg', 'QtFatalMsg', 'QtMsgType', 'QtSystemMsg', 'QtWarningMsg', 'qAbs', 'qAddPostRoutine', 'qChecksum', 'qCritical', 'qDebug', 'qFatal', 'qFuzzyCompare', 'qIsFinite', 'qIsInf', 'qIsNaN', 'qIsNull', 'qRegisterResourceData', 'qUnregisterResourceData', 'qVersion', 'qWarning', 'qrand', 'qsrand'],
+    'QtNetwork': ['QAbstractNetworkCache', 'QAbstractSocket', 'QAuthenticator', 'QHostAddress', 'QHostInfo', 'QLocalServer', 'QLocalSocket', 'QNetworkAccessManager', 'QNetworkAddressEntry', 'QNetworkCacheMetaData', 'QNetworkConfiguration', 'QNetworkConfigurationManager', 'QNetworkCookie', 'QNetworkCookieJar', 'QNetworkDiskCache', 'QNetworkInterface', 'QNetworkProxy', 'QNetworkProxyFactory', 'QNetworkProxyQuery', 'QNetworkReply', 'QNetworkRequest', 'QNetworkSession', 'QSsl', 'QTcpServer', 'QTcpSocket', 'QUdpSocket'],
+}
+_misplaced_members = {
+    'PyQt5': {
+        'sip.isdeleted': 'QtCompat.isValid',
+        'QtCore.QStringListModel': 'QtCore.QStringListModel',
+        'QtCore.QItemSelection': 'QtCore.QItemSelection',
+        'QtWidgets.QStyleOptionViewItem': 'QtCompat.QStyleOptionViewItemV4',
+        'QtCore.QItemSelectionRange': 'QtCore.QItemSelectionRange',
+        'QtCore.qInstallMessageHandler': 'QtCompat.qInstallMessageHandler',
+        'QtMultimedia.QSound': 'QtMultimedia.QSound',
+        'QtCore.QCoreApplication.translate': 'QtCompat.translate',
+        'uic.loadUi': 'QtCompat.loadUi',
+        'QtCore.pyqtSlot': 'QtCore.Slot',
+        'QtWidgets.qApp': 'QtWidgets.QApplication.instance()',
+        'sip.unwrapinstance': 'QtCompat.getCppPointer',
+        'sip.wrapinstance': 'QtCompat.wrapInstance',
+        'QtCore.QSortFilterProxyModel': 'QtCore.QSortFilterProxyModel',
+        'QtCore.pyqtSignal': 'QtCore.Signal',
+        'QtWidgets.QApplication.translate': 'QtCompat.translate',
+        'QtCore.pyqtProperty': 'QtCore.Property',
+        'QtCore.QAbstractProxyModel': 'QtCore.QAbstractProxyModel',
+        'QtCore.QItemSelectionModel': 'QtCore.QItemSelectionModel',
+    },
+    'PySide2': {
+        'QtCore.Signal': 'QtCore.Signal',
+        'QtCore.QStringListModel': 'QtCore.QStringListModel',
+        'QtCore.QItemSelection': 'QtCore.QItemSelection',
+        'shiboken2.getCppPointer': 'QtCompat.getCppPointer',
+        'QtWidgets.QStyleOptionViewItem': 'QtCompat.QStyleOptionViewItemV4',
+        'shiboken2.isValid': 'QtCompat.isValid',
+        'QtCore.QItemSelectionRange': 'QtCore.QItemSelectionRange',
+        'QtCore.qInstallMessageHandler': 'QtCompat.qInstallMessageHandler',
+        'QtCore.Property': 'QtCore.Property',
+        'QtCore.QCoreApplication.translate': 'QtCompat.translate',
+        'QtCore.Slot': 'QtCore.Slot',
+        'QtWidgets.qApp': 'QtWidgets.QApplication.instance()',
+        'QtMultimedia.QSound': 'QtMultimedia.QSound',
+        'QtCore.QSortFilterProxyModel': 'QtCore.QSortFilterProxyModel',
+        'QtUiTools.QUiLoader': 'QtCompat.loadUi',
+        'QtCore.QItemSelectionModel': 'QtCore.QItemSelectionModel',
+        'QtWidgets.QApplication.translate': 'QtCompat.translate',
+        'shiboken2.wrapInstance': 'QtCompat.wrapInstance',
+        'QtGui.QStringListModel': 'QtCore.QStringListModel',
+        'QtCore.QAbstractProxyModel': 'QtCore.QAbstractProxyModel',
+    },
+    'PySide': {
+        'QtCore.Signal': 'QtCore.Signal',
+        'QtGui.QStyleOptionViewItemV4': 'QtCompat.QStyleOptionViewItemV4',
+        'QtGui.QPrintPreviewDialog': 'QtPrintSupport.QPrintPreviewDialog',
+        'QtCore.QCoreApplication.translate': 'QtCompat.translate',
+        'QtGui.QAbstractProxyModel': 'QtCore.QAbstractProxyModel',
+        'QtGui.QItemSelectionModel': 'QtCore.QItemSelectionModel',
+        'QtCore.Property': 'QtCore.Property',
+        'QtGui.QPageSetupDialog': 'QtPrintSupport.QPageSetupDialog',
+        'QtGui.QPrintDialog': 'QtPrintSupport.QPrintDialog',
+        'shiboken.wrapInstance': 'QtCompat.wrapInstance',
+        'QtGui.QItemSelection': 'QtCore.QItemSelection',
+        'QtGui.QItemSelectionRange': 'QtCore.QItemSelectionRange',
+        'QtGui.QApplication.translate': 'QtCompat.translate',
+        'QtGui.QStringListModel': 'QtCore.QStringListModel',
+        'QtGui.QPrintPreviewWidget': 'QtPrintSupport.QPrintPreviewWidget',
+        'QtGui.QSound': 'QtMultimedia.QSound',
+        'QtGui.QPrinterInfo': 'QtPrintSupport.QPrinterInfo',
+        'QtGui.QAbstractPrintDialog': 'QtPrintSupport.QAbstractPrintDialog',
+        'shiboken.isValid': 'QtCompat.isValid',
+        'QtCore.Slot': 'QtCore.Slot',
+        'QtGui.QSortFilterProxyModel': 'QtCore.QSortFilterProxyModel',
+        'QtGui.QPrintEngine': 'QtPrintSupport.QPrintEngine',
+        'shiboken.unwrapInstance': 'QtCompat.getCppPointer',
+        'QtCore.qInstallMsgHandler': 'QtCompat.qInstallMessageHandler',
+        'QtUiTools.QUiLoader': 'QtCompat.loadUi',
+        'QtGui.QPrinter': 'QtPrintSupport.QPrinter',
+        'QtGui.qApp': 'QtWidgets.QApplication.instance()',
+    },
+    'PyQt4': {
+        'QtGui.QPrintPreviewDialog': 'QtPrintSupport.QPrintPreviewDialog',
+        'QtGui.QStyleOptionViewItemV4': 'QtCompat.QStyleOptionViewItemV4',
+        'sip.unwrapinstance': 'QtCompat.getCppPointer',
+        'QtCore.QCoreApplication.translate': 'QtCompat.translate',
+        'uic.loadUi': 'QtCompat.loadUi',
+        'QtGui.QAbstractProxyModel': 'QtCore.QAbstractProxyModel',
+        'QtGui.QItemSelectionModel': 'QtCore.QItemSelectionModel',
+        'QtGui.QPageSetupDialog': 'QtPrintSupport.QPageSetupDialog',
+        'sip.isdeleted': 'QtCompat.isValid',
+        'QtGui.QPrintDialog': 'QtPrintSupport.QPrintDialog',
+        'QtGui.QItemSelection': 'QtCore.QItemSelection',
+        'QtCore.pyqtSlot': 'QtCore.Slot',
+        'QtGui.QItemSelectionRange': 'QtCore.QItemSelectionRange',
+        'QtGui.QApplication.translate': 'QtCompat.translate',
+        'QtGui.QStringListModel': 'QtCore.QStringListModel',
+        'QtGui.QSound': 'QtMultimedia.QSound',
+        'QtGui.QPrinterInfo': 'QtPrintSupport.QPrinterInfo',
+        'QtGui.QAbstractPrintDialog': 'QtPrintSupport.QAbstractPrintDialog',
+        'QtGui.QSortFilterProxyModel': 'QtCore.QSortFilterProxyModel',
+        'sip.wrapinstance': 'QtCompat.wrapInstance',
+        'QtCore.QString': 'str',
+        'QtCore.pyqtProperty': 'QtCore.Property',
+        'QtGui.QPrintEngine': 'QtPrintSupport.QPrintEngine',
+        'QtCore.qInstallMsgHandler': 'QtCompat.qInstallMessageHandler',
+        'QtCore.pyqtSignal': 'QtCore.Signal',
+        'QtGui.QPrintPreviewWidget': 'QtPrintSupport.QPrintPreviewWidget',
+        'QtGui.QPrinter': 'QtPrintSupport.QPrinter',
+        'QtGui.qApp': 'QtWidgets.QApplication.instance()',
+    },
+}
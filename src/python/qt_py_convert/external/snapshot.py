@@ -0,0 +1,152 @@
+# Copyright 2018 Digital Domain 3.0
+#
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#
+# 6. Trademarks. This License does not grant permission to use the trade
+#    names, trademarks, service marks, or product names of the Licensor
+#    and its affiliates, except as required to comply with Section 4(c) of
+#    the License and to reproduce the content of the NOTICE file.
+#
+# You may obtain a copy of the Apache License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+"""
+snapshot writes the tables that qt_py_convert reads from Qt.py into a python
+module, so that they are loaded without importing Qt.py, which imports a Qt
+binding. Write it again whenever Qt.py is updated with:
+
+    python -m qt_py_convert.external.snapshot
+"""
+import os
+import sys
+import types
+
+SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), "_qt_snapshot.py")
+# Set to "1" to import Qt.py instead of the snapshot.
+IMPORT_QT_PY_ENV = "QT_PY_CONVERT_IMPORT_QT_PY"
+
+_HEADER = """\
+# Written by qt_py_convert.external.snapshot from Qt.py {version}.
+#   Do not edit, write it again when Qt.py is updated.
+"""
+
+
+def import_qt_py():
+    """
+    import_qt_py imports Qt.py without a binding, the way that the snapshot
+    is taken.
+
+    :return: The Qt.py module.
+    :rtype: module
+    """
+    preferred = os.environ.get("QT_PREFERRED_BINDING")
+    os.environ["QT_PREFERRED_BINDING"] = "None"
+    try:
+        from Qt_py import Qt
+    finally:
+        if preferred is None:
+            del os.environ["QT_PREFERRED_BINDING"]
+        else:
+            os.environ["QT_PREFERRED_BINDING"] = preferred
+    return Qt
+
+
+def tables(qt):
+    """
+    tables reads the tables that qt_py_convert uses from Qt.py. Qt.py pairs
+    some of its misplaced members with a compatibility function, only the
+    name that they move to is kept.
+
+    :param qt: The Qt.py module, see import_qt_py.
+    :type qt: module
+    :return: The name and the value of every table, in the order that they
+        are written in.
+    :rtype: list[tuple[str,object]...]
+    """
+    misplaced = {}
+    for binding in qt._misplaced_members:
+        members = misplaced[binding] = {}
+        for source in qt._misplaced_members[binding]:
+            dest = qt._misplaced_members[binding][source]
+            if isinstance(dest, (list, tuple)):
+                dest = dest[0]
+            members[source] = dest
+    return [
+        ("__version__", qt.__version__),
+        ("__binding__", qt.__binding__),
+        ("_common_members", qt._common_members),
+        ("_misplaced_members", misplaced),
+    ]
+
+
+def _dict(value, indent):
+    """
+    Write value in its own iteration order, which the conversions depend
+    on, a key per line.
+    """
+    if not isinstance(value, dict):
+        return repr(value)
+    if not value:
+        return "{}"
+    lines = ["{"]
+    for key in value:
+        lines.append("{indent}    {key!r}: {value},".format(
+            indent=indent, key=key, value=_dict(value[key], indent + "    ")
+        ))
+    lines.append(indent + "}")
+    return "\n".join(lines)
+
+
+def dumps(qt):
+    """
+    dumps writes the tables of Qt.py as the source of a module.
+
+    :param qt: The Qt.py module, see import_qt_py.
+    :type qt: module
+    :return: The source of the snapshot.
+    :rtype: str
+    """
+    lines = [_HEADER.format(version=qt.__version__)]
+    for name, value in tables(qt):
+        lines.append("{name} = {value}".format(
+            name=name, value=_dict(value, "")
+        ))
+    return "\n".join(lines) + "\n"
+
+
+def loads(source):
+    """
+    loads builds the module that a snapshot source stands for.
+
+    :param source: The source from dumps.
+    :type source: str
+    :return: A module with the same tables as Qt.py.
+    :rtype: module
+    """
+    module = types.ModuleType("_qt_snapshot")
+    exec(compile(source, SNAPSHOT_PATH, "exec"), module.__dict__)
+    return module
+
+
+def write(path=SNAPSHOT_PATH):
+    """
+    write takes the snapshot of the Qt.py that is installed.
+
+    :param path: The module to write.
+    :type path: str
+    """
+    with open(path, "wb") as fh:
+        fh.write(dumps(import_qt_py()))
+
+
+if __name__ == "__main__":
+    write(*sys.argv[1:])
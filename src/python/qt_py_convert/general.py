@@ -26,10 +26,11 @@ import copy
 import json
 import os
 import re
+import stat
 
 from qt_py_convert.color import ANSI, color_text
 from qt_py_convert.diff import highlight_diffs
-from qt_py_convert.log import get_logger
+from qt_py_convert.log import get_logger, debug_enabled
 from qt_py_convert.external import Qt
 
 GENERAL_LOGGER = get_logger("general", name_color=ANSI.colors.green)
@@ -38,9 +39,38 @@ GENERAL_LOGGER = get_logger("general", name_color=ANSI.colors.green)
 class WriteFlag(object):
     WRITE_TO_FILE = 0b0001
     WRITE_TO_STDOUT = 0b0010
+    # A unified diff of the changed files to stdout.
+    WRITE_DIFF = 0b0100
+    # Only find out which files would change.
+    WRITE_NOTHING = 0b1000
 
 
-def change(logger, node, replacement, skip_lineno=False, msg=None):
+def _node_lines(node, context=None):
+    """
+    _node_lines returns the first and last line of node, counted from 1.
+    They come from the NodeIndex of the conversion when it has the node, and
+    from the much slower redbaron bounding box otherwise.
+
+    :param node: Redbaron node to get the lines of.
+    :type node: redbaron.node
+    :param context: The conversion that node belongs to.
+    :type context: None|ConversionContext
+    :return: The lines, or None if node can't tell.
+    :rtype: None|tuple[int,int]
+    """
+    index = getattr(get_context(context), "index", None)
+    if index is not None:
+        lines = index.lines(node)
+        if lines is not None:
+            return lines
+    if not hasattr(node, "absolute_bounding_box"):
+        return None
+    bbox = node.absolute_bounding_box
+    return bbox.top_left.line, bbox.bottom_right.line
+
+
+def change(logger, node, replacement, skip_lineno=False, msg=None,
+           context=None):
     """
     A helper function to print information about replacing a node.
 
@@ -53,27 +83,36 @@ def change(logger, node, replacement, skip_lineno=False, msg=None):
     :param skip_lineno: Skip lineno flag.
     :type skip_lineno: bool
     :param msg: Optional custom message to write out.
-    :type msg: None|str
+    :type msg: None|str|qt_py_convert.log.LazyMessage
+    :param context: The conversion that node belongs to.
+    :type context: None|ConversionContext
     :return: Returns the result of the handler.
     :rtype: None
     """
+    if not debug_enabled(logger):
+        # Nothing is written, so there is nothing to work out.
+        return None
+
     failure_message = (
             color_text(color=ANSI.colors.orange, text="WARNING:") +
             " Could not replace \"{original}\" with \"{replacement}\""
     )
     if msg is None:
         msg = "Replacing \"{original}\" with \"{replacement}\""
+    else:
+        msg = str(msg)
 
     _orig = str(node).strip("\n")
     _repl = replacement
     original, replacement = highlight_diffs(_orig, _repl)
     if not skip_lineno:
         msg += " at line {line}"
-        if not hasattr(node, "absolute_bounding_box"):
+        lines = _node_lines(node, context=context)
+        if lines is None:
             msg = failure_message
             line = "N/A"
         else:
-            line = node.absolute_bounding_box.top_left.line - 1
+            line = lines[0] - 1
 
     result = logger.debug(
             msg.format(**locals())
@@ -126,28 +165,30 @@ class ErrorClass(object):
 
     It takes a redbaron node and a str to describe why it can't be fixed.
     """
-    def __init__(self, row_from, row_to, reason):
+    def __init__(self, row_from, row_to, reason, context=None):
         """
         :param node: Redbaron node that can't be fixed.
         :type node: redbaron.Node
         :param reason: Reason that the thing cannot be fixed.
         :type reason: str
+        :param context: The conversion that the error belongs to.
+        :type context: None|ConversionContext
         """
         super(ErrorClass, self).__init__()
 
         self.row = row_from
         self.row_to = row_to
         self.reason = reason
-        ALIAS_DICT["errors"].add(self)
+        get_context(context)["errors"].add(self)
 
     @classmethod
-    def from_node(cls, node, reason):
-        bbox = node.absolute_bounding_box
+    def from_node(cls, node, reason, context=None):
+        first_line, last_line = _node_lines(node, context=context)
 
-        row = bbox.top_left.line - 1
-        row_to = bbox.bottom_right.line - 1
+        row = first_line - 1
+        row_to = last_line - 1
         reason = reason
-        return cls(row_from=row, row_to=row_to, reason=reason)
+        return cls(row_from=row, row_to=row_to, reason=reason, context=context)
 
 
 class UserInputRequiredException(BaseException):
@@ -159,7 +200,7 @@ class UserInputRequiredException(BaseException):
 
 class AliasDictClass(dict):
     """
-    Global state data store
+    State data store
     """
     BINDINGS = "bindings"
     ALIASES = "root_aliases"
@@ -191,7 +232,38 @@ class AliasDictClass(dict):
         self[self.ERRORS] = set()
 
 
-ALIAS_DICT = AliasDictClass()
+class ConversionContext(AliasDictClass):
+    """
+    ConversionContext holds the state of a single conversion.
+
+    run creates a new one for every call and passes it through the _modules
+    and into ErrorClass. Nothing about a conversion is kept at the module
+    level, so any number of them can run at the same time.
+    """
+    def __init__(self):
+        super(ConversionContext, self).__init__()
+        # The node_index.NodeIndex of the tree that is being converted.
+        self.index = None
+        # The profiling.ConversionProfile to record the stages into.
+        self.profile = None
+
+
+# Default context for the _modules when they are called without one.
+ALIAS_DICT = ConversionContext()
+
+
+def get_context(context=None):
+    """
+    get_context returns the context that a conversion should be recorded in.
+
+    :param context: The context that was passed in, if any.
+    :type context: None|ConversionContext
+    :return: The context, or the module level ALIAS_DICT if it was None.
+    :rtype: ConversionContext
+    """
+    if context is None:
+        return ALIAS_DICT
+    return context
 
 
 def merge_dict(lhs, rhs, keys=None, keys_both=False):
@@ -250,12 +322,52 @@ def supported_binding(binding_str):
     return None
 
 
+# Only this much of a file is read to look for a shebang.
+_SHEBANG_SIZE = 256
+_SHEBANG_EXPRESSION = re.compile(r"#![^\n]*\bpython[\d.]*(?:\s|$)")
+# The is_py answers for files without an extension, by
+#   (device, inode, mtime, size) so a changed file is read again.
+_is_py_cache = {}
+_IS_PY_CACHE_SIZE = 100000
+
+
+def _has_python_shebang(path):
+    """
+    _has_python_shebang reads the start of a file that has no extension and
+    looks for a shebang that runs python.
+
+    :param path: The filepath to the file that we are querying.
+    :type path: str
+    :return: True if it has a python shebang. False otherwise
+    :rtype: bool
+    """
+    try:
+        info = os.stat(path)
+    except OSError:
+        return False
+    if not stat.S_ISREG(info.st_mode):
+        return False
+    key = (info.st_dev, info.st_ino, info.st_mtime, info.st_size)
+    result = _is_py_cache.get(key)
+    if result is None:
+        try:
+            with open(path, "rb") as fh:
+                head = fh.read(_SHEBANG_SIZE)
+        except IOError:
+            return False
+        result = bool(_SHEBANG_EXPRESSION.match(head))
+        if len(_is_py_cache) >= _IS_PY_CACHE_SIZE:
+            _is_py_cache.clear()
+        _is_py_cache[key] = result
+    return result
+
+
 def is_py(path):
     """
     My helper method for process_folder to decide if a file is a python file
     or not.
     It is currently checking the file extension and then falling back to
-    checking the first line of the file.
+    checking the shebang of the file.
 
     :param path: The filepath to the file that we are querying.
     :type path: str
@@ -264,10 +376,8 @@ def is_py(path):
     """
     if path.endswith(".py"):
         return True
-    elif not os.path.splitext(path)[1] and os.path.isfile(path):
-        with open(path, "rb") as fh:
-            if "python" in fh.readline():
-                return True
+    elif not os.path.splitext(path)[1]:
+        return _has_python_shebang(path)
     return False
 
 
@@ -38,9 +38,21 @@ class ColoredFormatter(logging.Formatter):
     }
 
     def __init__(self, fmt, dt=None):
-        logging.Formatter.__init__(self, fmt, dt)
+        """
+        :param fmt: The format, or a function that returns it. A function is
+            only called once the first record is formatted, so the terminal
+            is not checked for color support until something is logged.
+        :type fmt: str|callable
+        :param dt: The date format.
+        :type dt: str
+        """
+        self._fmt_factory = fmt if callable(fmt) else None
+        logging.Formatter.__init__(self, None if callable(fmt) else fmt, dt)
 
     def format(self, record):
+        if self._fmt_factory is not None:
+            self._fmt = self._fmt_factory()
+            self._fmt_factory = None
         levelname = record.levelname
         if levelname in self.COLORS:
             levelname_color = color_text(
@@ -52,15 +64,63 @@ class ColoredFormatter(logging.Formatter):
         return logging.Formatter.format(self, record)
 
 
+class LazyMessage(object):
+    """
+    LazyMessage is a log message that is only built if it is written.
+    Pass it to a logger instead of a str, the logger calls str on it once it
+    knows that the record is going to be emitted.
+
+    >>> LOG.debug(LazyMessage("Adding {bind}".format, bind=dest))
+    """
+    def __init__(self, function, *args, **kwargs):
+        """
+        :param function: Builds the message from args and kwargs.
+        :type function: callable
+        """
+        super(LazyMessage, self).__init__()
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self):
+        return str(self.function(*self.args, **self.kwargs))
+
+
+def lazy_color_text(color=ANSI.colors.white, text="", style=ANSI.styles.plain):
+    """
+    lazy_color_text is color_text for log messages. The text is only colored
+    if the message is written.
+
+    :return: The colored version of the text, once it is written.
+    :rtype: LazyMessage
+    """
+    return LazyMessage(color_text, color=color, text=text, style=style)
+
+
+def debug_enabled(logger):
+    """
+    debug_enabled checks if a debug message would be written by logger. Use
+    it to skip work that only a debug message needs.
+
+    :param logger: A python logger
+    :type logger: logging.Logger
+    :rtype: bool
+    """
+    return logger.isEnabledFor(logging.DEBUG)
+
+
 def get_formatter(name="%(name)s", name_color=ANSI.colors.purple,
                   name_style=ANSI.styles.plain, msg_color=ANSI.colors.white):
 
-    custom_name = color_text(text=name, color=name_color, style=name_style)
-    message = color_text(text="%(message)s", color=msg_color)
-    formatter = ColoredFormatter(
-        "%(asctime)s - %(levelname)s | [" + custom_name + "] " + message,
-        "%Y-%m-%d %H:%M:%S"
-    )
+    def _fmt():
+        custom_name = color_text(
+            text=name, color=name_color, style=name_style
+        )
+        message = color_text(text="%(message)s", color=msg_color)
+        return "%(asctime)s - %(levelname)s | [" + custom_name + "] " + \
+            message
+
+    formatter = ColoredFormatter(_fmt, "%Y-%m-%d %H:%M:%S")
     return formatter
 
 
@@ -22,11 +22,143 @@
 import re
 
 from qt_py_convert.external import Qt
-from qt_py_convert.log import get_logger
+from qt_py_convert.log import get_logger, LazyMessage
 from qt_py_convert.general import _custom_misplaced_members
 
 MAPPINGS_LOG = get_logger("mappings")
 
+# A member ends where its attributes, indexing or call start.
+_MEMBER_END = re.compile(r"[.\[(]")
+
+# Built on first use and shared by every conversion after that.
+# It only depends on Qt._common_members.
+_MEMBER_TABLES = None
+
+
+def _member_tables():
+    """
+    _member_tables returns the lookup tables for the Qt._common_members.
+
+    :return: A dict of every member to the modules that have it, and a dict
+        of every module to its place in Qt._common_members.
+    :rtype: tuple[dict[str,tuple[str]],dict[str,int]]
+    """
+    global _MEMBER_TABLES
+    if _MEMBER_TABLES is None:
+        modules_by_member = {}
+        module_order = {}
+        for number, module_name in enumerate(Qt._common_members.keys()):
+            module_order[module_name] = number
+            for member in Qt._common_members[module_name]:
+                modules_by_member.setdefault(member, []).append(module_name)
+        _MEMBER_TABLES = (
+            dict(
+                (member, tuple(modules))
+                for member, modules in modules_by_member.items()
+            ),
+            module_order,
+        )
+    return _MEMBER_TABLES
+
+
+def split_member(line):
+    """
+    split_member splits a line of source like "QtGui.QWidget(parent)" into
+    its Qt module and the member after it.
+
+    :param line: A single line of source.
+    :type line: str
+    :return: The module and member, or None if the line does not start with
+        a Qt module.
+    :rtype: None|tuple[str,str]
+    """
+    module_name, dot, rest = line.partition(".")
+    if not dot or module_name not in Qt._common_members:
+        return None
+    return module_name, _MEMBER_END.split(rest, 1)[0]
+
+
+def is_common_member(line):
+    """
+    is_common_member checks if a line of source starts with any Qt module
+    followed by any Qt._common_members member.
+
+    :param line: A single line of source.
+    :type line: str
+    :rtype: bool
+    """
+    split = split_member(line)
+    return split is not None and split[1] in _member_tables()[0]
+
+
+def convert_attribute(text):
+    """
+    convert_attribute moves a Qt member to the module that Qt.py has it in.
+    "QtGui.QLineEdit()" becomes "QtWidgets.QLineEdit()".
+
+    Every line of text that starts with a Qt module member is looked at.
+    The target is the first module, in Qt._common_members order, that has
+    one of those members and is not the module it is used from. The lines
+    with a member of the target module are then moved to it.
+
+    :param text: Source of an AtomTrailersNode or DottedNameNode.
+    :type text: str
+    :return: The module that it was moved to and the converted text, or
+        None and the text if nothing moved.
+    :rtype: tuple[None|str,str]
+    """
+    modules_by_member, module_order = _member_tables()
+    lines = text.split("\n")
+    splits = [split_member(line) for line in lines]
+    target = None
+    for split in splits:
+        if split is None:
+            continue
+        module_name, member = split
+        for candidate in modules_by_member.get(member, ()):
+            if candidate != module_name:
+                if target is None or \
+                        module_order[candidate] < module_order[target]:
+                    target = candidate
+                break
+    if target is None:
+        return None, text
+
+    for number, split in enumerate(splits):
+        if split is not None and \
+                target in modules_by_member.get(split[1], ()):
+            lines[number] = target + lines[number][len(split[0]):]
+    return target, "\n".join(lines)
+
+
+def _convert_mapping(mapping):
+    """
+    _convert_mapping moves the member at the end of a mapping to the last
+    module, in Qt._common_members order, that has it.
+    "QtGui.QLineEdit" becomes "QtWidgets.QLineEdit".
+
+    :param mapping: The value of a mapping.
+    :type mapping: str
+    :return: The converted mapping.
+    :rtype: str
+    """
+    modules_by_member = _member_tables()[0]
+    head, dot, member = mapping.rpartition(".")
+    if not dot or member not in modules_by_member:
+        return mapping
+    # The member can come after any module, even part way through a name.
+    starts = [
+        len(head) - len(module_name) for module_name in Qt._common_members
+        if head.endswith(module_name)
+    ]
+    if not starts:
+        return mapping
+    return "{prefix}{module}.{member}".format(
+        prefix=head[:min(starts)],
+        module=modules_by_member[member][-1],
+        member=member,
+    )
+
 
 def misplaced_members(aliases, mappings):
     """
@@ -43,19 +175,22 @@ def misplaced_members(aliases, mappings):
     :return: A tuple of aliases and mappings that have been updated.
     :rtype: tuple[dict,dict]
     """
-    members = Qt._misplaced_members.get(Qt.__binding__.lower(), {})
+    # Copy, we don't want to update the Qt.py table that is shared by
+    #   every conversion.
+    members = dict(Qt._misplaced_members.get(Qt.__binding__.lower(), {}))
     for binding in aliases["bindings"]:
         if binding in Qt._misplaced_members:
-            MAPPINGS_LOG.debug("Merging {misplaced} to bindings".format(
+            MAPPINGS_LOG.debug(LazyMessage(
+                "Merging {misplaced} to bindings".format,
                 misplaced=Qt._misplaced_members.get(binding, {})
             ))
             members.update(Qt._misplaced_members.get(binding, {}))
         elif binding in _custom_misplaced_members:
             members.update(_custom_misplaced_members.get(binding, {}))
         else:
-            MAPPINGS_LOG.debug(
-                "Could not find misplaced members for {}".format(binding)
-            )
+            MAPPINGS_LOG.debug(LazyMessage(
+                "Could not find misplaced members for {}".format, binding
+            ))
 
         _msg = "Replacing \"{original}\" with \"{replacement}\" in mappings"
         if members:
@@ -66,18 +201,17 @@ def misplaced_members(aliases, mappings):
                     dest, _ = members[source]
                 for current_key in mappings:
                     if mappings[current_key] == source:
-                        MAPPINGS_LOG.debug(
-                            _msg.format(
-                                original=mappings[current_key],
-                                replacement=dest
-                            )
-                        )
+                        MAPPINGS_LOG.debug(LazyMessage(
+                            _msg.format,
+                            original=mappings[current_key],
+                            replacement=dest
+                        ))
                         mappings[current_key] = dest
                         replaced = True
                 if not replaced:
-                    MAPPINGS_LOG.debug(
-                        "Adding {bind} in mappings".format(bind=dest)
-                    )
+                    MAPPINGS_LOG.debug(LazyMessage(
+                        "Adding {bind} in mappings".format, bind=dest
+                    ))
                     mappings[source] = dest
     return aliases, mappings
 
@@ -86,8 +220,8 @@ def convert_mappings(aliases, mappings):
     """
     convert_mappings will build a proper mapping dictionary using any
     aliases that we have discovered previously.
-    It builds regular expressions based off of the Qt._common_members and will
-    replace the mappings that are used with updated ones in Qt.py
+    It looks the members up in the Qt._common_members and will replace the
+    mappings that are used with updated ones in Qt.py
 
     :param aliases: Aliases is the replacement information that is build
         automatically from qt_py_convert.
@@ -98,32 +232,9 @@ def convert_mappings(aliases, mappings):
         however it is updating the aliases["used"] set.
     :rtype: dict
     """
-    expressions = [
-        re.compile(
-            r"(?P<module>{modules})\.(?P<widget>{widgets})$".format(
-                # Regular expression
-                modules="|".join(
-                    re.escape(name) for name in Qt._common_members.keys()
-                ),
-                widgets="|".join(
-                    re.escape(widget) for widget in Qt._common_members[module]
-                )
-            )
-        )
-        for module in Qt._common_members.keys()
-    ]
     for from_mapping in mappings:
-        iterable = zip(Qt._common_members.keys(), expressions)
-        for module_name, expression in iterable:
-            modified_mapping = expression.sub(
-                r"{module}.\2".format(module=module_name),
-                mappings[from_mapping]
-            )
-            if modified_mapping != mappings[from_mapping]:
-                # Mapping changed
-                # _---------------------------_ #
-                # We shouldn't be adding it here.
-                # We don't know if it's used yet.
-                #       aliases["used"].add(module_name)
-                mappings[from_mapping] = modified_mapping
+        # _---------------------------_ #
+        # We shouldn't be adding to aliases["used"] here.
+        # We don't know if it's used yet.
+        mappings[from_mapping] = _convert_mapping(mappings[from_mapping])
     return mappings
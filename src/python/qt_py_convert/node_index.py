@@ -0,0 +1,450 @@
+# Copyright 2018 Digital Domain 3.0
+#
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#
+# 6. Trademarks. This License does not grant permission to use the trade
+#    names, trademarks, service marks, or product names of the Licensor
+#    and its affiliates, except as required to comply with Section 4(c) of
+#    the License and to reproduce the content of the NOTICE file.
+#
+# You may obtain a copy of the Apache License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+"""
+node_index walks a redbaron tree once and keeps every node in an index.
+The conversion passes look their nodes up in it instead of each walking the
+whole tree with red.find_all.
+"""
+import keyword
+import re
+
+import baron
+import redbaron
+from redbaron.base_nodes import ProxyList
+from redbaron.utils import baron_type_to_redbaron_classname
+
+from qt_py_convert.general import get_context
+
+
+# Kinds of the items on the NodeIndex._add stack.
+_NODE = "node"
+_TEXT = "text"
+_END = "end"
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_]\w*$")
+
+
+def _is_set(value):
+    """The truth test that baron renders the dependent keys of a node with."""
+    if isinstance(value, redbaron.Node):
+        return True
+    return bool(value)
+
+
+def _render_items(node, rendered=True):
+    """
+    _render_items yields what node renders to, in order. The text of node
+    itself as str and its children as (child, rendered) pairs, in the same
+    order as Node.find_iter visits them. A child that baron would not render
+    is given as not rendered, and a node that is not rendered has no text.
+
+    :param node: The redbaron node to get the parts of.
+    :type node: redbaron.Node
+    :param rendered: Whether node itself is rendered.
+    :type rendered: bool
+    """
+    for kind, key, dependent in node._render():
+        if kind == "bool":
+            continue
+        if dependent is False:
+            shown = False
+        elif isinstance(dependent, list):
+            shown = all(_is_set(getattr(node, name)) for name in dependent)
+        elif dependent is True:
+            shown = True
+        else:
+            shown = _is_set(getattr(node, dependent))
+        shown = shown and rendered
+
+        if kind == "constant":
+            if shown:
+                yield key
+        elif kind == "string":
+            if shown:
+                yield getattr(node, key) or ""
+        elif kind == "key":
+            child = getattr(node, key)
+            if isinstance(child, redbaron.Node):
+                yield child, shown
+        elif kind in ("list", "formatting"):
+            children = getattr(node, key)
+            if isinstance(children, ProxyList):
+                children = children.node_list
+            for child in children:
+                yield child, shown
+
+
+def _type_key(node_type):
+    """
+    _type_key turns a node type or a find_all identifier into the key that
+    the NodeIndex stores it under. "AtomTrailersNode", "atomtrailers" and
+    "dotted_name", "DottedNameNode" come out the same.
+    """
+    key = node_type.lower().replace("_", "")
+    if key.endswith("node"):
+        key = key[:-len("node")]
+    return key
+
+
+def get_index(red, context=None):
+    """
+    get_index returns the NodeIndex of red for a conversion.
+    The index is built the first time that it is asked for and kept on the
+    context, so every pass of the conversion shares the one walk of the tree.
+
+    :param red: The redbaron ast.
+    :type red: redbaron.RedBaron
+    :param context: The conversion that we are recording into.
+    :type context: None|qt_py_convert.general.ConversionContext
+    :return: The index for red.
+    :rtype: NodeIndex
+    """
+    context = get_context(context)
+    index = getattr(context, "index", None)
+    if index is None or index.red is not red:
+        index = NodeIndex(red)
+        context.index = index
+    return index
+
+
+class NodeIndex(object):
+    """
+    NodeIndex stores every node of a tree under its type, NameNodes
+    under their value and AtomTrailersNodes and DottedNameNodes under every
+    dotted prefix of their source, so "QtGui.QWidget(parent)" can be found
+    from "QtGui.QWidget".
+
+    Every node is given its path from the root as a position, so lookups come
+    back in the same order as red.find_all. Nodes must be replaced and removed
+    through NodeIndex.replace and NodeIndex.remove for the index to stay in
+    sync with the tree.
+    """
+    DOTTED_TYPES = ("atomtrailers", "dotted_name")
+
+    def __init__(self, red):
+        """
+        :param red: The redbaron ast.
+        :type red: redbaron.RedBaron
+        """
+        super(NodeIndex, self).__init__()
+        self.red = red
+        self._types = {}
+        self._names = {}
+        self._dotted = {}
+        self._positions = {}
+        self._children = {}
+        # (id(node), None) for node.dumps(), (id(node), "value") for
+        #   node.value.dumps().
+        self._dumps = {}
+        # id(node) -> (first line, last line), counted from 1.
+        self._lines = {}
+        # Replacement text -> the baron tree that it parses to.
+        self._parsed = {}
+        # The number of replace and remove calls that changed the tree.
+        self.replacements = 0
+        self._add(
+            [(node, (number,)) for number, node in enumerate(red.node_list)],
+            line=1
+        )
+
+    def _add(self, nodes, line):
+        """
+        Index nodes and everything under them. The line numbers are counted
+        from the text that is rendered on the way.
+
+        :param nodes: (node, position) pairs in the order they render in.
+        :type nodes: list[tuple[redbaron.Node,tuple]]
+        :param line: The line that the first node starts on.
+        :type line: int
+        """
+        # Text is counted as it is passed, nodes are finished with an
+        #   _END once everything under them is.
+        stack = [
+            (_NODE, node, position, True)
+            for node, position in reversed(nodes)
+        ]
+        last_line = line
+        counted = 0
+        while stack:
+            item = stack.pop()
+            if item[0] is _TEXT:
+                text = item[1]
+                if text:
+                    last_line = line + text.count("\n", 0, len(text) - 1)
+                    line += text.count("\n")
+                    counted += len(text)
+                continue
+            if item[0] is _END:
+                _, current, first_line, counted_before = item
+                # An empty node ends where it starts.
+                self._lines[id(current)] = (
+                    first_line,
+                    last_line if counted > counted_before else first_line
+                )
+                continue
+
+            _, current, current_position, rendered = item
+            children = []
+            parts = []
+            for part in _render_items(current, rendered):
+                if isinstance(part, tuple):
+                    child, child_rendered = part
+                    parts.append((
+                        _NODE, child,
+                        current_position + (len(children),),
+                        child_rendered
+                    ))
+                    children.append(child)
+                else:
+                    parts.append((_TEXT, part))
+            self._positions[id(current)] = current_position
+            self._children[id(current)] = children
+            self._types.setdefault(
+                _type_key(current.type), []
+            ).append(current)
+            self._add_keys(current)
+            stack.append((_END, current, line, counted))
+            stack.extend(reversed(parts))
+
+    def _add_keys(self, node):
+        """Store node under the keys that its current source gives it."""
+        if node.type == "name":
+            self._names.setdefault(node.value, []).append(node)
+        elif node.type in self.DOTTED_TYPES:
+            text = self.dumps(node)
+            keys = set(
+                text[:number] for number, char in enumerate(text)
+                if char in ".[("
+            )
+            keys.add(text)
+            for key in keys:
+                if "." in key:
+                    self._dotted.setdefault(key, []).append(node)
+
+    def _forget_dumps(self, node):
+        """Drop the cached source of node."""
+        self._dumps.pop((id(node), None), None)
+        self._dumps.pop((id(node), "value"), None)
+
+    def _discard(self, node):
+        """Forget node and everything that was under it when indexed."""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            self._positions.pop(id(current), None)
+            self._lines.pop(id(current), None)
+            self._forget_dumps(current)
+            stack.extend(self._children.pop(id(current), ()))
+
+    def _sorted(self, nodes):
+        """The nodes that are still in the tree, once each, in tree order."""
+        alive = {}
+        for node in nodes:
+            if self.is_alive(node):
+                alive[id(node)] = node
+        return sorted(
+            alive.values(), key=lambda node: self._positions[id(node)]
+        )
+
+    def is_alive(self, node):
+        """
+        is_alive checks that node is still part of the tree.
+        Nodes under a replaced or removed node are thrown away by redbaron.
+
+        :param node: A node that came out of this index.
+        :type node: redbaron.Node
+        :rtype: bool
+        """
+        return id(node) in self._positions
+
+    def node_count(self):
+        """
+        :return: The number of nodes in the tree.
+        :rtype: int
+        """
+        return len(self._positions)
+
+    def _owner(self, node):
+        """The indexed node for node or for the "value" list of a node."""
+        if isinstance(node, redbaron.Node):
+            return node
+        elif isinstance(node, ProxyList) and \
+                getattr(node.parent, "value", None) is node:
+            return node.parent
+        return None
+
+    def lines(self, node):
+        """
+        lines returns the lines that node covers in the source that the tree
+        was parsed from. Use it instead of node.absolute_bounding_box, which
+        redbaron works out by rendering the whole tree.
+        A node that came from a replace is on the line of what it replaced.
+
+        :param node: A node of the tree, or the "value" of one as given to
+            the find_all value filters.
+        :type node: redbaron.Node|redbaron.base_nodes.ProxyList
+        :return: The first and last line, counted from 1, or None if node is
+            not in the index.
+        :rtype: None|tuple[int,int]
+        """
+        owner = self._owner(node)
+        if owner is None or not self.is_alive(owner):
+            return None
+        return self._lines[id(owner)]
+
+    def dumps(self, node):
+        """
+        dumps is node.dumps() that is kept until the node, or anything under
+        it, is replaced or removed through the index. redbaron renders the
+        whole subtree again on every call.
+
+        :param node: A node of the tree, or the "value" of one as given to
+            the find_all value filters.
+        :type node: redbaron.Node|redbaron.base_nodes.ProxyList
+        :return: The source of node.
+        :rtype: str
+        """
+        owner = self._owner(node)
+        if owner is None or not self.is_alive(owner):
+            return node.dumps()
+        key = (id(owner), None if owner is node else "value")
+        try:
+            return self._dumps[key]
+        except KeyError:
+            text = self._dumps[key] = node.dumps()
+            return text
+
+    def find_all(self, identifier, value=None):
+        """
+        find_all is a stand in for red.find_all with a node type and an
+        optional "value" query.
+
+        :param identifier: The type of the nodes, eg "NameNode".
+        :type identifier: str
+        :param value: A callable that is given the "value" of each node, or
+            something that it has to be equal to.
+        :type value: None|callable|str
+        :return: The matching nodes, in tree order.
+        :rtype: list[redbaron.Node]
+        """
+        key = _type_key(identifier)
+        nodes = [
+            node for node in self._sorted(self._types.get(key, []))
+            # A replace can change the type of a node.
+            if _type_key(node.type) == key
+        ]
+        if value is None:
+            return nodes
+        if callable(value):
+            return [node for node in nodes if value(node.value)]
+        return [node for node in nodes if node.value == value]
+
+    def find_name(self, key):
+        """
+        find_name returns the nodes that may match key. NameNodes are returned
+        for a plain name, AtomTrailersNodes and DottedNameNodes for a dotted
+        one. The keys of a node are only added to as the tree changes, so
+        the caller still has to check each node against its own filter.
+
+        :param key: The name to look for.
+        :type key: str
+        :return: Matching nodes, in tree order.
+        :rtype: list[redbaron.Node]
+        """
+        return self._sorted(
+            (self._dotted if "." in key else self._names).get(key, [])
+        )
+
+    def _parent_changed(self, parent):
+        """Index the new source of the nodes above a change."""
+        while isinstance(parent, redbaron.Node):
+            self._forget_dumps(parent)
+            if parent.type in self.DOTTED_TYPES and self.is_alive(parent):
+                self._add_keys(parent)
+            parent = parent.parent
+
+    def _replace_node(self, node, replacement):
+        """
+        _replace_node does what node.replace does, without the parsing that
+        it can skip.
+        node.replace parses the text, builds nodes from it and then builds
+        node again from the fst of those. A NameNode that is renamed only
+        needs its value set, and everything else is built once from a parse
+        that is kept for the next time the same text comes up.
+
+        :param node: The node to replace.
+        :type node: redbaron.Node
+        :param replacement: Replacement string.
+        :type replacement: str
+        """
+        if node.type == "name" and _IDENTIFIER.match(replacement) and \
+                not keyword.iskeyword(replacement):
+            node.value = replacement
+            return
+        fst = self._parsed.get(replacement)
+        if fst is None:
+            fst = self._parsed[replacement] = baron.parse(replacement)[0]
+        # Nodes only read the fst that they are built from, so it can be
+        #   shared.
+        node.__class__ = getattr(
+            redbaron.nodes, baron_type_to_redbaron_classname(fst["type"])
+        )
+        node.__init__(fst, parent=node.parent, on_attribute=node.on_attribute)
+
+    def replace(self, node, replacement):
+        """
+        replace does a node.replace and updates the index to match.
+
+        :param node: The node to replace.
+        :type node: redbaron.Node
+        :param replacement: Replacement string.
+        :type replacement: str
+        """
+        if not self.is_alive(node):
+            # Not part of the tree anymore, there is nothing to update.
+            self._replace_node(node, replacement)
+            return
+        if replacement == self.dumps(node):
+            return
+        self.replacements += 1
+        position = self._positions[id(node)]
+        line = self._lines[id(node)][0]
+        self._discard(node)
+        self._replace_node(node, replacement)
+        # redbaron keeps the same object, so the node keeps its position.
+        # The lines stay those of the source that was read in, the nodes
+        #   after this one are not moved down.
+        self._add([(node, position)], line)
+        self._parent_changed(node.parent)
+
+    def remove(self, node):
+        """
+        remove does a node.parent.remove(node) and updates the index to match.
+
+        :param node: The node to remove.
+        :type node: redbaron.Node
+        """
+        parent = node.parent
+        self.replacements += 1
+        self._discard(node)
+        parent.remove(node)
+        self._parent_changed(parent)
@@ -0,0 +1,164 @@
+# Copyright 2018 Digital Domain 3.0
+#
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#
+# 6. Trademarks. This License does not grant permission to use the trade
+#    names, trademarks, service marks, or product names of the Licensor
+#    and its affiliates, except as required to comply with Section 4(c) of
+#    the License and to reproduce the content of the NOTICE file.
+#
+# You may obtain a copy of the Apache License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+"""
+profiling records how long each stage of a conversion takes, with the size
+of the tree and the number of replacements, and builds reports from them.
+"""
+import contextlib
+import json
+import timeit
+
+
+class ConversionProfile(object):
+    """
+    ConversionProfile is the list of stages that one conversion went
+    through. run fills it in when it is passed one.
+    """
+    def __init__(self):
+        super(ConversionProfile, self).__init__()
+        # One dict per stage in the order they finished, see record.
+        self.stages = []
+        # The names of the stages that are running, outermost first.
+        self.running = []
+
+    def record(self, name, seconds, nodes, replacements, parent=None):
+        """
+        record adds a stage.
+
+        :param name: The name of the stage.
+        :type name: str
+        :param parent: The name of the stage that this one is part of.
+        :type parent: None|str
+        :param seconds: The wall time of the stage.
+        :type seconds: float
+        :param nodes: The number of nodes in the tree after the stage, None
+            if there was no tree yet.
+        :type nodes: None|int
+        :param replacements: The number of replacements made in the stage.
+        :type replacements: int
+        """
+        self.stages.append({
+            "name": name,
+            "seconds": seconds,
+            "nodes": nodes,
+            "replacements": replacements,
+            "parent": parent,
+        })
+
+
+@contextlib.contextmanager
+def stage(context, name):
+    """
+    stage records the code under it as a stage in the ConversionProfile of
+    context. It does nothing if the conversion is not being profiled.
+
+    :param context: The conversion that is being run.
+    :type context: qt_py_convert.general.ConversionContext
+    :param name: The name of the stage.
+    :type name: str
+    """
+    profile = getattr(context, "profile", None)
+    if profile is None:
+        yield
+        return
+    index = context.index
+    replacements = index.replacements if index is not None else 0
+    parent = profile.running[-1] if profile.running else None
+    profile.running.append(name)
+    start = timeit.default_timer()
+    try:
+        yield
+    finally:
+        seconds = timeit.default_timer() - start
+        profile.running.pop()
+        if context.index is not index:
+            # The index was built in this stage.
+            index, replacements = context.index, 0
+        profile.record(
+            name,
+            seconds,
+            index.node_count() if index is not None else None,
+            index.replacements - replacements if index is not None else 0,
+            parent=parent
+        )
+
+
+def build_report(results):
+    """
+    build_report puts the profiles of processed files together, with the
+    totals of every stage over all of them.
+
+    :param results: The results of process_file or process_folder.
+    :type results: list[None|qt_py_convert.run.FileResult]
+    :return: The report, ready to be dumped to json.
+    :rtype: dict
+    """
+    files = []
+    totals = {}
+    order = []
+    for result in results:
+        if result is None or result.profile is None:
+            continue
+        files.append({
+            "path": result.path,
+            "seconds": sum(
+                entry["seconds"] for entry in result.profile
+                if entry["parent"] is None
+            ),
+            "stages": result.profile,
+            "peak_rss": result.peak_rss,
+        })
+        for entry in result.profile:
+            if entry["name"] not in totals:
+                order.append(entry["name"])
+                totals[entry["name"]] = {
+                    "name": entry["name"],
+                    "parent": entry["parent"],
+                    "calls": 0,
+                    "seconds": 0.0,
+                    "replacements": 0,
+                }
+            total = totals[entry["name"]]
+            total["calls"] += 1
+            total["seconds"] += entry["seconds"]
+            total["replacements"] += entry["replacements"]
+    return {
+        "files": files,
+        "stages": [totals[name] for name in order],
+        "timed_out": [
+            result.path for result in results
+            if result is not None and result.timed_out
+        ],
+    }
+
+
+def write_report(results, path):
+    """
+    write_report writes the build_report of results to path as json.
+
+    :param results: The results of process_file or process_folder.
+    :type results: list[None|qt_py_convert.run.FileResult]
+    :param path: The json file to write.
+    :type path: str
+    """
+    with open(path, "w") as fh:
+        json.dump(build_report(results), fh, indent=2, sort_keys=True)
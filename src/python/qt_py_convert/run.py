@@ -19,6 +19,8 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
 # KIND, either express or implied. See the Apache License for the specific
 # language governing permissions and limitations under the Apache License.
+import functools
+import multiprocessing
 import os
 import re
 import sys
@@ -32,21 +34,102 @@ from qt_py_convert._modules import from_imports
 from qt_py_convert._modules import imports
 from qt_py_convert._modules import psep0101
 from qt_py_convert._modules import unsupported
+from qt_py_convert import chunks
+from qt_py_convert import token_engine
+from qt_py_convert.cache import ConversionCache
 from qt_py_convert.general import merge_dict, ErrorClass, \
-    ALIAS_DICT, change, UserInputRequiredException, ANSI,  \
-    __suplimentary_bindings__, is_py, build_exc, WriteFlag
+    ConversionContext, change, UserInputRequiredException, ANSI,  \
+    __supported_bindings__, __suplimentary_bindings__, is_py, build_exc, \
+    WriteFlag
 from qt_py_convert.color import color_text
-from qt_py_convert.mappings import convert_mappings, misplaced_members
-from qt_py_convert.log import get_logger
+from qt_py_convert.diff import unified_diff
+from qt_py_convert.mappings import convert_mappings, misplaced_members, \
+    convert_attribute, is_common_member
+from qt_py_convert.node_index import NodeIndex, get_index
+from qt_py_convert.profiling import ConversionProfile, stage
+from qt_py_convert.walk import python_files
+from qt_py_convert import workers
+from qt_py_convert.log import get_logger, LazyMessage, lazy_color_text
 
 COMMON_MODULES = Qt._common_members.keys() + ["QtCompat"]
+# The ways that run can convert a file. See run.
+ENGINE_REDBARON = "redbaron"
+ENGINE_TOKENS = "tokens"
+ENGINES = (ENGINE_REDBARON, ENGINE_TOKENS)
+# Only the token engine, for the files that ran out of time. See _timed_out.
+_ENGINE_TOKENS_ONLY = "tokens-only"
+# What process_files does with a file that runs out of time.
+TIMEOUT_SKIP = "skip"
+TIMEOUT_TOKENS = "tokens"
+TIMEOUT_FALLBACKS = (TIMEOUT_SKIP, TIMEOUT_TOKENS)
 
 
 MAIN_LOG = get_logger("run")
 Qt4_Qt5_LOG = get_logger("qt4->qt5")
 
+# Text that has to be in a file for any of the passes to change it.
+# "Qt" covers the Qt.py modules as well as PyQt4/PyQt5, the rest are the
+#   bindings and the psep0101 and unsupported triggers.
+_PRESCAN_EXPRESSION = re.compile(
+    "|".join(
+        re.escape(word) for word in (
+            list(__supported_bindings__) +
+            list(__suplimentary_bindings__) +
+            ["Qt", "QString", "QChar", "QVariant", "SIGNAL", "loadUiType"]
+        )
+    )
+)
+_PRESCAN_TOMETH_EXPRESSION = re.compile(r"to[A-Z][A-Za-z]+\(\)")
+
+
+def _requires_conversion(text, tometh_flag=False):
+    """
+    _requires_conversion is a cheap textual check for whether any of the
+    conversion passes could change the text. Parsing with redbaron is the
+    most expensive step of a conversion, so files that can't change skip it.
+
+    :param text: Text from a python file that you want to process.
+    :type text: str
+    :param tometh_flag: Global "tometh_flag" flag.
+    :type tometh_flag: bool
+    :return: False if the text will come out of run unchanged.
+    :rtype: bool
+    """
+    if _PRESCAN_EXPRESSION.search(text):
+        return True
+    if tometh_flag and _PRESCAN_TOMETH_EXPRESSION.search(text):
+        return True
+    return False
+
+
+def _cleanup_targets(index):
+    """
+    _cleanup_targets finds the imports that _cleanup_imports replaces or
+    removes, "from Qt import ..." and the sip and shiboken imports, once
+    from_imports and imports have changed the binding imports to those.
+
+    :param index: The NodeIndex of the redbaron ast.
+    :type index: qt_py_convert.node_index.NodeIndex
+    :return: The import nodes in the order they are gone through. An import
+        is in it once for every name of it that matches.
+    :rtype: list[redbaron.Node...]
+    """
+    targets = []
+    imps = index.find_all("FromImportNode")
+    imps += index.find_all("ImportNode")
+    for child in imps:
+        for value in child.value:
+            value_str = value.value
+            try:
+                value_str = value_str.dumps()
+            except AttributeError:
+                pass
+            if value.value == "Qt" or value_str in __suplimentary_bindings__:
+                targets.append(child)
+    return targets
+
 
-def _cleanup_imports(red, aliases, mappings, skip_lineno=False):
+def _cleanup_imports(red, aliases, mappings, skip_lineno=False, context=None):
     """
     _cleanup_imports fixes the imports.
     Initially changing them as per the following:
@@ -72,100 +155,100 @@ def _cleanup_imports(red, aliases, mappings, skip_lineno=False):
         show the line numbers. This can give great performance increases
         because redbaron has trouble calculating the line number sometimes.
     :type skip_lineno: bool
+    :param context: The conversion that we are recording into.
+    :type context: None|qt_py_convert.general.ConversionContext
     """
     replaced = False
     deletion_index = []
-    imps = red.find_all("FromImportNode")
-    imps += red.find_all("ImportNode")
+    index = get_index(red, context)
+    targets = _cleanup_targets(index)
 
-    MAIN_LOG.debug(color_text(
+    MAIN_LOG.debug(lazy_color_text(
         text="===========================",
         color=ANSI.colors.blue
     ))
-    MAIN_LOG.debug(color_text(
+    MAIN_LOG.debug(lazy_color_text(
         text="Consolidating Import lines.",
         color=ANSI.colors.blue,
         style=ANSI.styles.underline,
     ))
 
-    for child in imps:
-        for value in child.value:
-            value_str = value.value
-            try:
-                value_str = value_str.dumps()
-            except AttributeError:
-                pass
-            if value.value == "Qt" or value_str in __suplimentary_bindings__:
-                if not replaced:
-                    names = filter(
-                        lambda a: True if a in COMMON_MODULES else False,
-                        aliases["used"],
-                    )
-                    if not names:  # Attempt to build names from input aliases.
-                        members = filter(
-                            lambda a: True if a in mappings else False,
-                            aliases["root_aliases"],
-                        )
-                        names = []
-                        for member in members:
-                            names.append(mappings[member].split(".")[0])
-
-                    if not names:
-                        MAIN_LOG.warning(color_text(
-                            text="We have found no usages of Qt in "
-                                 "this script despite you previously"
-                                 " having imported the binding.\nIf "
-                                 "you think this is in error, "
-                                 "please let us know and submit an "
-                                 "issue ticket with the example you "
-                                 "think is wrong.",
-                            color=ANSI.colors.green
-                        ))
-                        child.parent.remove(child)
-                        continue
-                    # What we want to replace to.
-                    replace_text = "from Qt import {key}".format(
-                        key=", ".join(names)
-                    )
+    for child in targets:
+        if not replaced:
+            names = filter(
+                lambda a: True if a in COMMON_MODULES else False,
+                aliases["used"],
+            )
+            if not names:  # Attempt to build names from input aliases.
+                members = filter(
+                    lambda a: True if a in mappings else False,
+                    aliases["root_aliases"],
+                )
+                names = []
+                for member in members:
+                    names.append(mappings[member].split(".")[0])
+
+            if not names:
+                MAIN_LOG.warning(color_text(
+                    text="We have found no usages of Qt in "
+                         "this script despite you previously"
+                         " having imported the binding.\nIf "
+                         "you think this is in error, "
+                         "please let us know and submit an "
+                         "issue ticket with the example you "
+                         "think is wrong.",
+                    color=ANSI.colors.green
+                ))
+                index.remove(child)
+                continue
+            # What we want to replace to.
+            replace_text = "from Qt import {key}".format(
+                key=", ".join(sorted(names))
+            )
 
-                    cleaning_message = color_text(
-                        text="Cleaning", color=ANSI.colors.green
-                    )
-                    cleaning_message += (
-                        " imports from: \"{original}\" to \"{replacement}\""
-                    )
-                    change(
-                        msg=cleaning_message,
-                        logger=MAIN_LOG,
-                        node=child,
-                        replacement=replace_text,
-                        skip_lineno=skip_lineno
-                    )
+            cleaning_message = LazyMessage(
+                lambda: color_text(
+                    text="Cleaning", color=ANSI.colors.green
+                ) + " imports from: \"{original}\" to "
+                    "\"{replacement}\""
+            )
+            change(
+                msg=cleaning_message,
+                logger=MAIN_LOG,
+                node=child,
+                replacement=replace_text,
+                skip_lineno=skip_lineno,
+                context=context
+            )
 
-                    child.replace(replace_text)
-                    replaced = True
-                else:
-                    deleting_message = "{name} \"{orig}\"".format(
-                        orig=str(child).strip("\n"),
-                        name=color_text(text="Deleting", color=ANSI.colors.red)
-                    )
-                    change(
-                        msg=deleting_message,
-                        logger=MAIN_LOG,
-                        node=child,
-                        replacement="",
-                        skip_lineno=skip_lineno
+            index.replace(child, replace_text)
+            replaced = True
+        else:
+            deleting_message = LazyMessage(
+                lambda node: "{name} \"{orig}\"".format(
+                    orig=str(node).strip("\n"),
+                    name=color_text(
+                        text="Deleting", color=ANSI.colors.red
                     )
-                    child.parent.remove(child)
-            else:
-                pass
+                ),
+                child
+            )
+            change(
+                msg=deleting_message,
+                logger=MAIN_LOG,
+                node=child,
+                replacement="",
+                skip_lineno=skip_lineno,
+                context=context
+            )
+            index.remove(child)
     for child in reversed(deletion_index):
         MAIN_LOG.debug("Deleting {node}".format(node=child))
-        child.parent.remove(child)
+        index.remove(child)
         # red.remove(child)
 
 
-def _convert_attributes(red, aliases, skip_lineno=False):
+def _convert_attributes(red, aliases, skip_lineno=False, context=None):
     """
     _convert_attributes converts all AtomTrailersNodes and DottenNameNodes to 
       the Qt5/PySide2 api matching Qt.py..
@@ -186,111 +269,69 @@ def _convert_attributes(red, aliases, skip_lineno=False):
         show the line numbers. This can give great performance increases
         because redbaron has trouble calculating the line number sometimes.
     :type skip_lineno: bool
+    :param context: The conversion that we are recording into.
+    :type context: None|qt_py_convert.general.ConversionContext
     """
-    # Compile our expressions
-    # Our expressions are basically as follows:
-    # From:
-    #   <Any Qt SLM>.<any_member of A>
-    # To:
-    #   <A>.<\back reference to the member matched>
-    # Where A is the specific Qt SecondLevelModule that we are building this 
-    #   expression for.
-    # 
-    # Also sorry this is longer than 79 chars..
-    # It gets harder to read the more I try to make it more readable.
-    expressions = [
-        (
-            re.compile(
-                r"^(?P<module>{modules})\.(?P<widget>(?:{widgets})(?:[.\[(].*)?)$".format(             # Regular expression
-                    modules="|".join(re.escape(name) for name in Qt._common_members.keys()),
-                    widgets="|".join(re.escape(widget) for widget in Qt._common_members[module_name])
-                ),
-                re.MULTILINE
-            ),
-            module_name
-        )
-        for module_name in Qt._common_members
-    ]
-
-    def finder_function_factory(exprs):
-        """Basic function factory. Used as a find_all delegate for red."""
-        def finder_function(value):
-            """The filter for our red.find_all function."""
-            return any([
-                expression.match(value.dumps()) for expression, mod in exprs
-            ])
-        return finder_function
+    index = get_index(red, context)
+
+    def finder_function(value):
+        """The filter for our red.find_all function."""
+        return is_common_member(index.dumps(value).split("\n", 1)[0])
 
     mappings = {}
-    # Find any AtomTrailersNode that matches any of our expressions.
-    nodes = red.find_all(
-        "AtomTrailersNode",
-        value=finder_function_factory(expressions)
-    )
-    nodes += red.find_all(
-        "DottedNameNode",
-        value=finder_function_factory(expressions)
-    )
+    # Find any AtomTrailersNode that starts with a member of a Qt module.
+    nodes = index.find_all("AtomTrailersNode", value=finder_function)
+    nodes += index.find_all("DottedNameNode", value=finder_function)
     header_written = False
     for node in nodes:
-        orig_node_str = node.dumps()
-        added_module = False
-        for expr, module_ in expressions:
-            modified = expr.sub(
-                r"{module}.\2".format(module=module_),
-                orig_node_str,
+        orig_node_str = index.dumps(node)
+        module_, modified = convert_attribute(orig_node_str)
+        if module_ is not None:
+            mappings[orig_node_str] = modified
+            aliases["used"].add(module_)
+            if not header_written:
+                MAIN_LOG.debug(lazy_color_text(
+                    text="=========================",
+                    color=ANSI.colors.orange,
+                ))
+                MAIN_LOG.debug(lazy_color_text(
+                    text="Parsing AtomTrailersNodes",
+                    color=ANSI.colors.orange,
+                    style=ANSI.styles.underline
+                ))
+                header_written = True
+
+            repl = str(node).replace(
+                str(node.value[0]).strip("\n"), 
+                module_
             )
 
-            if modified != orig_node_str:
-                mappings[orig_node_str] = modified
-                aliases["used"].add(module_)
-                added_module = True
-                if not header_written:
-                    MAIN_LOG.debug(color_text(
-                        text="=========================",
-                        color=ANSI.colors.orange,
-                    ))
-                    MAIN_LOG.debug(color_text(
-                        text="Parsing AtomTrailersNodes",
-                        color=ANSI.colors.orange,
-                        style=ANSI.styles.underline
-                    ))
-                    header_written = True
-
-                repl = str(node).replace(
-                    str(node.value[0]).strip("\n"), 
-                    module_
-                )
-
-                change(
-                    logger=Qt4_Qt5_LOG,
-                    node=node,
-                    replacement=repl,
-                    skip_lineno=skip_lineno
-                )
-                # Only replace the first node part of the statement.
-                # This allows us to keep any child nodes that have already
-                # been gathered attached to the main node tree.
-
-                # This was the cause of a bug in our internal code.
-                # http://dd-git.d2.com/ahughes/qt_py_convert/issues/19
-
-                # A node that had child nodes that needed replacements on the
-                # same line would cause an issue if we replaced the entire
-                # line the first replacement. The other replacements on that
-                # line would not stick because they would be replacing to an
-                # orphaned tree.
-                node.value[0].replace(module_)
-                break
-            # else:
-            #     if orig_node_str.split(".")[0] in COMMON_MODULES:
-            #         aliases["used"].add(orig_node_str.split(".")[0])
-        if not added_module:
+            change(
+                logger=Qt4_Qt5_LOG,
+                node=node,
+                replacement=repl,
+                skip_lineno=skip_lineno,
+                context=context
+            )
+            # Only replace the first node part of the statement.
+            # This allows us to keep any child nodes that have already
+            # been gathered attached to the main node tree.
+
+            # This was the cause of a bug in our internal code.
+            # http://dd-git.d2.com/ahughes/qt_py_convert/issues/19
+
+            # A node that had child nodes that needed replacements on the
+            # same line would cause an issue if we replaced the entire
+            # line the first replacement. The other replacements on that
+            # line would not stick because they would be replacing to an
+            # orphaned tree.
+            index.replace(node.value[0], module_)
+        else:
             aliases["used"].add(orig_node_str.split(".")[0])
     return mappings
 
 
-def _convert_root_name_imports(red, aliases, skip_lineno=False):
+def _convert_root_name_imports(red, aliases, skip_lineno=False, context=None):
     """
     _convert_root_name_imports is a function that should be used in cases
     where the original code just imported the python binding and did not
@@ -313,20 +354,24 @@ def _convert_root_name_imports(red, aliases, skip_lineno=False):
         show the line numbers. This can give great performance increases
         because redbaron has trouble calculating the line number sometimes.
     :type skip_lineno: bool
+    :param context: The conversion that we are recording into.
+    :type context: None|qt_py_convert.general.ConversionContext
     """
+    index = get_index(red, context)
+
     def filter_function(value):
         """A filter delegate for our red.find_all function."""
-        return value.dumps().startswith("Qt.")
-    matches = red.find_all("AtomTrailersNode", value=filter_function)
-    matches += red.find_all("DottedNameNode", value=filter_function)
+        return index.dumps(value).startswith("Qt.")
+    matches = index.find_all("AtomTrailersNode", value=filter_function)
+    matches += index.find_all("DottedNameNode", value=filter_function)
     lstrip_qt_regex = re.compile(r"^Qt\.",)
 
     if matches:
-        MAIN_LOG.debug(color_text(
+        MAIN_LOG.debug(lazy_color_text(
             text="====================================",
             color=ANSI.colors.purple,
         ))
-        MAIN_LOG.debug(color_text(
+        MAIN_LOG.debug(lazy_color_text(
             text="Replacing top level binding imports.",
             color=ANSI.colors.purple,
             style=ANSI.styles.underline,
@@ -334,7 +379,7 @@ def _convert_root_name_imports(red, aliases, skip_lineno=False):
 
     for node in matches:
         name = lstrip_qt_regex.sub(
-            "", node.dumps(), count=1
+            "", index.dumps(node), count=1
         )
 
         root_name = name.split(".")[0]
@@ -346,9 +391,10 @@ def _convert_root_name_imports(red, aliases, skip_lineno=False):
                 logger=MAIN_LOG,
                 node=node,
                 replacement=name,
-                skip_lineno=skip_lineno
+                skip_lineno=skip_lineno,
+                context=context
             )
-            node.replace(name)
+            index.replace(node, name)
         else:
             MAIN_LOG.warning(
                 "Unknown second level module from the Qt package \"{}\""
@@ -358,7 +404,7 @@ def _convert_root_name_imports(red, aliases, skip_lineno=False):
             )
 
 
-def _convert_body(red, aliases, mappings, skip_lineno=False):
+def _convert_body(red, aliases, mappings, skip_lineno=False, context=None):
     """
     _convert_body is  one of the first conversion functions to run on the
     redbaron ast.
@@ -382,7 +428,11 @@ def _convert_body(red, aliases, mappings, skip_lineno=False):
         show the line numbers. This can give great performance increases
         because redbaron has trouble calculating the line number sometimes.
     :type skip_lineno: bool
+    :param context: The conversion that we are recording into.
+    :type context: None|qt_py_convert.general.ConversionContext
     """
+    index = get_index(red, context)
+
     def expression_factory(expr_key):
         """
         expression_factory is a function factory for building a regex.match
@@ -398,29 +448,38 @@ def _convert_body(red, aliases, mappings, skip_lineno=False):
             Basic filter function matching for red.find_all against a regex
             previously created from the factory
             ."""
-            return regex.match(value.dumps())
+            return regex.match(index.dumps(value))
 
         return expression_filter
 
     # Body of the function
     for key in sorted(mappings, key=len):
-        MAIN_LOG.debug(color_text(
+        MAIN_LOG.debug(lazy_color_text(
             text="-"*len(key),
             color=ANSI.colors.teal,
         ))
-        MAIN_LOG.debug(color_text(
+        MAIN_LOG.debug(lazy_color_text(
             text=key,
             color=ANSI.colors.teal,
             style=ANSI.styles.underline,
         ))
         if "." in key:
             filter_function = expression_factory(key)
-            matches = red.find_all("AtomTrailersNode", value=filter_function)
-            matches += red.find_all("DottedNameNode", value=filter_function)
+            matches = [
+                node for node in index.find_name(key)
+                if node.type in NodeIndex.DOTTED_TYPES
+                and filter_function(node)
+            ]
         else:
-            matches = red.find_all("NameNode", value=key)
+            matches = [
+                node for node in index.find_name(key)
+                if node.type == "name" and node.value == key
+            ]
         if matches:
             for node in matches:
+                # An earlier match in this key may have replaced it already.
+                if not index.is_alive(node):
+                    continue
                 # Dont replace imports, we already did that.
                 parent_is_import = node.parent_find("ImportNode")
                 parent_is_fimport = node.parent_find("FromImportNode")
@@ -435,24 +494,205 @@ def _convert_body(red, aliases, mappings, skip_lineno=False):
                             continue
 
                     if key != mappings[key]:
-                        replacement = node.dumps().replace(key, mappings[key])
+                        replacement = index.dumps(node).replace(
+                            key, mappings[key]
+                        )
                         change(
                             logger=MAIN_LOG,
                             node=node,
                             replacement=replacement,
-                            skip_lineno=skip_lineno
+                            skip_lineno=skip_lineno,
+                            context=context
                         )
                         if mappings[key].split(".")[0] in COMMON_MODULES:
                             aliases["used"].add(mappings[key].split(".")[0])
 
-                        node.replace(replacement)
+                        index.replace(node, replacement)
                     else:
-                        if node.dumps().split(".")[0] in COMMON_MODULES:
-                            aliases["used"].add(node.dumps().split(".")[0])
+                        root_name = index.dumps(node).split(".")[0]
+                        if root_name in COMMON_MODULES:
+                            aliases["used"].add(root_name)
                     # match.replace(mappings[key])
 
 
-def run(text, skip_lineno=False, tometh_flag=False, explicit_signals_flag=False):
+def _relayout(red):
+    """
+    _relayout lays out the top-level statements of red again, the way
+    redbaron does once it has removed one of them. It puts statements that
+    are joined with ";" on lines of their own, empties lines of whitespace
+    and dedents some of the clauses in blocks, so a chunk has to go through
+    it whenever _cleanup_imports removes an import from the whole module.
+
+    :param red: The redbaron ast.
+    :type red: redbaron.RedBaron
+    """
+    red.extend([])
+
+
+class _ChunkParseError(Exception):
+    """_ChunkParseError is raised when a chunk could not be parsed."""
+
+
+def _run_chunked(text, split, skip_lineno=False, tometh_flag=False, explicit_signals_flag=False, context=None):
+    """
+    _run_chunked converts a module that qt_py_convert.chunks.split cut up,
+    one chunk at a time. Only the head, which has the binding imports, is
+    kept parsed the whole time. It is read first for the aliases and the
+    mappings, and cleaned up last once every chunk has added the modules
+    that it uses. If that removes imports from its top level, the other
+    chunks are laid out again with _relayout, as redbaron would lay out the
+    whole module.
+
+    :param text: Text from a python file that you want to process.
+    :type text: str
+    :param split: The chunks and the position of the head.
+    :type split: tuple[list[tuple[int,str]...],None|int]
+    :param context: The conversion that we are recording into.
+    :type context: qt_py_convert.general.ConversionContext
+    :return: The same tuple as run.
+    :rtype: tuple[dict,dict,str]
+    """
+    parts, head = split
+
+    def _parse(position):
+        with stage(context, "parse"):
+            try:
+                red = redbaron.RedBaron(parts[position][1])
+            except Exception as err:
+                MAIN_LOG.critical(str(err))
+                traceback.print_exc()
+                raise _ChunkParseError(traceback.format_exc())
+            return red, get_index(red, context)
+
+    def _shift(known, position):
+        # The errors were counted from the first line of the chunk.
+        offset = parts[position][0] - 1
+        for error in context["errors"] - known:
+            error.row += offset
+            error.row_to += offset
+
+    from_a, from_m, import_a, import_m = context, {}, context, {}
+    outputs = [None] * len(parts)
+    try:
+        if head is not None:
+            known = set(context["errors"])
+            head_red, head_index = _parse(head)
+            with stage(context, "from_imports"):
+                from_a, from_m = from_imports.process(
+                    head_red, skip_lineno=skip_lineno, context=context
+                )
+            with stage(context, "imports"):
+                import_a, import_m = imports.process(
+                    head_red, skip_lineno=skip_lineno, context=context
+                )
+            _shift(known, head)
+        mappings = merge_dict(from_m, import_m, keys_both=True)
+        aliases = merge_dict(
+            from_a, import_a, keys=["bindings", "root_aliases"]
+        )
+
+        with stage(context, "misplaced_members"):
+            aliases, mappings = misplaced_members(aliases, mappings)
+        aliases["used"] = set()
+
+        with stage(context, "convert_mappings"):
+            mappings = convert_mappings(aliases, mappings)
+
+        # Every chunk is written out before the head is cleaned up, so
+        #   whether it removes an import from the top level, and the whole
+        #   module is laid out again, has to be known now. Checked once it
+        #   has been cleaned up.
+        relayout = head is not None and bool(aliases["root_aliases"]) and any(
+            target.parent is head_red
+            for target in _cleanup_targets(head_index)[1:]
+        )
+
+        for position in range(len(parts)):
+            known = set(context["errors"])
+            if position == head:
+                red = head_red
+                context.index = head_index
+            else:
+                red, _ = _parse(position)
+            with stage(context, "psep0101"):
+                psep0101.process(
+                    red,
+                    skip_lineno=skip_lineno,
+                    tometh_flag=tometh_flag,
+                    explicit_signals_flag=explicit_signals_flag,
+                    context=context
+                )
+            with stage(context, "_convert_body"):
+                _convert_body(
+                    red, aliases, mappings, skip_lineno=skip_lineno,
+                    context=context
+                )
+            with stage(context, "_convert_root_name_imports"):
+                _convert_root_name_imports(
+                    red, aliases, skip_lineno=skip_lineno, context=context
+                )
+            with stage(context, "_convert_attributes"):
+                _convert_attributes(
+                    red, aliases, skip_lineno=skip_lineno, context=context
+                )
+            if position != head:
+                with stage(context, "unsupported"):
+                    unsupported.process(
+                        red, skip_lineno=skip_lineno, context=context
+                    )
+            if position != head:
+                if relayout:
+                    with stage(context, "relayout"):
+                        _relayout(red)
+                with stage(context, "dumps"):
+                    outputs[position] = red.dumps()
+            _shift(known, position)
+            # Let go of the chunk.
+            red = context.index = None
+    except _ChunkParseError as err:
+        # The same as a module that could not be parsed as a whole.
+        context["errors"].clear()
+        ErrorClass(row_from=0, row_to=0, reason=str(err), context=context)
+        context.index = None
+        return context, {}, text
+
+    if head is not None:
+        known = set(context["errors"])
+        context.index = head_index
+        statement_count = len(head_red.node_list)
+        if aliases["root_aliases"]:
+            with stage(context, "_cleanup_imports"):
+                _cleanup_imports(
+                    head_red, aliases, mappings, skip_lineno=skip_lineno,
+                    context=context
+                )
+        if (len(head_red.node_list) != statement_count) != relayout:
+            MAIN_LOG.debug(
+                "The imports were not cleaned up as expected, converting the "
+                "module as a whole."
+            )
+            context.clean()
+            context.index = None
+            return run(
+                text,
+                skip_lineno=skip_lineno,
+                tometh_flag=tometh_flag,
+                explicit_signals_flag=explicit_signals_flag,
+                context=context,
+                profile=context.profile
+            )
+        with stage(context, "unsupported"):
+            unsupported.process(
+                head_red, skip_lineno=skip_lineno, context=context
+            )
+        with stage(context, "dumps"):
+            outputs[head] = head_red.dumps()
+        _shift(known, head)
+    context.index = None
+    return aliases, mappings, "".join(outputs)
+
+
+def run(text, skip_lineno=False, tometh_flag=False, explicit_signals_flag=False, context=None, profile=None, engine=ENGINE_REDBARON, chunk_lines=None):
     """
     run is the main driver of the file. It takes the text of a file and any
     flags that you want to set.
@@ -474,64 +714,437 @@ def run(text, skip_lineno=False, tometh_flag=False, explicit_signals_flag=False)
         confirm that you don't have any custom objects with the same method
         signature to PyQt4's apiv1.0 ones.
     :type tometh_flag: bool
+    :param context: The context to record this conversion into. A new one is
+        created when it is not passed. Pass your own to get at the errors
+        afterwards.
+    :type context: None|qt_py_convert.general.ConversionContext
+    :param profile: If passed, the time, tree size and replacements of every
+        stage of the conversion are recorded into it.
+    :type profile: None|qt_py_convert.profiling.ConversionProfile
+    :param engine: ENGINE_TOKENS converts the files that only need their
+        imports and Qt module attributes changed with the much faster
+        qt_py_convert.token_engine. Everything else, and everything with
+        ENGINE_REDBARON, is converted with redbaron.
+    :type engine: str
+    :param chunk_lines: If passed, a module that is longer than this many
+        lines is cut into chunks of top-level statements of about this many
+        lines, which are parsed and converted one at a time. Parsing takes
+        much more time and memory than the size of a module, so this keeps
+        very large modules down to the size of their largest statement.
+        See qt_py_convert.chunks.split.
+    :type chunk_lines: None|int
     :return: run will return a tuple of runtime information. aliases,
         mappings, and the resulting text. Aliases is the replacement
         information that it built, mappings is information about the bindings
         that were used.
     :rtype: tuple[dict,dict,str]
     """
-    ALIAS_DICT.clean()
+    if engine not in ENGINES and engine != _ENGINE_TOKENS_ONLY:
+        raise ValueError("Unknown engine \"{engine}\"".format(engine=engine))
+    if context is None:
+        context = ConversionContext()
+    context.profile = profile
+    if not _requires_conversion(text, tometh_flag=tometh_flag):
+        MAIN_LOG.debug("No Qt references found, skipping the conversion.")
+        aliases = {
+            ConversionContext.BINDINGS: set(),
+            ConversionContext.ALIASES: set(),
+            ConversionContext.USED: set(),
+        }
+        return aliases, {}, text
+    if engine in (ENGINE_TOKENS, _ENGINE_TOKENS_ONLY):
+        with stage(context, "tokens"):
+            converted = token_engine.convert(text, tometh_flag=tometh_flag)
+        if converted is not None:
+            return converted
+        if engine == _ENGINE_TOKENS_ONLY:
+            ErrorClass(
+                row_from=0, row_to=0,
+                reason="It can't be converted without parsing it.",
+                context=context
+            )
+            return context, {}, text
+    if chunk_lines and text.count("\n") > chunk_lines:
+        with stage(context, "chunks"):
+            split = chunks.split(text, chunk_lines)
+        if split is not None:
+            return _run_chunked(
+                text,
+                split,
+                skip_lineno=skip_lineno,
+                tometh_flag=tometh_flag,
+                explicit_signals_flag=explicit_signals_flag,
+                context=context
+            )
     try:
-        red = redbaron.RedBaron(text)
+        with stage(context, "parse"):
+            red = redbaron.RedBaron(text)
+            get_index(red, context)
     except Exception as err:
         MAIN_LOG.critical(str(err))
         traceback.print_exc()
 
-        ErrorClass(row_from=0, row_to=0, reason=traceback.format_exc())
-        return ALIAS_DICT, {}, text
+        ErrorClass(
+            row_from=0, row_to=0, reason=traceback.format_exc(),
+            context=context
+        )
+        return context, {}, text
 
-    from_a, from_m = from_imports.process(red, skip_lineno=skip_lineno)
-    import_a, import_m = imports.process(red, skip_lineno=skip_lineno)
+    with stage(context, "from_imports"):
+        from_a, from_m = from_imports.process(
+            red, skip_lineno=skip_lineno, context=context
+        )
+    with stage(context, "imports"):
+        import_a, import_m = imports.process(
+            red, skip_lineno=skip_lineno, context=context
+        )
     mappings = merge_dict(from_m, import_m, keys_both=True)
     aliases = merge_dict(from_a, import_a, keys=["bindings", "root_aliases"])
 
-    aliases, mappings = misplaced_members(aliases, mappings)
+    with stage(context, "misplaced_members"):
+        aliases, mappings = misplaced_members(aliases, mappings)
     aliases["used"] = set()
 
-    mappings = convert_mappings(aliases, mappings)
+    with stage(context, "convert_mappings"):
+        mappings = convert_mappings(aliases, mappings)
 
     # Convert using the psep0101 module.
-    psep0101.process(
-        red,
-        skip_lineno=skip_lineno,
-        tometh_flag=tometh_flag,
-        explicit_signals_flag=explicit_signals_flag
-    )
-    _convert_body(red, aliases, mappings, skip_lineno=skip_lineno)
-    _convert_root_name_imports(red, aliases, skip_lineno=skip_lineno)
-    _convert_attributes(red, aliases, skip_lineno=skip_lineno)
+    with stage(context, "psep0101"):
+        psep0101.process(
+            red,
+            skip_lineno=skip_lineno,
+            tometh_flag=tometh_flag,
+            explicit_signals_flag=explicit_signals_flag,
+            context=context
+        )
+    with stage(context, "_convert_body"):
+        _convert_body(
+            red, aliases, mappings, skip_lineno=skip_lineno, context=context
+        )
+    with stage(context, "_convert_root_name_imports"):
+        _convert_root_name_imports(
+            red, aliases, skip_lineno=skip_lineno, context=context
+        )
+    with stage(context, "_convert_attributes"):
+        _convert_attributes(
+            red, aliases, skip_lineno=skip_lineno, context=context
+        )
     if aliases["root_aliases"]:
-        _cleanup_imports(red, aliases, mappings, skip_lineno=skip_lineno)
+        with stage(context, "_cleanup_imports"):
+            _cleanup_imports(
+                red, aliases, mappings, skip_lineno=skip_lineno,
+                context=context
+            )
 
     # Build errors from our unsupported module.
-    unsupported.process(red, skip_lineno=skip_lineno)
+    with stage(context, "unsupported"):
+        unsupported.process(red, skip_lineno=skip_lineno, context=context)
 
     # Done!
-    dumps = red.dumps()
+    with stage(context, "dumps"):
+        dumps = red.dumps()
+    # Let go of the tree.
+    context.index = None
     return aliases, mappings, dumps
 
 
-def process_file(fp, write_mode=None, path=None, backup=False, skip_lineno=False, tometh_flag=False, explicit_signals_flag=False):
+class FileResult(object):
+    """
+    FileResult is the outcome of processing a single file.
+    It is returned from process_file and is small enough to be sent back from
+    a worker process when process_folder is running in parallel.
+    """
+    def __init__(self, path, aliases=None, mappings=None, errors=None,
+                 output=None, profile=None, changed=False, peak_rss=None,
+                 timed_out=False):
+        """
+        :param path: The source file that was processed.
+        :type path: str
+        :param aliases: Aliases is the replacement information that was built
+            automatically from qt_py_convert.
+        :type aliases: dict
+        :param mappings: Mappings is information about the bindings that
+            were used.
+        :type mappings: dict
+        :param errors: Error messages that the user has to fix by hand.
+        :type errors: list[str...]
+        :param output: Text that still has to be written to stdout.
+        :type output: None|str
+        :param profile: The stages of the conversion, if it was profiled.
+            See qt_py_convert.profiling.ConversionProfile.stages.
+        :type profile: None|list[dict...]
+        :param changed: Did the conversion change the file?
+        :type changed: bool
+        :param peak_rss: The peak memory of the process that converted the
+            file, in bytes, once it was done with it.
+        :type peak_rss: None|int
+        :param timed_out: Did the file run out of time? See process_files.
+        :type timed_out: bool
+        """
+        super(FileResult, self).__init__()
+        self.path = path
+        self.aliases = aliases or {}
+        self.mappings = mappings or {}
+        self.errors = errors or []
+        self.output = output
+        self.profile = profile
+        self.changed = changed
+        self.peak_rss = peak_rss
+        self.timed_out = timed_out
+
+
+def _build_errors(errors, lines):
+    """
+    _build_errors turns the ErrorClass instances that were recovered from a
+    file into messages, sorted by the line they happened on.
+
+    :param errors: ErrorClass instances from the conversion.
+    :type errors: set[qt_py_convert.general.ErrorClass]
+    :param lines: List of lines from the file we are working on.
+    :type lines: list[str...]
+    :return: The error messages.
+    :rtype: list[str...]
+    """
+    messages = []
+    for error in sorted(errors, key=lambda err: (err.row, err.row_to)):
+        try:
+            build_exc(error, lines)
+        except UserInputRequiredException as err:
+            messages.append(str(err))
+    return messages
+
+
+def _report(result):
+    """
+    _report writes out anything that a FileResult still has pending.
+    The stdout output and the errors are kept back until here so that they
+    come out per file, even when the files were processed in parallel.
+
+    :param result: The result of processing a file.
+    :type result: FileResult
+    """
+    if result.output is not None:
+        sys.stdout.write(result.output)
+
+    # Process any errors that may have happened throughout the process.
+    if result.errors:
+        MAIN_LOG.error(color_text(
+            text="The following errors were recovered from {}:\n".format(
+                result.path
+            ),
+            color=ANSI.colors.red,
+        ))
+        for message in result.errors:
+            MAIN_LOG.error(message)
+
+
+def _process_file(fp, write_mode=None, path=None, backup=False, skip_lineno=False, tometh_flag=False, explicit_signals_flag=False, cache_dir=None, profile=False, engine=ENGINE_REDBARON, chunk_lines=None):
+    """
+    _process_file does the work for process_file without reporting anything.
+    See process_file for the arguments.
+
+    :return: The result of the processing or None if it was not a python file.
+    :rtype: None|FileResult
+    """
+    if not is_py(fp):
+        MAIN_LOG.debug(
+            "\tSkipping \"{fp}\"... It does not appear to be a python file."
+            .format(fp=fp)
+        )
+        return
+    with open(fp, "rb") as fh:
+        lines = fh.readlines()
+        source = "".join(lines)
+
+    result = FileResult(fp)
+    context = ConversionContext()
+    conversion_profile = ConversionProfile() if profile else None
+    MAIN_LOG.info("{line}\nProcessing {path}".format(path=fp, line="-"*50))
+    try:
+        cached = None
+        if cache_dir:
+            cache = ConversionCache(cache_dir)
+            cache_key = cache.key(
+                source,
+                skip_lineno=skip_lineno,
+                tometh_flag=tometh_flag,
+                explicit_signals_flag=explicit_signals_flag,
+                engine=engine,
+                chunk_lines=chunk_lines
+            )
+            cached = cache.get(cache_key, context)
+
+        if cached is not None:
+            MAIN_LOG.debug("Using the cached conversion of {path}".format(
+                path=fp
+            ))
+            aliases, mappings, modified_code = cached
+        else:
+            aliases, mappings, modified_code = run(
+                source,
+                skip_lineno=skip_lineno,
+                tometh_flag=tometh_flag,
+                explicit_signals_flag=explicit_signals_flag,
+                context=context,
+                profile=conversion_profile,
+                engine=engine,
+                chunk_lines=chunk_lines
+            )
+            if cache_dir:
+                cache.set(cache_key, aliases, mappings, modified_code, context)
+        result.aliases = aliases
+        result.mappings = mappings
+        result.changed = modified_code != source
+        if write_mode & (WriteFlag.WRITE_DIFF | WriteFlag.WRITE_NOTHING):
+            if write_mode & WriteFlag.WRITE_DIFF and result.changed:
+                result.output = unified_diff(fp, source, modified_code)
+        elif aliases["used"] or result.changed:
+            write_path = fp
+            if write_mode & WriteFlag.WRITE_TO_STDOUT:
+                result.output = modified_code
+            else:
+                if path:  # We are writing elsewhere than the source.
+                    src_root, dst_root = path
+                    root_relative = os.path.relpath(
+                        os.path.abspath(fp), os.path.abspath(src_root)
+                    )
+                    write_path = os.path.join(dst_root, root_relative)
+
+                # Not stopped for running out of time half way through.
+                with workers.protected():
+                    if backup:  # We are creating a source backup beside the output
+                        bak_path = os.path.join(
+                            os.path.dirname(write_path),
+                            "." + os.path.basename(write_path) + ".bak"
+                        )
+                        MAIN_LOG.info("Backing up original code to {path}".format(
+                            path=bak_path
+                        ))
+                        with open(bak_path, "wb") as fh:
+                            fh.write(source)
+
+                    # Write to file. If path is None, we are overwriting.
+                    MAIN_LOG.info("Writing modifed code to {path}".format(
+                        path=write_path)
+                    )
+
+                    if not os.path.exists(os.path.dirname(write_path)):
+                        os.makedirs(os.path.dirname(write_path))
+                    with open(write_path, "wb") as fh:
+                        fh.write(modified_code)
+
+    except BaseException:
+        MAIN_LOG.critical("Error processing file: \"{path}\"".format(path=fp))
+        traceback.print_exc()
+
+    result.errors = _build_errors(context["errors"], lines)
+    if conversion_profile is not None:
+        result.profile = conversion_profile.stages
+    result.peak_rss = workers.peak_rss()
+    return result
+
+
+def _collect(iterator):
+    """
+    _collect reports the results of the worker processes as they come in.
+
+    :param iterator: The results of _process_file_worker, in order.
+    :type iterator: iterator
+    :return: The results.
+    :rtype: list[FileResult...]
+    """
+    results = []
+    for result in iterator:
+        _report(result)
+        MAIN_LOG.debug(lazy_color_text(text="-" * 50, color=ANSI.colors.black))
+        results.append(result)
+    return results
+
+
+def _timed_out(task, seconds=None, fallback=TIMEOUT_TOKENS):
+    """
+    _timed_out builds the result of a file that ran out of time in
+    process_files. TIMEOUT_TOKENS converts it again with only the token
+    engine, which does not parse it, and TIMEOUT_SKIP leaves it as it is.
+
+    :param task: Tuple of the file path and the process_file kwargs.
+    :type task: tuple[str,dict]
+    :param seconds: The time that it had.
+    :type seconds: float
+    :param fallback: TIMEOUT_TOKENS or TIMEOUT_SKIP.
+    :type fallback: str
+    :return: The result, with the time out as its first error.
+    :rtype: FileResult
+    """
+    fp, kwargs = task
+    message = "{path} ran out of its {seconds} seconds.".format(
+        path=fp, seconds=seconds
+    )
+    MAIN_LOG.warning(message)
+    result = None
+    if fallback == TIMEOUT_TOKENS:
+        result = _process_file(
+            fp, **dict(kwargs, engine=_ENGINE_TOKENS_ONLY, chunk_lines=None)
+        )
+    if result is None:
+        result = FileResult(fp)
+    result.errors.insert(0, message)
+    result.timed_out = True
+    return result
+
+
+def _worker_died(task, code):
+    """
+    _worker_died builds the result of a file that its worker process died
+    on in process_files, killed for running out of memory or crashed in the
+    parser. The file is left as it is.
+
+    :param task: Tuple of the file path and the process_file kwargs.
+    :type task: tuple[str,dict]
+    :param code: The exit code of the worker.
+    :type code: int
+    :return: The result, with the exit as its only error.
+    :rtype: FileResult
+    """
+    fp, _ = task
+    message = "The worker converting {path} died with exit code " \
+        "{code}.".format(path=fp, code=code)
+    MAIN_LOG.error(message)
+    result = FileResult(fp)
+    result.errors.append(message)
+    return result
+
+
+def _process_file_worker(task):
+    """
+    _process_file_worker is the function that process_folder maps over its
+    process pool. It has to live at the module level so that it can be
+    pickled.
+
+    :param task: Tuple of the file path and the process_file kwargs.
+    :type task: tuple[str,dict]
+    :return: The result of the processing or None if it was not a python file.
+    :rtype: None|FileResult
+    """
+    fp, kwargs = task
+    return _process_file(fp, **kwargs)
+
+
+def process_file(fp, write_mode=None, path=None, backup=False, skip_lineno=False, tometh_flag=False, explicit_signals_flag=False, cache_dir=None, profile=False, engine=ENGINE_REDBARON, chunk_lines=None):
     """
     One of the entry-point functions in qt_py_convert.
     If you are looking to process a single python file, this is your function.
 
     :param fp: The source file that you want to start processing.
     :type fp: str
-    :param write_mode: The type of writing that we are doing.
+    :param write_mode: The type of writing that we are doing, see
+        qt_py_convert.general.WriteFlag. WRITE_DIFF writes a unified diff of
+        the changed files to stdout and WRITE_NOTHING only sets the
+        "changed" of the results.
     :type write_mode: int
     :param path: If passed, it will signify that we are not overwriting.
-        It will be a tuple of (src_root, dst_roo)
+        It will be a tuple of (src_root, dst_root), fp is written to the
+        same place under dst_root as it is under src_root.
     :type path: tuple[str,str]
     :param backup: If passed we will create a ".bak" file beside the newly
         created file. The .bak will contain the original source code.
@@ -549,74 +1162,201 @@ def process_file(fp, write_mode=None, path=None, backup=False, skip_lineno=False
         confirm that you don't have any custom objects with the same method
         signature to PyQt4's apiv1.0 ones.
     :type tometh_flag: bool
+    :param cache_dir: If passed, results are cached in this folder and
+        files that have not changed since they were cached are not parsed
+        again.
+    :type cache_dir: None|str
+    :param profile: If True, the stages of the conversion are recorded in
+        the profile of the result. See qt_py_convert.profiling.
+    :type profile: bool
+    :param engine: The engine to convert with. See run.
+    :type engine: str
+    :param chunk_lines: If passed, the modules that are longer than this are
+        converted in chunks of about this many lines. See run.
+    :type chunk_lines: None|int
+    :return: The result of the processing or None if it was not a python file.
+    :rtype: None|FileResult
     """
-    if not is_py(fp):
-        MAIN_LOG.debug(
-            "\tSkipping \"{fp}\"... It does not appear to be a python file."
-            .format(fp=fp)
-        )
-        return
-    with open(fp, "rb") as fh:
-        lines = fh.readlines()
-        source = "".join(lines)
+    result = _process_file(
+        fp,
+        write_mode=write_mode,
+        path=path,
+        backup=backup,
+        skip_lineno=skip_lineno,
+        tometh_flag=tometh_flag,
+        explicit_signals_flag=explicit_signals_flag,
+        cache_dir=cache_dir,
+        profile=profile,
+        engine=engine,
+        chunk_lines=chunk_lines
+    )
+    if result is not None:
+        _report(result)
+    return result
 
-    MAIN_LOG.info("{line}\nProcessing {path}".format(path=fp, line="-"*50))
-    try:
-        aliases, mappings, modified_code = run(
-            source,
-            skip_lineno=skip_lineno,
-            tometh_flag=tometh_flag,
-            explicit_signals_flag=explicit_signals_flag
-        )
-        if aliases["used"] or modified_code != source:
-            write_path = fp
-            if write_mode & WriteFlag.WRITE_TO_STDOUT:
-                sys.stdout.write(modified_code)
-            else:
-                if path:  # We are writing elsewhere than the source.
-                    src_root, dst_root = path
-                    root_relative = fp.replace(src_root, "").lstrip("/")
-                    write_path = os.path.join(dst_root, root_relative)
 
-                if backup:  # We are creating a source backup beside the output
-                    bak_path = os.path.join(
-                        os.path.dirname(write_path),
-                        "." + os.path.basename(write_path) + ".bak"
-                    )
-                    MAIN_LOG.info("Backing up original code to {path}".format(
-                        path=bak_path
-                    ))
-                    with open(bak_path, "wb") as fh:
-                        fh.write(source)
-
-                # Write to file. If path is None, we are overwriting.
-                MAIN_LOG.info("Writing modifed code to {path}".format(
-                    path=write_path)
-                )
+def _folder_files(folder, recursive=False, exclude=None, default_excludes=True, follow_symlinks=False):
+    """
+    _folder_files lists the python files that process_folder will process.
+    See qt_py_convert.walk.python_files.
 
-                if not os.path.exists(os.path.dirname(write_path)):
-                    os.makedirs(os.path.dirname(write_path))
-                with open(write_path, "wb") as fh:
-                    fh.write(modified_code)
+    :param folder: The source folder that you want to list.
+    :type folder: str
+    :param recursive: Do you want to continue recursing through sub-folders?
+    :type recursive: bool
+    :param exclude: Glob patterns of the files and folders to skip.
+    :type exclude: None|list[str...]
+    :param default_excludes: Also skip qt_py_convert.walk.DEFAULT_EXCLUDES?
+    :type default_excludes: bool
+    :param follow_symlinks: Walk into the symlinks to folders?
+    :type follow_symlinks: bool
+    :return: List of python file paths.
+    :rtype: list[str...]
+    """
+    return python_files(
+        folder,
+        recursive=recursive,
+        exclude=exclude,
+        default_excludes=default_excludes,
+        follow_symlinks=follow_symlinks
+    )
 
-    except BaseException:
-        MAIN_LOG.critical("Error processing file: \"{path}\"".format(path=fp))
-        traceback.print_exc()
 
-    # Process any errors that may have happened throughout the process.
-    if ALIAS_DICT["errors"]:
-        MAIN_LOG.error(color_text(
-            text="The following errors were recovered from {}:\n".format(fp),
-            color=ANSI.colors.red,
+def process_files(files, write_mode=None, path=None, backup=False, skip_lineno=False, tometh_flag=False, explicit_signals_flag=False, jobs=1, cache_dir=None, profile=False, engine=ENGINE_REDBARON, chunk_lines=None, max_files_per_worker=None, max_rss=None, file_timeout=None, timeout_fallback=TIMEOUT_TOKENS):
+    """
+    process_files processes a list of python files, in parallel if jobs is
+    more than 1. process_folder uses it for the files that it finds.
+    With max_files_per_worker, max_rss or file_timeout, a file that its
+    worker process dies on is left as it is with an error, and the others
+    are still converted.
+
+    :param files: The python files to process.
+    :type files: list[str...]
+    :param write_mode: The type of writing that we are doing, see
+        qt_py_convert.general.WriteFlag. WRITE_DIFF writes a unified diff of
+        the changed files to stdout and WRITE_NOTHING only sets the
+        "changed" of the results.
+    :type write_mode: int
+    :param path: If passed, it will signify that we are not overwriting.
+        It will be a tuple of (src_root, dst_root), every file is written
+        to the same place under dst_root as it is under src_root.
+    :type path: tuple[str,str]
+    :param backup: If passed we will create a ".bak" file beside the newly
+        created file. The .bak will contain the original source code.
+    :type path: bool
+    :param skip_lineno: An optional performance flag. By default, when the
+        script replaces something, it will tell you which line it is
+        replacing on. This can be useful for tracking the places that
+        changes occurred. When you turn this flag on however, it will not
+        show the line numbers. This can give great performance increases
+        because redbaron has trouble calculating the line number sometimes.
+    :type skip_lineno: bool
+    :param tometh_flag: tometh_flag is an optional feature flag. Once turned
+        on, it will attempt to replace any QString/QVariant/etc apiv1.0 methods
+        that are being used in your script. It is currently not smart enough to
+        confirm that you don't have any custom objects with the same method
+        signature to PyQt4's apiv1.0 ones.
+    :type tometh_flag: bool
+    :param jobs: The number of processes to convert the files with. If it is
+        0 or less, one process per cpu is used. The results are still
+        reported in the order of the files.
+    :type jobs: int
+    :param max_files_per_worker: If passed, the files are converted in
+        worker processes, even with a single job, that are replaced after
+        converting this many files.
+    :type max_files_per_worker: None|int
+    :param max_rss: If passed, the files are converted in worker processes
+        that are replaced once they hold more than this many megabytes.
+    :type max_rss: None|int
+    :param file_timeout: If passed, the files are converted in worker
+        processes that are stopped when they spend more than this many
+        seconds on a file, which then gets timeout_fallback.
+    :type file_timeout: None|float
+    :param timeout_fallback: TIMEOUT_TOKENS converts a file that ran out of
+        time again with the token engine, which only converts the files that
+        need their imports and module attributes changed and skips the
+        rest. TIMEOUT_SKIP skips it. Both record an error and set the
+        timed_out of its result.
+    :type timeout_fallback: str
+    :param cache_dir: If passed, results are cached in this folder and
+        files that have not changed since they were cached are not parsed
+        again.
+    :type cache_dir: None|str
+    :param profile: If True, the stages of every conversion are recorded in
+        the profile of its result. See qt_py_convert.profiling.
+    :type profile: bool
+    :param engine: The engine to convert with. See run.
+    :type engine: str
+    :param chunk_lines: If passed, the modules that are longer than this are
+        converted in chunks of about this many lines. See run.
+    :type chunk_lines: None|int
+    :return: The results of the processed files, in order.
+    :rtype: list[FileResult...]
+    """
+    if timeout_fallback not in TIMEOUT_FALLBACKS:
+        raise ValueError("Unknown timeout fallback \"{fallback}\"".format(
+            fallback=timeout_fallback
         ))
-        for error in ALIAS_DICT["errors"]:
-            try:
-                build_exc(error, lines)
-            except UserInputRequiredException as err:
-                MAIN_LOG.error(str(err))
-
-
-def process_folder(folder, recursive=False, write_mode=None, path=None, backup=False, skip_lineno=False, tometh_flag=False, explicit_signals_flag=False):
+    # TODO: Might need to parse the text to remove whitespace at the EOL.
+    #       #101 at https://github.com/PyCQA/baron documents this issue.
+    kwargs = {
+        "write_mode": write_mode,
+        "path": path,
+        "backup": backup,
+        "skip_lineno": skip_lineno,
+        "tometh_flag": tometh_flag,
+        "explicit_signals_flag": explicit_signals_flag,
+        "cache_dir": cache_dir,
+        "profile": profile,
+        "engine": engine,
+        "chunk_lines": chunk_lines,
+    }
+    tasks = [(fn, kwargs) for fn in files]
+
+    if jobs is None or jobs <= 0:
+        jobs = multiprocessing.cpu_count()
+    jobs = min(jobs, len(tasks))
+
+    if max_files_per_worker or max_rss or file_timeout:
+        # Even a single job gets a worker, so that it can be replaced.
+        return _collect(workers.imap(
+            _process_file_worker,
+            tasks,
+            jobs,
+            max_files=max_files_per_worker,
+            max_rss=max_rss,
+            timeout=file_timeout,
+            on_timeout=functools.partial(
+                _timed_out, seconds=file_timeout, fallback=timeout_fallback
+            ),
+            on_exit=_worker_died
+        ))
+    if jobs > 1:
+        pool = multiprocessing.Pool(processes=jobs)
+        try:
+            # imap keeps the order of the tasks, small chunks keep the
+            #   workers busy when some files are much larger than others.
+            results = _collect(pool.imap(
+                _process_file_worker,
+                tasks,
+                chunksize=max(1, len(tasks) // (jobs * 16))
+            ))
+            pool.close()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+        return results
+
+    results = []
+    for fn, task_kwargs in tasks:
+        results.append(process_file(fn, **task_kwargs))
+        MAIN_LOG.debug(lazy_color_text(text="-" * 50, color=ANSI.colors.black))
+    return results
+
+
+def process_folder(folder, recursive=False, write_mode=None, path=None, backup=False, skip_lineno=False, tometh_flag=False, explicit_signals_flag=False, jobs=1, cache_dir=None, profile=False, engine=ENGINE_REDBARON, exclude=None, default_excludes=True, follow_symlinks=False, chunk_lines=None, max_files_per_worker=None, max_rss=None, file_timeout=None, timeout_fallback=TIMEOUT_TOKENS):
     """
     One of the entry-point functions in qt_py_convert.
     If you are looking to process every python file in a folder, this is your
@@ -627,10 +1367,14 @@ def process_folder(folder, recursive=False, write_mode=None, path=None, backup=F
     :type folder: str
     :param recursive: Do you want to continue recursing through sub-folders?
     :type recursive: bool
-    :param write_mode: The type of writing that we are doing.
+    :param write_mode: The type of writing that we are doing, see
+        qt_py_convert.general.WriteFlag. WRITE_DIFF writes a unified diff of
+        the changed files to stdout and WRITE_NOTHING only sets the
+        "changed" of the results.
     :type write_mode: int
     :param path: If passed, it will signify that we are not overwriting.
-        It will be a tuple of (src_root, dst_roo)
+        It will be a tuple of (src_root, dst_root), every file is written
+        to the same place under dst_root as it is under src_root.
     :type path: tuple[str,str]
     :param backup: If passed we will create a ".bak" file beside the newly
         created file. The .bak will contain the original source code.
@@ -648,40 +1392,75 @@ def process_folder(folder, recursive=False, write_mode=None, path=None, backup=F
         confirm that you don't have any custom objects with the same method
         signature to PyQt4's apiv1.0 ones.
     :type tometh_flag: bool
+    :param jobs: The number of processes to convert the files with. If it is
+        0 or less, one process per cpu is used. The results are still
+        reported in the order of the files.
+    :type jobs: int
+    :param max_files_per_worker: If passed, the files are converted in
+        worker processes, even with a single job, that are replaced after
+        converting this many files.
+    :type max_files_per_worker: None|int
+    :param max_rss: If passed, the files are converted in worker processes
+        that are replaced once they hold more than this many megabytes.
+    :type max_rss: None|int
+    :param file_timeout: If passed, the files are converted in worker
+        processes that are stopped when they spend more than this many
+        seconds on a file, which then gets timeout_fallback.
+    :type file_timeout: None|float
+    :param timeout_fallback: TIMEOUT_TOKENS converts a file that ran out of
+        time again with the token engine, which only converts the files that
+        need their imports and module attributes changed and skips the
+        rest. TIMEOUT_SKIP skips it. Both record an error and set the
+        timed_out of its result.
+    :type timeout_fallback: str
+    :param cache_dir: If passed, results are cached in this folder and
+        files that have not changed since they were cached are not parsed
+        again.
+    :type cache_dir: None|str
+    :param profile: If True, the stages of every conversion are recorded in
+        the profile of its result. See qt_py_convert.profiling.
+    :type profile: bool
+    :param engine: The engine to convert with. See run.
+    :type engine: str
+    :param chunk_lines: If passed, the modules that are longer than this are
+        converted in chunks of about this many lines. See run.
+    :type chunk_lines: None|int
+    :param exclude: Glob patterns of the files and folders to skip, matched
+        against their names and their paths relative to folder.
+    :type exclude: None|list[str...]
+    :param default_excludes: Also skip the version control, virtualenv and
+        build folders in qt_py_convert.walk.DEFAULT_EXCLUDES?
+    :type default_excludes: bool
+    :param follow_symlinks: Walk into the symlinks to folders?
+    :type follow_symlinks: bool
+    :return: The results of the processed files, in order.
+    :rtype: list[FileResult...]
     """
-
-    def _is_dir(path):
-        return True if os.path.isdir(os.path.join(folder, path)) else False
-
-    # TODO: Might need to parse the text to remove whitespace at the EOL.
-    #       #101 at https://github.com/PyCQA/baron documents this issue.
-
-    for fn in filter(is_py, [os.path.join(folder, fp) for fp in os.listdir(folder)]):
-        process_file(
-            fn,
-            write_mode=write_mode,
-            path=path,
-            backup=backup,
-            skip_lineno=skip_lineno,
-            tometh_flag=tometh_flag,
-            explicit_signals_flag=explicit_signals_flag
-        )
-        MAIN_LOG.debug(color_text(text="-" * 50, color=ANSI.colors.black))
-
-    if not recursive:
-        return
-
-    for fn in filter(_is_dir, os.listdir(folder)):
-        process_folder(
-            os.path.join(folder, fn),
-            recursive=recursive,
-            write_mode=write_mode,
-            path=path,
-            backup=backup,
-            skip_lineno=skip_lineno,
-            tometh_flag=tometh_flag,
-            explicit_signals_flag=explicit_signals_flag
-        )
+    files = _folder_files(
+        folder,
+        recursive=recursive,
+        exclude=exclude,
+        default_excludes=default_excludes,
+        follow_symlinks=follow_symlinks
+    )
+    return process_files(
+        files,
+        write_mode=write_mode,
+        path=path,
+        backup=backup,
+        skip_lineno=skip_lineno,
+        tometh_flag=tometh_flag,
+        explicit_signals_flag=explicit_signals_flag,
+        jobs=jobs,
+        cache_dir=cache_dir,
+        profile=profile,
+        engine=engine,
+        chunk_lines=chunk_lines,
+        max_files_per_worker=max_files_per_worker,
+        max_rss=max_rss,
+        file_timeout=file_timeout,
+        timeout_fallback=timeout_fallback
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,624 @@
+# Copyright 2018 Digital Domain 3.0
+#
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#
+# 6. Trademarks. This License does not grant permission to use the trade
+#    names, trademarks, service marks, or product names of the Licensor
+#    and its affiliates, except as required to comply with Section 4(c) of
+#    the License and to reproduce the content of the NOTICE file.
+#
+# You may obtain a copy of the Apache License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+"""
+token_engine converts files that only need their binding imports and the
+Qt module attributes changed, without building a redbaron tree.
+It reads the source with the tokenize module, which is many times faster
+than parsing it, and gives up on anything it can not convert exactly the way
+run would. Those files are then converted by run as usual.
+"""
+import bisect
+import re
+import tokenize
+from StringIO import StringIO
+
+from qt_py_convert.color import ANSI, color_text
+from qt_py_convert.external import Qt
+from qt_py_convert.general import __supported_bindings__, \
+    __suplimentary_bindings__, supported_binding
+from qt_py_convert.log import get_logger, LazyMessage
+from qt_py_convert.mappings import convert_attribute, convert_mappings, \
+    is_common_member, misplaced_members
+
+TOKENS_LOG = get_logger("token_engine")
+
+# The same as run.COMMON_MODULES, which can't be imported from here.
+_COMMON_MODULES = set(Qt._common_members.keys() + ["QtCompat"])
+
+# Anything for psep0101 or unsupported to handle. They need the tree.
+_UNSAFE_EXPRESSION = re.compile(
+    r"QString\b|QStringList\b|QStringRef\b|QChar\b|QVariant|SIGNAL|loadUiType"
+)
+_TOMETH_EXPRESSION = re.compile(r"to[A-Z][A-Za-z]+\(\)")
+
+_SKIPPED = (tokenize.NL, tokenize.COMMENT)
+_OPENING = {"(": ")", "[": "]", "{": "}"}
+_CLAUSES = ("elif", "else", "except", "finally")
+
+
+class _Unsupported(Exception):
+    """Raised when the source has something the engine can't convert."""
+
+
+class _Site(object):
+    """
+    A Qt module attribute in the source, like "QtGui.QWidget" in
+    "QtGui.QWidget(parent)".
+    redbaron has it as an AtomTrailersNode, or as a DottedNameNode in a
+    decorator.
+    """
+    __slots__ = ("start", "chain_end", "end", "text", "dotted")
+
+    def __init__(self, start, chain_end, end, text, dotted):
+        # Offsets into the source. The chain of names runs from start to
+        #   chain_end, end is the end of the node with its calls and
+        #   subscripts.
+        self.start = start
+        self.chain_end = chain_end
+        self.end = end
+        # The current text of the chain of names.
+        self.text = text
+        self.dotted = dotted
+
+
+class _Source(object):
+    """The tokens of a source and the attributes that were found in it."""
+    def __init__(self, text):
+        self.text = text
+        offsets = [0]
+        for line in StringIO(text):
+            offsets.append(offsets[-1] + len(line))
+        try:
+            self.tokens = [
+                (kind, string, offsets[start[0] - 1] + start[1],
+                 offsets[end[0] - 1] + end[1])
+                for kind, string, start, end, _ in
+                tokenize.generate_tokens(StringIO(text).readline)
+            ]
+        except (tokenize.TokenError, IndentationError) as err:
+            raise _Unsupported("it can't be tokenized: {}".format(err))
+        self.imports = []
+        self.sites = []
+        self.starts = []
+
+    def render(self, start, end):
+        """The current text between two offsets of the source."""
+        parts = []
+        position = start
+        number = bisect.bisect_left(self.starts, start)
+        while number < len(self.sites) and self.sites[number].start < end:
+            site = self.sites[number]
+            parts.append(self.text[position:site.start])
+            parts.append(site.text)
+            position = site.chain_end
+            number += 1
+        parts.append(self.text[position:end])
+        return "".join(parts)
+
+    def node_text(self, site):
+        """The current text of the node of site."""
+        return site.text + self.render(site.chain_end, site.end)
+
+
+def _statements(tokens):
+    """
+    Split the tokens into statements, without the INDENT and DEDENTs or the
+    blank and comment lines before them.
+    """
+    statement = []
+    for token in tokens:
+        if token[0] in (tokenize.INDENT, tokenize.DEDENT) or \
+                not statement and token[0] in _SKIPPED:
+            continue
+        statement.append(token)
+        if token[0] in (tokenize.NEWLINE, tokenize.ENDMARKER):
+            yield statement
+            statement = []
+
+
+def _binding_import(source, statement):
+    """
+    _binding_import reads the imports that run replaces or removes.
+    Those are "from <binding> import QtGui, QtCore", "import <binding>.QtGui",
+    "import <binding>.QtGui as QtGui" and "import sip" or "import shiboken".
+
+    :return: The binding, None for sip and shiboken, the modules, the
+        mappings that imports.process gives it and the start and end of the
+        line. None if the statement is not one of those imports.
+    :rtype: None|tuple[None|str,list[str...],dict,int,int]
+    """
+    kinds = [token[0] for token in statement]
+    strings = [token[1] for token in statement]
+    if len(strings) < 2:
+        return None
+    unsupported = _Unsupported(
+        "of the import \"{}\"".format(" ".join(strings))
+    )
+    if strings[0] == "from":
+        if not supported_binding(strings[1]):
+            return None
+        if len(strings) < 5 or strings[2] != "import":
+            raise unsupported
+        binding = strings[1]
+        names = strings[3:-1:2]
+        separators = strings[4:-1:2]
+        if any(separator != "," for separator in separators) or \
+                len(separators) != len(names) - 1:
+            raise unsupported
+        mappings = {}
+    elif supported_binding(strings[1]):
+        # "import <binding>.<module>", with or without "as <name>".
+        binding = strings[1]
+        if len(strings) not in (5, 7) or strings[2] != "." or \
+                len(strings) == 7 and (
+                    strings[4] != "as" or kinds[5] != tokenize.NAME or
+                    strings[5] == "Qt" or supported_binding(strings[5]) or
+                    strings[5] in __suplimentary_bindings__):
+            raise unsupported
+        names = [strings[3]]
+        if len(strings) == 7:
+            mappings = {strings[5]: strings[3]}
+        else:
+            mappings = {binding + "." + strings[3]: strings[3]}
+    elif strings[1] in __suplimentary_bindings__:
+        if len(strings) != 3:
+            raise unsupported
+        binding = None
+        names = []
+        mappings = {}
+    else:
+        return None
+    start = statement[0][2]
+    line_start = source.text.rfind("\n", 0, start) + 1
+    if tokenize.COMMENT in kinds or tokenize.NL in kinds or \
+            binding is not None and binding not in __supported_bindings__ or \
+            any(name not in Qt._common_members for name in names) or \
+            line_start != start or \
+            statement[-1][0] != tokenize.NEWLINE or \
+            statement[-1][2] != statement[-2][3]:
+        raise unsupported
+    return binding, names, mappings, start, statement[-1][3]
+
+
+def _read(source):
+    """
+    _read finds the binding imports and the Qt module attributes of source.
+
+    :raises _Unsupported: If anything else in it would be converted.
+    """
+    tokens = source.tokens
+    # The sip and shiboken members are in the mappings of every binding.
+    site_names = set(Qt._common_members)
+    site_names.update(__suplimentary_bindings__)
+    # The names that "import <binding>.<module> as <name>" maps, which are
+    #   renamed on their own too.
+    names = set()
+    imported = set()
+    other_imports = []
+    for statement in _statements(tokens):
+        if statement[0][0] == tokenize.NAME and \
+                statement[0][1] in ("from", "import"):
+            binding_import = _binding_import(source, statement)
+            if binding_import is None:
+                other_imports.append(statement)
+                continue
+            source.imports.append(binding_import)
+            imported.update(token[2] for token in statement)
+            for key in binding_import[2]:
+                if "." in key:
+                    site_names.add(key.split(".")[0])
+                else:
+                    names.add(key)
+    for statement in other_imports:
+        for token in statement:
+            if token[0] == tokenize.NAME and (
+                    token[1] in site_names or token[1] in names or
+                    token[1] == "Qt" or supported_binding(token[1])):
+                raise _Unsupported("it imports \"{}\"".format(token[1]))
+
+    significant = [
+        number for number, token in enumerate(tokens)
+        if token[0] not in _SKIPPED
+    ]
+    for position, number in enumerate(significant):
+        kind, string, start, end = tokens[number]
+        if kind != tokenize.NAME or start in imported or \
+                string not in site_names and string not in names and \
+                string != "Qt":
+            continue
+        previous = tokens[significant[position - 1]] if position else None
+        if previous is not None and previous[1] == "." and \
+                previous[0] == tokenize.OP:
+            continue
+        following = tokens[number + 1]
+        if string in names:
+            # redbaron renames every NameNode, which a def or class name
+            #   is not.
+            if previous is not None and previous[1] in ("def", "class"):
+                raise _Unsupported("it defines \"{}\"".format(string))
+        elif following[1] != ".":
+            continue
+        if string == "Qt" or following[1] == "." and following[2] != end:
+            raise _Unsupported("of \"{}\"".format(
+                source.text[start:following[3]]
+            ))
+        source.sites.append(
+            _site(source, number, dotted=previous is not None and
+                  previous[1] == "@")
+        )
+    source.starts = [site.start for site in source.sites]
+
+
+def _site(source, number, dotted):
+    """Read the site of the attribute that starts at tokens[number]."""
+    tokens = source.tokens
+    start = tokens[number][2]
+    chain_end = tokens[number][3]
+    number += 1
+    # The chain of names, all of them written without any spaces.
+    while number + 1 < len(tokens) and tokens[number][1] == "." and \
+            tokens[number][2] == chain_end:
+        name = tokens[number + 1]
+        if name[0] != tokenize.NAME or name[2] != tokens[number][3]:
+            raise _Unsupported("of \"{}\"".format(
+                source.text[start:name[3]]
+            ))
+        chain_end = name[3]
+        number += 2
+    end = chain_end
+    if not dotted:
+        # The calls, subscripts and attributes after it.
+        while True:
+            skipped = number
+            while tokens[number][0] in _SKIPPED:
+                number += 1
+            kind, string = tokens[number][:2]
+            if kind != tokenize.OP or string not in ("(", "[", "."):
+                break
+            if skipped != number or \
+                    "\\" in source.text[end:tokens[number][2]]:
+                raise _Unsupported("of \"{}\"".format(
+                    source.text[start:tokens[number][3]]
+                ))
+            if string == ".":
+                if tokens[number + 1][0] != tokenize.NAME:
+                    raise _Unsupported("of \"{}\"".format(
+                        source.text[start:tokens[number + 1][3]]
+                    ))
+                number += 2
+            else:
+                depth = 0
+                while True:
+                    if tokens[number][0] == tokenize.OP:
+                        if tokens[number][1] in _OPENING:
+                            depth += 1
+                        elif tokens[number][1] in _OPENING.values():
+                            depth -= 1
+                    elif tokens[number][0] == tokenize.ENDMARKER:
+                        raise _Unsupported("of an unclosed bracket")
+                    number += 1
+                    if not depth:
+                        break
+            end = tokens[number - 1][3]
+    return _Site(
+        start, chain_end, end, source.text[start:chain_end], dotted
+    )
+
+
+def _convert_body(source, aliases, mappings):
+    """The mappings part of run._convert_body, for dotted mappings only."""
+    by_prefix = {}
+
+    def add_keys(site):
+        text = site.text
+        for number, char in enumerate(text):
+            if char == ".":
+                by_prefix.setdefault(text[:number], set()).add(site)
+        by_prefix.setdefault(text, set()).add(site)
+
+    def matches(site, key):
+        text = site.text
+        if "." not in key:
+            # A NameNode, which a site only ever starts with.
+            return text == key or text.startswith(key + ".")
+        if text == key:
+            return site.end == site.chain_end or \
+                source.text[site.chain_end] in "(["
+        return text.startswith(key + ".")
+
+    for site in source.sites:
+        add_keys(site)
+    for key in sorted(mappings, key=len):
+        value = mappings[key]
+        found = sorted(
+            (site for site in by_prefix.get(key, ()) if matches(site, key)),
+            key=lambda site: site.start
+        )
+        for site in found:
+            if key != value:
+                rest = source.node_text(site)[len(key):]
+                # A dotted key is replaced in the whole text of the node.
+                if "." in key and key in rest:
+                    raise _Unsupported(
+                        "\"{}\" is in \"{}\"".format(key, site.text + rest)
+                    )
+                if value.split(".")[0] in _COMMON_MODULES:
+                    aliases["used"].add(value.split(".")[0])
+                site.text = value + site.text[len(key):]
+                add_keys(site)
+            else:
+                root_name = site.text.split(".")[0]
+                if root_name in _COMMON_MODULES:
+                    aliases["used"].add(root_name)
+
+
+def _convert_attributes(source, aliases):
+    """run._convert_attributes, AtomTrailersNodes before DottedNameNodes."""
+    sites = [site for site in source.sites if not site.dotted]
+    sites += [site for site in source.sites if site.dotted]
+    for site in sites:
+        text = source.node_text(site)
+        if not is_common_member(text.split("\n", 1)[0]):
+            continue
+        module_, _ = convert_attribute(text)
+        root_name = site.text.split(".")[0]
+        if module_ is not None:
+            aliases["used"].add(module_)
+            site.text = module_ + site.text[len(root_name):]
+        else:
+            aliases["used"].add(root_name)
+
+
+def _cleanup_imports(source, aliases, mappings):
+    """
+    run._cleanup_imports, with the edits that it makes to the source.
+    By then every binding import is a FromImportNode, which are gone through
+    before the sip and shiboken ImportNodes.
+
+    :return: The start, end and replacement text of each edit, in order.
+    :rtype: list[tuple[int,int,str]]
+    """
+    names = [name for name in aliases["used"] if name in _COMMON_MODULES]
+    if not names:
+        names = [
+            mappings[member].split(".")[0]
+            for member in aliases["root_aliases"] if member in mappings
+        ]
+    edits = []
+    imports = sorted(
+        source.imports,
+        key=lambda binding_import: (binding_import[0] is None,
+                                    binding_import[3])
+    )
+    for number, (_, _, _, start, end) in enumerate(imports):
+        if not names:
+            TOKENS_LOG.warning(color_text(
+                text="We have found no usages of Qt in this script despite "
+                     "you previously having imported the binding.\nIf you "
+                     "think this is in error, please let us know and submit "
+                     "an issue ticket with the example you think is wrong.",
+                color=ANSI.colors.green
+            ))
+        if number or not names:
+            edits.append((start, end, ""))
+            continue
+        line = source.text[start:end].rstrip("\r\n")
+        edits.append((
+            start, end,
+            "from Qt import {key}".format(key=", ".join(sorted(names))) +
+            source.text[start + len(line):end]
+        ))
+    return sorted(edits)
+
+
+def _check_removals(source, removed):
+    """
+    redbaron lays out every top-level statement again when it removes one
+    of them. That splits the statements that are joined with ";" onto lines
+    of their own and dedents the top-level lines of whitespace and comments.
+    It also dedents the last except, finally or else of a block that ends in
+    a try, or a for or while with an else, to the start of the line. And it
+    adds a newline to the end of a file that ends in an if statement.
+
+    :param source: The source that the statements are removed from.
+    :type source: _Source
+    :param removed: The start and end of each statement that is removed, in
+        order.
+    :type removed: list[tuple[int,int]...]
+    :return: The text that redbaron adds to the end of the file.
+    :rtype: str
+    :raises _Unsupported: If redbaron changes anything else in source.
+    """
+    if any(token[0] == tokenize.OP and token[1] == ";"
+           for token in source.tokens):
+        raise _Unsupported("it has statements joined with \";\"")
+    if _top_level_indents(source):
+        raise _Unsupported("it has indented top-level lines")
+    starts = set(start for start, _ in removed)
+    # The statements with their column, and the statements that are left
+    #   at the top level.
+    statements = []
+    heads = []
+    for statement in _statements(source.tokens):
+        if statement[0][0] == tokenize.ENDMARKER:
+            continue
+        start = statement[0][2]
+        column = start - source.text.rfind("\n", 0, start) - 1
+        statements.append((column, statement[0][1], start, statement[-1][3]))
+        if not column and start not in starts and \
+                statement[0][1] not in _CLAUSES:
+            heads.append((len(statements) - 1, statement[0][1], start))
+    if not heads:
+        raise _Unsupported("it only has the statements that are removed")
+    for number, keyword, _ in heads:
+        if keyword not in ("class", "def", "for", "try", "while", "with"):
+            continue
+        # redbaron only looks at the block before an else, except or
+        #   finally.
+        body = []
+        for column, string, _, _ in statements[number + 1:]:
+            if not column:
+                break
+            body.append((column, string))
+        if not body:
+            continue
+        last = [string for column, string in body if column == body[0][0]]
+        first = len(last) - 1
+        while first and last[first] in _CLAUSES:
+            first -= 1
+        if len(last) - 1 > first and (
+                last[first] == "try" or
+                last[first] in ("for", "while") and last[-1] == "else"):
+            raise _Unsupported(
+                "redbaron dedents the {} that ends a block".format(last[-1])
+            )
+    number, keyword, head_start = heads[-1]
+    if keyword != "if":
+        return ""
+    # The if is only the last top-level node when nothing but the removed
+    #   statements come after it. The blank and comment lines after an
+    #   indented block are a part of it, but not the ones after a clause on
+    #   one line.
+    column, _, _, position = [
+        statement for statement in statements
+        if statement[2] not in starts
+    ][-1]
+    if column:
+        position = None
+    for start, end in removed:
+        if start < head_start:
+            continue
+        if position is not None and start != position:
+            return ""
+        position = end
+    return "\n" if position in (None, len(source.text)) else ""
+
+
+def _top_level_indents(source):
+    """
+    Whether source has a line of whitespace or an indented comment before a
+    top-level statement, or at the end.
+    """
+    waiting = False
+    brackets = 0
+    for kind, string, start, _ in source.tokens:
+        if kind == tokenize.OP and string in _OPENING:
+            brackets += 1
+        elif kind == tokenize.OP and string in _OPENING.values():
+            brackets -= 1
+        if kind in (tokenize.INDENT, tokenize.DEDENT) or brackets:
+            continue
+        line_start = source.text.rfind("\n", 0, start) + 1
+        if kind in (tokenize.NL, tokenize.COMMENT):
+            if line_start < start and \
+                    not source.text[line_start:start].strip():
+                waiting = True
+        elif waiting:
+            if line_start == start:
+                return True
+            waiting = False
+    return waiting
+
+
+def _render(source, edits):
+    """The converted source, with the import edits applied."""
+    parts = []
+    position = 0
+    for start, end, replacement in edits:
+        parts.append(source.render(position, start))
+        parts.append(replacement)
+        position = end
+    parts.append(source.render(position, len(source.text)))
+    return "".join(parts)
+
+
+def convert(text, tometh_flag=False):
+    """
+    convert converts text the way run does, for the files that only import
+    the bindings with "from <binding> import <modules>",
+    "import <binding>.<module>", with or without an "as", or "import sip"
+    and use the members of those modules.
+    Anything else, like api1.0 code or other kinds of imports, is left to
+    run and None is returned.
+
+    :param text: Text from a python file that you want to process.
+    :type text: str
+    :param tometh_flag: Global "tometh_flag" flag.
+    :type tometh_flag: bool
+    :return: None if run has to convert text, otherwise the same tuple as
+        run. aliases, mappings, and the resulting text.
+    :rtype: None|tuple[dict,dict,str]
+    """
+    try:
+        return _convert(text, tometh_flag=tometh_flag)
+    except _Unsupported as err:
+        TOKENS_LOG.debug(LazyMessage(
+            "Using redbaron, the token engine can't convert this because "
+            "{reason}.".format,
+            reason=err
+        ))
+        return None
+
+
+def _convert(text, tometh_flag=False):
+    """convert, raising _Unsupported instead of returning None."""
+    if _UNSAFE_EXPRESSION.search(text) or \
+            tometh_flag and _TOMETH_EXPRESSION.search(text):
+        raise _Unsupported("it has api1.0 code")
+    # redbaron can add a newline to the end when it changes anything.
+    if not text.endswith("\n") or text.count("\r") != text.count("\r\n"):
+        raise _Unsupported("of its line endings")
+    source = _Source(text)
+    _read(source)
+
+    bindings = set(
+        binding for binding, _, _, _, _ in source.imports
+        if binding is not None
+    )
+    if len(bindings) > 1:
+        raise _Unsupported("it imports more than one binding")
+    aliases = {
+        "bindings": bindings,
+        "root_aliases": set(
+            name for _, names, _, _, _ in source.imports for name in names
+        ),
+    }
+    import_mappings = {}
+    for _, _, binding_mappings, _, _ in source.imports:
+        import_mappings.update(binding_mappings)
+    names = set(import_mappings)
+    aliases, mappings = misplaced_members(aliases, import_mappings)
+    aliases["used"] = set()
+    mappings = convert_mappings(aliases, mappings)
+    if any("." not in key and key not in names for key in mappings):
+        raise _Unsupported("of the mappings of its imports")
+
+    _convert_body(source, aliases, mappings)
+    _convert_attributes(source, aliases)
+    edits = []
+    if aliases["root_aliases"]:
+        edits = _cleanup_imports(source, aliases, mappings)
+        removed = [(start, end) for start, end, text in edits if not text]
+        if removed:
+            return aliases, mappings, \
+                _render(source, edits) + _check_removals(source, removed)
+    return aliases, mappings, _render(source, edits)
@@ -0,0 +1,297 @@
+# Copyright 2018 Digital Domain 3.0
+#
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#
+# 6. Trademarks. This License does not grant permission to use the trade
+#    names, trademarks, service marks, or product names of the Licensor
+#    and its affiliates, except as required to comply with Section 4(c) of
+#    the License and to reproduce the content of the NOTICE file.
+#
+# You may obtain a copy of the Apache License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+"""
+walk finds the python files in a folder for process_folder.
+It reads every folder once with scandir and never opens a file that has a
+".py" extension, or walks into a folder that is excluded.
+It can also get the files from git or from a list, without walking at all.
+"""
+import fnmatch
+import os
+import re
+import subprocess
+
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
+from qt_py_convert.general import is_py
+
+# Folders and files that are skipped unless default_excludes is False.
+DEFAULT_EXCLUDES = (
+    ".git", ".hg", ".svn", ".bzr", "CVS",
+    "__pycache__", ".tox", ".nox", ".eggs", "*.egg-info",
+    ".mypy_cache", ".pytest_cache",
+    ".venv", "venv", "site-packages", "node_modules",
+    "build", "dist",
+)
+
+
+class GitError(Exception):
+    """
+    GitError is raised when git can't tell which files changed.
+    """
+
+
+class _ListdirEntry(object):
+    """
+    _ListdirEntry has the part of os.DirEntry that the walk uses, for when
+    scandir is not available.
+    """
+    def __init__(self, folder, name):
+        self.name = name
+        self.path = os.path.join(folder, name)
+
+    def is_dir(self, follow_symlinks=True):
+        if not follow_symlinks and os.path.islink(self.path):
+            return False
+        return os.path.isdir(self.path)
+
+    def is_file(self, follow_symlinks=True):
+        if not follow_symlinks and os.path.islink(self.path):
+            return False
+        return os.path.isfile(self.path)
+
+    def is_symlink(self):
+        return os.path.islink(self.path)
+
+
+def _entries(folder):
+    """
+    _entries lists the contents of folder, sorted by name.
+
+    :param folder: The folder to list.
+    :type folder: str
+    :return: The entries of folder.
+    :rtype: list[os.DirEntry...]
+    """
+    if scandir is None:
+        entries = [_ListdirEntry(folder, name) for name in os.listdir(folder)]
+    else:
+        entries = list(scandir(folder))
+    entries.sort(key=lambda entry: entry.name)
+    return entries
+
+
+def _exclude_matcher(patterns):
+    """
+    _exclude_matcher builds one regular expression out of the glob patterns.
+
+    :param patterns: The glob patterns.
+    :type patterns: list[str...]
+    :return: The match method of the expression, None without patterns.
+    :rtype: None|callable
+    """
+    if not patterns:
+        return None
+    return re.compile(
+        "|".join("(?:%s)" % fnmatch.translate(pattern) for pattern in patterns)
+    ).match
+
+
+def python_files(folder, recursive=False, exclude=None, default_excludes=True,
+                 follow_symlinks=False):
+    """
+    python_files lists the python files in folder.
+    The files in a folder come before the files of its sub-folders, and the
+    entries of a folder are in the order of their names.
+
+    An exclude pattern is a glob that is matched against the name of every
+    file and folder, and against its path relative to folder with "/"
+    separators. An excluded folder is not walked into at all.
+
+    :param folder: The source folder that you want to list.
+    :type folder: str
+    :param recursive: Do you want to continue recursing through sub-folders?
+    :type recursive: bool
+    :param exclude: Glob patterns of the files and folders to skip.
+    :type exclude: None|list[str...]
+    :param default_excludes: Also skip the DEFAULT_EXCLUDES?
+    :type default_excludes: bool
+    :param follow_symlinks: Walk into the symlinks to folders?
+    :type follow_symlinks: bool
+    :return: List of python file paths.
+    :rtype: list[str...]
+    """
+    patterns = list(exclude or [])
+    if default_excludes:
+        patterns.extend(DEFAULT_EXCLUDES)
+    excluded = _exclude_matcher(patterns)
+
+    files = []
+    # A stack of (folder, path relative to the root) to walk, the first
+    #   sub-folder is on the top so the order is the same as a recursion.
+    stack = [(folder, "")]
+    seen = set()
+    while stack:
+        current, relative = stack.pop()
+        if follow_symlinks:
+            # A symlink can point back up the tree.
+            real = os.path.realpath(current)
+            if real in seen:
+                continue
+            seen.add(real)
+        folders = []
+        for entry in _entries(current):
+            rel_path = relative + entry.name
+            if excluded and (excluded(entry.name) or excluded(rel_path)):
+                continue
+            if entry.is_dir(follow_symlinks=follow_symlinks):
+                folders.append((entry.path, rel_path + "/"))
+            elif entry.name.endswith(".py"):
+                files.append(entry.path)
+            elif not os.path.splitext(entry.name)[1] and entry.is_file() \
+                    and is_py(entry.path):
+                files.append(entry.path)
+        if recursive:
+            stack.extend(reversed(folders))
+    return files
+
+
+def _excluded_path(excluded, path):
+    """
+    _excluded_path checks the folders and the name of a path that did not
+    come from a walk against the exclude expression.
+    """
+    parts = [part for part in path.replace(os.sep, "/").split("/") if part]
+    return any(excluded(part) for part in parts)
+
+
+def filter_files(paths, exclude=None, default_excludes=True):
+    """
+    filter_files keeps the python files of a list of paths that exist and
+    are not excluded, in order and without duplicates.
+
+    :param paths: The paths to filter.
+    :type paths: list[str...]
+    :param exclude: Glob patterns of the files and folders to skip, matched
+        against every folder and name in the paths.
+    :type exclude: None|list[str...]
+    :param default_excludes: Also skip the DEFAULT_EXCLUDES?
+    :type default_excludes: bool
+    :return: List of python file paths.
+    :rtype: list[str...]
+    """
+    patterns = list(exclude or [])
+    if default_excludes:
+        patterns.extend(DEFAULT_EXCLUDES)
+    excluded = _exclude_matcher(patterns)
+
+    files = []
+    seen = set()
+    for path in paths:
+        if path in seen:
+            continue
+        seen.add(path)
+        if excluded and _excluded_path(excluded, path):
+            continue
+        if os.path.isfile(path) and is_py(path):
+            files.append(path)
+    return files
+
+
+def read_file_list(fh):
+    """
+    read_file_list reads the paths of a "--files-from" list. They are
+    separated by NUL characters if there are any, by newlines otherwise.
+
+    :param fh: The file to read the list from.
+    :type fh: file
+    :return: The paths in the list.
+    :rtype: list[str...]
+    """
+    data = fh.read()
+    if "\0" in data:
+        paths = data.split("\0")
+    else:
+        paths = [line.rstrip("\r") for line in data.split("\n")]
+    return [path for path in paths if path]
+
+
+def _git(args, cwd=None):
+    """
+    _git runs a git command and returns what it wrote to stdout.
+
+    :raises GitError: If git is not installed or the command failed.
+    """
+    try:
+        process = subprocess.Popen(
+            ["git"] + args,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+    except OSError as err:
+        raise GitError("Could not run git: {err}".format(err=err))
+    out, err = process.communicate()
+    if process.returncode:
+        raise GitError(
+            "\"git {args}\" failed: {err}".format(
+                args=" ".join(args), err=err.strip()
+            )
+        )
+    return out
+
+
+def changed_files(ref, paths=None, cwd=None):
+    """
+    changed_files asks git which files changed since ref. That is every
+    file that was added, copied or modified since ref in the work
+    tree, staged or not, and every untracked file that is not ignored.
+    Renamed files are listed under their new name.
+
+    :param ref: The commit, branch or tag to compare to.
+    :type ref: str
+    :param paths: If passed, only the files under these paths.
+    :type paths: None|list[str...]
+    :param cwd: The folder in the git repository to run git in.
+    :type cwd: None|str
+    :return: The paths of the files in the order that git lists them,
+        joined to cwd if it was passed.
+    :rtype: list[str...]
+    :raises GitError: If git failed, for example if ref does not exist.
+    """
+    pathspec = ["--"] + list(paths or [])
+    changed = _git(
+        [
+            "diff", "--name-only", "--relative", "--no-renames", "-z",
+            "--diff-filter=ACMT", ref,
+        ] + pathspec,
+        cwd=cwd
+    )
+    untracked = _git(
+        ["ls-files", "--others", "--exclude-standard", "-z"] + pathspec,
+        cwd=cwd
+    )
+    files = []
+    seen = set()
+    for path in changed.split("\0") + untracked.split("\0"):
+        if path and path not in seen:
+            seen.add(path)
+            files.append(path)
+    if cwd is not None:
+        files = [os.path.join(cwd, path) for path in files]
+    return files
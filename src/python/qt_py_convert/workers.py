@@ -0,0 +1,294 @@
+# Copyright 2018 Digital Domain 3.0
+#
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#
+# 6. Trademarks. This License does not grant permission to use the trade
+#    names, trademarks, service marks, or product names of the Licensor
+#    and its affiliates, except as required to comply with Section 4(c) of
+#    the License and to reproduce the content of the NOTICE file.
+#
+# You may obtain a copy of the Apache License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+"""
+workers converts files in worker processes that are replaced after a number
+of files, or once they hold too much memory, so a long batch does not keep
+everything that its conversions left behind. A worker that takes too long on
+a file is stopped and replaced too.
+"""
+import contextlib
+import multiprocessing
+import os
+import resource
+import select
+import sys
+import timeit
+import traceback
+
+from qt_py_convert.log import get_logger
+
+WORKERS_LOG = get_logger("workers")
+
+# How often the workers are checked on while waiting for results.
+_POLL_SECONDS = 0.5
+
+_MEGABYTE = 1024 * 1024
+
+# Set in a worker process while it must not be stopped, see protected.
+_protected = None
+
+
+def peak_rss():
+    """
+    peak_rss is the most memory that this process has held so far.
+
+    :return: The peak resident set size, in bytes.
+    :rtype: int
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux counts it in kilobytes, macOS in bytes.
+    if sys.platform == "darwin":
+        return peak
+    return peak * 1024
+
+
+def current_rss():
+    """
+    current_rss is the memory that this process holds right now. Without
+    /proc it falls back to peak_rss, which is never lower.
+
+    :return: The resident set size, in bytes.
+    :rtype: int
+    """
+    try:
+        with open("/proc/self/statm", "rb") as fh:
+            pages = int(fh.read().split()[1])
+    except (IOError, OSError, IndexError, ValueError):
+        return peak_rss()
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+@contextlib.contextmanager
+def protected():
+    """
+    protected keeps imap from stopping the worker that runs the code under
+    it for taking too long, so that it does not stop in the middle of
+    writing a file. It does nothing outside of a worker.
+    """
+    if _protected is None:
+        yield
+        return
+    _protected.value = 1
+    try:
+        yield
+    finally:
+        _protected.value = 0
+
+
+def _work(func, connection, max_files, max_rss, protected_value):
+    """
+    _work is the loop of a worker process. It runs func on every task that
+    it is sent until it is sent None or it has reached one of its limits.
+    """
+    global _protected
+    _protected = protected_value
+    count = 0
+    while True:
+        try:
+            item = connection.recv()
+        except EOFError:
+            return
+        if item is None:
+            return
+        index, task = item
+        error = value = None
+        try:
+            value = func(task)
+        except Exception:
+            error = traceback.format_exc()
+        count += 1
+        rss = current_rss()
+        retire = bool(
+            max_files and count >= max_files or
+            max_rss and rss > max_rss * _MEGABYTE
+        )
+        connection.send((index, value, error, peak_rss(), retire))
+        if retire:
+            return
+
+
+class _Worker(object):
+    """
+    A worker process with a pipe of its own, so that stopping it can't
+    break the pipe of any other worker.
+    """
+    def __init__(self, func, max_files, max_rss):
+        self.connection, child = multiprocessing.Pipe()
+        self.protected = multiprocessing.RawValue("b", 0)
+        self.process = multiprocessing.Process(
+            target=_work,
+            args=(func, child, max_files, max_rss, self.protected)
+        )
+        self.process.daemon = True
+        self.process.start()
+        # Only the worker holds the other end now, so reading from a worker
+        #   that died raises EOFError.
+        child.close()
+        # The position of the task that it is working on, if any.
+        self.index = None
+        self.started = None
+        self.files = 0
+
+    def send(self, index, task):
+        self.index = index
+        self.started = timeit.default_timer()
+        self.connection.send((index, task))
+
+    def overdue(self, timeout):
+        return self.index is not None and not self.protected.value and \
+            timeit.default_timer() - self.started > timeout
+
+    def stop(self):
+        if self.index is None:
+            try:
+                self.connection.send(None)
+            except (IOError, OSError):
+                # It already exited by itself.
+                pass
+        else:
+            self.process.terminate()
+        self.process.join()
+        self.connection.close()
+
+
+def imap(func, tasks, processes, max_files=None, max_rss=None, timeout=None, on_timeout=None, on_exit=None):
+    """
+    imap runs func on every task in worker processes, like
+    multiprocessing.Pool.imap, and replaces a worker once it reaches one of
+    its limits.
+    A worker is only given its next task once it returned the last one, so
+    a worker that is replaced never leaves any task unfinished. The only
+    exceptions are a worker that runs out of time, which is stopped, and a
+    worker that dies, which is replaced like it.
+
+    :param func: The function to run. It has to be at the module level.
+    :type func: callable
+    :param tasks: The argument of every call of func.
+    :type tasks: list
+    :param processes: The number of worker processes.
+    :type processes: int
+    :param max_files: If passed, a worker is replaced after this many tasks.
+    :type max_files: None|int
+    :param max_rss: If passed, a worker is replaced once it holds more than
+        this many megabytes after a task.
+    :type max_rss: None|int
+    :param timeout: If passed, the seconds that a worker gets for a task
+        before it is stopped and replaced.
+    :type timeout: None|float
+    :param on_timeout: Called in this process with the task that ran out of
+        time, it returns the value to use for that task.
+    :type on_timeout: None|callable
+    :param on_exit: Called in this process with the task and the exit code
+        of a worker that died during it, it returns the value to use for
+        that task.
+    :type on_exit: None|callable
+    :return: The return value of func for every task, in order.
+    :rtype: generator
+    :raises RuntimeError: If func raised, or a worker died during a task
+        without on_exit.
+    """
+    workers = []
+    pending = list(reversed(list(enumerate(tasks))))
+    done = {}
+    next_index = 0
+    peak = 0
+
+    def _replace(worker):
+        workers.remove(worker)
+        worker.stop()
+        if pending:
+            new_worker = _Worker(func, max_files, max_rss)
+            workers.append(new_worker)
+            new_worker.send(*pending.pop())
+
+    try:
+        for _ in range(min(processes, len(pending))):
+            workers.append(_Worker(func, max_files, max_rss))
+            workers[-1].send(*pending.pop())
+        while next_index < len(tasks):
+            busy = dict(
+                (worker.connection.fileno(), worker) for worker in workers
+                if worker.index is not None
+            )
+            readable = select.select(busy.keys(), [], [], _POLL_SECONDS)[0]
+            for fileno in readable:
+                worker = busy[fileno]
+                try:
+                    index, value, error, rss, retire = \
+                        worker.connection.recv()
+                except EOFError:
+                    worker.process.join()
+                    message = "Worker {pid} exited with code {code} on " \
+                        "task {index}.".format(
+                            pid=worker.process.pid,
+                            code=worker.process.exitcode,
+                            index=worker.index
+                        )
+                    if on_exit is None:
+                        raise RuntimeError(message)
+                    WORKERS_LOG.debug(message)
+                    done[worker.index] = on_exit(
+                        tasks[worker.index], worker.process.exitcode
+                    )
+                    worker.index = None
+                    _replace(worker)
+                    continue
+                if error is not None:
+                    raise RuntimeError(error)
+                done[index] = value
+                worker.index = None
+                worker.files += 1
+                peak = max(peak, rss)
+                if retire:
+                    WORKERS_LOG.debug(
+                        "Replacing worker {pid} after {files} files, it "
+                        "peaked at {rss}MB.".format(
+                            pid=worker.process.pid,
+                            files=worker.files,
+                            rss=rss // _MEGABYTE
+                        )
+                    )
+                    _replace(worker)
+                elif pending:
+                    worker.send(*pending.pop())
+            for worker in list(workers):
+                if timeout is None or not worker.overdue(timeout):
+                    continue
+                WORKERS_LOG.debug(
+                    "Stopping worker {pid} after {seconds} seconds on task "
+                    "{index}.".format(
+                        pid=worker.process.pid,
+                        seconds=timeout,
+                        index=worker.index
+                    )
+                )
+                done[worker.index] = on_timeout(tasks[worker.index])
+                _replace(worker)
+            while next_index in done:
+                yield done.pop(next_index)
+                next_index += 1
+        WORKERS_LOG.info(
+            "The workers peaked at {rss}MB.".format(rss=peak // _MEGABYTE)
+        )
+    finally:
+        for worker in workers:
+            worker.stop()
@@ -0,0 +1,127 @@
+import os
+import shutil
+import tempfile
+
+import qt_py_convert.run
+from qt_py_convert.run import process_file
+from qt_py_convert.general import WriteFlag
+
+
+SOURCE = """from PyQt4 import QtGui, uic
+
+w = QtGui.QLineEdit()
+form, base = uic.loadUiType("widget.ui")
+"""
+
+
+def _convert_twice(cache_dir, folder, source=SOURCE):
+    fp = os.path.join(folder, "widget.py")
+    results = []
+    for _ in range(2):
+        with open(fp, "wb") as fh:
+            fh.write(source)
+        results.append(process_file(
+            fp,
+            write_mode=WriteFlag.WRITE_TO_FILE,
+            skip_lineno=True,
+            cache_dir=cache_dir,
+        ))
+        with open(fp, "rb") as fh:
+            results.append(fh.read())
+    return results
+
+
+def test_cache_hit_skips_run():
+    folder = tempfile.mkdtemp()
+    cache_dir = os.path.join(folder, "cache")
+    original_run = qt_py_convert.run.run
+    calls = []
+
+    def counting_run(*args, **kwargs):
+        calls.append(args)
+        return original_run(*args, **kwargs)
+
+    qt_py_convert.run.run = counting_run
+    try:
+        first, first_code, second, second_code = _convert_twice(
+            cache_dir, folder
+        )
+    finally:
+        qt_py_convert.run.run = original_run
+        shutil.rmtree(folder)
+
+    assert len(calls) == 1, "The second conversion should be a cache hit."
+    assert first_code == second_code
+    assert "QtWidgets.QLineEdit" in second_code
+    assert first.aliases["used"] == second.aliases["used"]
+    assert first.mappings == second.mappings
+    assert all(
+        isinstance(key, str) and isinstance(value, str)
+        for key, value in second.mappings.items()
+    )
+    assert all(isinstance(name, str) for name in second.aliases["used"])
+    assert first.errors == second.errors
+    assert len(second.errors) == 1
+
+
+def test_cache_hit_keeps_bytes():
+    # The reason of the error quotes the line that could not be parsed.
+    source = (
+        "# -*- coding: utf-8 -*-\n"
+        "from PyQt4 import QtGui\n"
+        "x = u\"\xc3\xa9t\xc3\xa9\" +\n"
+    )
+    folder = tempfile.mkdtemp()
+    cache_dir = os.path.join(folder, "cache")
+    try:
+        first, first_code, second, second_code = _convert_twice(
+            cache_dir, folder, source=source
+        )
+    finally:
+        shutil.rmtree(folder)
+
+    assert first_code == second_code == source
+    assert first.errors == second.errors
+    assert len(second.errors) == 1
+    assert "\xc3\xa9t\xc3\xa9" in second.errors[0]
+    assert all(isinstance(error, str) for error in second.errors)
+
+
+def test_cache_key_flags():
+    from qt_py_convert.cache import ConversionCache
+    assert ConversionCache.key(SOURCE) == ConversionCache.key(SOURCE)
+    assert ConversionCache.key(SOURCE) != \
+        ConversionCache.key(SOURCE, tometh_flag=True)
+    assert ConversionCache.key(SOURCE) != ConversionCache.key(SOURCE + "\n")
+
+
+if __name__ == "__main__":
+    import traceback
+    _tests = filter(
+        lambda key: True if key.startswith("test_") else False,
+        globals().keys()
+    )
+
+    failed = []
+    for test in _tests:
+        try:
+            print("Running %s" % test)
+            globals()[test]()
+            print("    %s succeeded!" % test)
+        except AssertionError as err:
+            print("    %s failed!" % test)
+            failed.append((test, traceback.format_exc()))
+        print("")
+    for failure_name, failure_error in failed:
+        print("""
+------------ %s FAILED ------------
+%s
+""" % (failure_name, failure_error))
+
+    print(
+        "\n\n%d failures, %d success, %s%%" % (
+            len(failed),
+            len(_tests)-len(failed),
+            "%.1f" % ((float(len(_tests)-len(failed))/len(_tests))*100)
+        )
+    )
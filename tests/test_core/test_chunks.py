@@ -0,0 +1,234 @@
+import redbaron
+
+from qt_py_convert import chunks
+from qt_py_convert.general import ConversionContext
+from qt_py_convert.run import run, _relayout
+
+
+SOURCES = [
+    """\"\"\"A generated module.\"\"\"
+import os
+from PyQt4 import QtGui, QtCore
+
+
+def first(self):
+    x = QtCore.QString("x")
+    return QtGui.QWidget()
+
+
+@decorator
+def second(self):
+    x = QtCore.SIGNAL("clicked()")
+    return QtGui.QHeaderView.setResizeMode(
+        1
+    )
+
+
+if os.name:
+    def third():
+        return QtGui.QLabel()
+else:
+    third = None
+from PyQt4 import uic
+
+
+class Window(QtGui.QWidget):
+    def __init__(self, parent=None):
+        super(Window, self).__init__(parent)
+        uic.loadUiType("window.ui")
+""",
+    """x = 1
+def first(self):
+    return QtGui.QWidget()
+y = QtCore.QString("y")
+from PyQt4 import QtGui, QtCore
+import sip
+if x:
+    pass
+""",
+    """import sip
+def first(self):
+    return QtGui.QWidget()
+def second(self):
+    return sip.wrapinstance(1, QtGui.QWidget)
+def third(self):
+    return QtGui.QLabel()""",
+    # Removing imports from the head lays out every chunk again.
+    """from PyQt4 import QtGui
+from PyQt4 import QtCore
+import sip
+w = 1
+x = QtGui.QWidget(); y = 2
+
+    
+z = 3
+def first(self):
+    try:
+        return QtCore.QObject()
+    except ImportError:
+        return sip.wrapinstance(1, QtGui.QWidget)
+""",
+    """from PyQt4 import QtGui
+from PyQt4 import QtCore
+x = 1
+def first(self):
+    return QtGui.QWidget()
+if __name__ == "__main__":
+    first(QtCore.QObject())
+""",
+    # Nothing is removed, so nothing is laid out again.
+    """from PyQt4 import QtGui
+x = 1
+y = 2; z = 3
+  
+def first(self):
+    return QtGui.QWidget()
+w = 4
+""",
+    # The binding is not used, so its only import is removed.
+    """from PyQt4 import QtGui
+x = 1; y = 2
+def first(self):
+    return 1
+""",
+    # The chunks use the modules in another order than the whole module.
+    """import PyQt4.QtGui as QtGui
+import PyQt4.QtCore as QtCore
+def f1(): sip.wrapinstance(1, QtGui.QWidget); return 1
+def f2(): m = QtGui.qApp; q = QtCore.QTimer(); return QtGui.QLabel()
+""",
+]
+
+
+def _errors(context):
+    return sorted(
+        (error.row, error.row_to, error.reason)
+        for error in context["errors"]
+    )
+
+
+def _split_rows(source, chunk_lines):
+    split = chunks.split(source, chunk_lines)
+    if split is None:
+        return None
+    parts, head = split
+    return [row for row, _ in parts], head
+
+
+def test_split_keeps_the_text():
+    for source in SOURCES:
+        parts, _ = chunks.split(source, 1)
+        assert "".join(text for _, text in parts) == source
+
+
+def test_split_statements():
+    source = "x = 1\n\n# comment\ny = 2\nz = 3\n"
+    assert _split_rows(source, 1) == ([1, 4, 5], None)
+    assert _split_rows(source, 4) == ([1, 5], None)
+    assert _split_rows(source, 10) is None
+
+
+def test_split_blocks():
+    source = (
+        "@dec\n@dec\ndef f():\n    pass\n"
+        "try:\n    pass\nexcept ImportError:\n    pass\nfinally:\n    pass\n"
+        "if x:\n    a = 1\nelif y:\n    a = 2\nelse:\n    a = 3\n"
+    )
+    assert _split_rows(source, 1) == ([1, 5, 11], None)
+    # Only the last chunk ends on an if statement.
+    assert _split_rows("if x:\n    a = 1\nb = 2\nc = 3\n", 1) == \
+        ([1, 4], None)
+    # Or on a line of whitespace.
+    assert _split_rows("a = 1\n\n    \nb = 2\nc = 3\n", 1) == \
+        ([1, 5], None)
+
+
+def test_split_head():
+    source = (
+        "x = 1\nfrom PyQt4 import QtGui\ny = 2\n"
+        "def f():\n    from PyQt4 import QtCore\nz = 3\n"
+    )
+    assert _split_rows(source, 1) == ([1, 2, 6], 1)
+    # The head does not end on an import that it can remove.
+    assert _split_rows("import sip\nimport os\nx = 1\ny = 2\n", 1) == \
+        ([1, 3, 4], 0)
+    # The head takes the chunk before it at the end of the module.
+    assert _split_rows("x = 1\ny = 2\nimport sip\n", 1) == ([1, 2], 1)
+    assert chunks.split("x = 1\nfrom PyQt4.QtGui import *\ny = 2\n", 1) \
+        is None
+    assert chunks.split("x = (\n", 1) is None
+
+
+def test_same_as_whole_module():
+    for source in SOURCES:
+        for chunk_lines in (1, 5):
+            context = ConversionContext()
+            aliases, mappings, code = run(source, context=context)
+            chunked_context = ConversionContext()
+            chunked_aliases, chunked_mappings, chunked_code = run(
+                source, context=chunked_context, chunk_lines=chunk_lines
+            )
+            assert chunked_code == code, (source, chunked_code)
+            assert chunked_mappings == mappings
+            for key in ("bindings", "root_aliases", "used"):
+                assert chunked_aliases[key] == aliases[key], key
+            assert _errors(chunked_context) == _errors(context)
+
+
+def test_import_names_are_sorted():
+    _, _, code = run(SOURCES[-1], chunk_lines=3)
+    assert code.startswith(
+        "from Qt import QtCompat, QtCore, QtGui, QtWidgets\n"
+    ), code
+    assert code == run(SOURCES[-1])[2]
+
+
+def test_relayout_is_the_same_as_a_removal():
+    # _relayout has to keep up with what redbaron does after a removal.
+    body = (
+        "a = 1; b = 2\n    \n"
+        "def f():\n    try:\n        pass\n    except:\n        pass\n"
+    )
+    removed = redbaron.RedBaron("import sip\n" + body)
+    del removed[0]
+    laid_out = redbaron.RedBaron(body)
+    _relayout(laid_out)
+    assert laid_out.dumps() == removed.dumps()
+    assert laid_out.dumps() != body
+
+
+def test_short_module_is_not_split():
+    source = SOURCES[1]
+    assert run(source, chunk_lines=100) == run(source)
+
+
+if __name__ == "__main__":
+    import traceback
+    _tests = filter(
+        lambda key: True if key.startswith("test_") else False,
+        globals().keys()
+    )
+
+    failed = []
+    for test in _tests:
+        try:
+            print("Running %s" % test)
+            globals()[test]()
+            print("    %s succeeded!" % test)
+        except AssertionError as err:
+            print("    %s failed!" % test)
+            failed.append((test, traceback.format_exc()))
+        print("")
+    for failure_name, failure_error in failed:
+        print("""
+------------ %s FAILED ------------
+%s
+""" % (failure_name, failure_error))
+
+    print(
+        "\n\n%d failures, %d success, %s%%" % (
+            len(failed),
+            len(_tests)-len(failed),
+            "%.1f" % ((float(len(_tests)-len(failed))/len(_tests))*100)
+        )
+    )
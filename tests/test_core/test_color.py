@@ -0,0 +1,83 @@
+import os
+import subprocess
+
+from qt_py_convert import color
+
+
+def _fresh(value):
+    """Forget the cached color support and set the environment to value."""
+    color._SUPPORTS_COLOR = None
+    if value is None:
+        os.environ.pop(color.COLOR_ENV, None)
+    else:
+        os.environ[color.COLOR_ENV] = value
+
+
+def _restore(state):
+    cached, environ = state
+    _fresh(environ)
+    color._SUPPORTS_COLOR = cached
+
+
+def test_environment_skips_the_check():
+    state = (color._SUPPORTS_COLOR, os.environ.get(color.COLOR_ENV))
+    original = subprocess.Popen
+    calls = []
+
+    def counting_popen(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    subprocess.Popen = counting_popen
+    try:
+        _fresh("0")
+        assert color.color_text(text="text") == "text"
+        _fresh("1")
+        assert color.color_text(text="text") != "text"
+    finally:
+        subprocess.Popen = original
+        _restore(state)
+    assert not calls, "tput should not run when the result is cached."
+
+
+def test_check_is_cached_for_children():
+    state = (color._SUPPORTS_COLOR, os.environ.get(color.COLOR_ENV))
+    try:
+        _fresh(None)
+        expected = color.supports_color()
+        assert color.has_color() == expected
+        assert os.environ[color.COLOR_ENV] == ("1" if expected else "0")
+    finally:
+        _restore(state)
+
+
+if __name__ == "__main__":
+    import traceback
+    _tests = filter(
+        lambda key: True if key.startswith("test_") else False,
+        globals().keys()
+    )
+
+    failed = []
+    for test in _tests:
+        try:
+            print("Running %s" % test)
+            globals()[test]()
+            print("    %s succeeded!" % test)
+        except AssertionError as err:
+            print("    %s failed!" % test)
+            failed.append((test, traceback.format_exc()))
+        print("")
+    for failure_name, failure_error in failed:
+        print("""
+------------ %s FAILED ------------
+%s
+""" % (failure_name, failure_error))
+
+    print(
+        "\n\n%d failures, %d success, %s%%" % (
+            len(failed),
+            len(_tests)-len(failed),
+            "%.1f" % ((float(len(_tests)-len(failed))/len(_tests))*100)
+        )
+    )
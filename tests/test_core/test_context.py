@@ -0,0 +1,80 @@
+from multiprocessing.pool import ThreadPool
+
+from qt_py_convert.run import run
+from qt_py_convert.general import ConversionContext
+
+
+QT_SOURCE = """from PyQt4 import QtGui
+
+w = QtGui.QLineEdit()
+"""
+QT_DEST = """from Qt import QtWidgets
+
+w = QtWidgets.QLineEdit()
+"""
+UNSUPPORTED_SOURCE = """from PyQt4 import uic
+
+form, base = uic.loadUiType("widget.ui")
+"""
+
+
+def _convert(source):
+    context = ConversionContext()
+    aliases, mappings, dumps = run(source, True, True, context=context)
+    return context, dumps
+
+
+def test_errors_stay_in_their_context():
+    clean_context, _ = _convert(QT_SOURCE)
+    error_context, _ = _convert(UNSUPPORTED_SOURCE)
+    assert len(clean_context["errors"]) == 0
+    assert len(error_context["errors"]) == 1
+
+
+def test_threaded_runs():
+    sources = [QT_SOURCE, UNSUPPORTED_SOURCE] * 8
+    pool = ThreadPool(4)
+    try:
+        results = pool.map(_convert, sources)
+    finally:
+        pool.close()
+        pool.join()
+
+    for source, (context, dumps) in zip(sources, results):
+        if source == QT_SOURCE:
+            assert dumps == QT_DEST
+            assert len(context["errors"]) == 0
+        else:
+            assert len(context["errors"]) == 1
+
+
+if __name__ == "__main__":
+    import traceback
+    _tests = filter(
+        lambda key: True if key.startswith("test_") else False,
+        globals().keys()
+    )
+
+    failed = []
+    for test in _tests:
+        try:
+            print("Running %s" % test)
+            globals()[test]()
+            print("    %s succeeded!" % test)
+        except AssertionError as err:
+            print("    %s failed!" % test)
+            failed.append((test, traceback.format_exc()))
+        print("")
+    for failure_name, failure_error in failed:
+        print("""
+------------ %s FAILED ------------
+%s
+""" % (failure_name, failure_error))
+
+    print(
+        "\n\n%d failures, %d success, %s%%" % (
+            len(failed),
+            len(_tests)-len(failed),
+            "%.1f" % ((float(len(_tests)-len(failed))/len(_tests))*100)
+        )
+    )
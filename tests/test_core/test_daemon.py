@@ -0,0 +1,126 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+
+from qt_py_convert import daemon
+
+
+SOURCE = """from PyQt4 import QtGui, uic
+
+w = QtGui.QLineEdit()
+form, base = uic.loadUiType("widget.ui")
+"""
+
+
+def _serve(folder):
+    server = daemon.ConversionServer(os.path.join(folder, "server.sock"))
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server, thread
+
+
+def test_convert_through_server():
+    folder = tempfile.mkdtemp()
+    server, thread = _serve(folder)
+    try:
+        fp = os.path.join(folder, "widget.py")
+        with open(fp, "wb") as fh:
+            fh.write(SOURCE)
+        results = list(daemon.convert(
+            fp, socket_path=server.socket_path, stdout=True, skip_lineno=True
+        ))
+        with open(fp, "rb") as fh:
+            assert fh.read() == SOURCE, "--stdout should not write the file."
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+        shutil.rmtree(folder)
+
+    assert len(results) == 1
+    path, output, errors, changed = results[0]
+    assert path == fp
+    assert changed
+    assert "QtWidgets.QLineEdit()" in output
+    assert len(errors) == 1
+    assert not os.path.exists(server.socket_path)
+
+
+def test_convert_without_server():
+    folder = tempfile.mkdtemp()
+    try:
+        socket_path = os.path.join(folder, "missing.sock")
+        try:
+            daemon.convert("widget.py", socket_path=socket_path)
+        except daemon.DaemonUnavailable:
+            pass
+        else:
+            assert False, "convert should raise without a server."
+    finally:
+        shutil.rmtree(folder)
+
+
+def test_client_rejects_worker_options():
+    script = os.path.join(
+        os.path.dirname(__file__), "..", "..", "src", "bin", "qt_py_convert"
+    )
+    for options in (["--jobs", "2"], ["--max-rss", "100"],
+                    ["--max-files-per-worker", "10"],
+                    ["--file-timeout", "1"], ["--timeout-fallback", "skip"]):
+        process = subprocess.Popen(
+            [sys.executable, script, "--client", "widget.py"] + options,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        _, err = process.communicate()
+        assert process.returncode == 2, err
+        assert "%s can't be used with --client" % options[0] in err, err
+
+
+def test_stale_socket_is_replaced():
+    folder = tempfile.mkdtemp()
+    try:
+        socket_path = os.path.join(folder, "server.sock")
+        # A server that is gone leaves its socket behind.
+        daemon.ConversionServer(socket_path).socket.close()
+        assert os.path.exists(socket_path)
+        server = daemon.ConversionServer(socket_path)
+        server.server_close()
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    import traceback
+    _tests = filter(
+        lambda key: True if key.startswith("test_") else False,
+        globals().keys()
+    )
+
+    failed = []
+    for test in _tests:
+        try:
+            print("Running %s" % test)
+            globals()[test]()
+            print("    %s succeeded!" % test)
+        except AssertionError as err:
+            print("    %s failed!" % test)
+            failed.append((test, traceback.format_exc()))
+        print("")
+    for failure_name, failure_error in failed:
+        print("""
+------------ %s FAILED ------------
+%s
+""" % (failure_name, failure_error))
+
+    print(
+        "\n\n%d failures, %d success, %s%%" % (
+            len(failed),
+            len(_tests)-len(failed),
+            "%.1f" % ((float(len(_tests)-len(failed))/len(_tests))*100)
+        )
+    )
@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+
+from qt_py_convert.diff import unified_diff
+from qt_py_convert.general import WriteFlag
+from qt_py_convert.run import process_file
+
+
+SOURCE = """from PyQt4 import QtGui
+
+w = QtGui.QWidget()
+"""
+
+
+def _process(source, write_mode):
+    folder = tempfile.mkdtemp()
+    fp = os.path.join(folder, "widget.py")
+    try:
+        with open(fp, "wb") as fh:
+            fh.write(source)
+        result = process_file(fp, write_mode=write_mode, skip_lineno=True)
+        with open(fp, "rb") as fh:
+            return result, fh.read()
+    finally:
+        shutil.rmtree(folder)
+
+
+def test_unified_diff():
+    diff = unified_diff("/a/widget.py", "a\nb\n", "a\nc\n")
+    assert diff == (
+        "--- a/a/widget.py\n"
+        "+++ b/a/widget.py\n"
+        "@@ -1,2 +1,2 @@\n"
+        " a\n"
+        "-b\n"
+        "+c\n"
+    )
+
+
+def test_unified_diff_no_newline():
+    diff = unified_diff("widget.py", "a\nb", "a\nc")
+    assert diff.endswith(
+        "-b\n\\ No newline at end of file\n"
+        "+c\n\\ No newline at end of file\n"
+    )
+
+
+def test_write_diff():
+    result, code = _process(SOURCE, WriteFlag.WRITE_DIFF)
+    assert code == SOURCE, "The file should not be written."
+    assert result.changed
+    assert "-from PyQt4 import QtGui\n" in result.output
+    assert "+from Qt import QtWidgets\n" in result.output
+    assert "+w = QtWidgets.QWidget()\n" in result.output
+
+
+def test_write_diff_unchanged():
+    result, code = _process("import os\n", WriteFlag.WRITE_DIFF)
+    assert not result.changed
+    assert result.output is None
+
+
+def test_write_nothing():
+    result, code = _process(SOURCE, WriteFlag.WRITE_NOTHING)
+    assert code == SOURCE, "The file should not be written."
+    assert result.changed
+    assert result.output is None
+
+
+if __name__ == "__main__":
+    import traceback
+    _tests = filter(
+        lambda key: True if key.startswith("test_") else False,
+        globals().keys()
+    )
+
+    failed = []
+    for test in _tests:
+        try:
+            print("Running %s" % test)
+            globals()[test]()
+            print("    %s succeeded!" % test)
+        except AssertionError as err:
+            print("    %s failed!" % test)
+            failed.append((test, traceback.format_exc()))
+        print("")
+    for failure_name, failure_error in failed:
+        print("""
+------------ %s FAILED ------------
+%s
+""" % (failure_name, failure_error))
+
+    print(
+        "\n\n%d failures, %d success, %s%%" % (
+            len(failed),
+            len(_tests)-len(failed),
+            "%.1f" % ((float(len(_tests)-len(failed))/len(_tests))*100)
+        )
+    )
@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+
+import qt_py_convert.general
+from qt_py_convert.general import is_py
+
+
+SCRIPTS = {
+    "env": ("#!/usr/bin/env python\nimport os\n", True),
+    "versioned": ("#!/usr/bin/python2.7 -u\nimport os\n", True),
+    "spaced": ("#! /usr/bin/env python3\n", True),
+    "no_newline": ("#!/usr/bin/env python", True),
+    "shell": ("#!/bin/sh\nexec python \"$@\"\n", False),
+    "comment": ("# python is mentioned here\n", False),
+    "other": ("#!/usr/bin/env pythonista\n", False),
+    "binary": ("\x7fELF" + "\x00python" * 100000, False),
+}
+
+
+def _write(folder, name, data):
+    fp = os.path.join(folder, name)
+    with open(fp, "wb") as fh:
+        fh.write(data)
+    return fp
+
+
+def test_is_py():
+    folder = tempfile.mkdtemp()
+    try:
+        assert is_py(os.path.join(folder, "missing.py"))
+        assert not is_py(os.path.join(folder, "missing"))
+        assert not is_py(_write(folder, "notes.txt", "#!/usr/bin/python\n"))
+        os.mkdir(os.path.join(folder, "folder"))
+        assert not is_py(os.path.join(folder, "folder"))
+        for name, (data, expected) in SCRIPTS.items():
+            assert is_py(_write(folder, name, data)) == expected, name
+    finally:
+        shutil.rmtree(folder)
+
+
+def test_is_py_cached():
+    folder = tempfile.mkdtemp()
+    opened = []
+
+    def counting_open(*args, **kwargs):
+        opened.append(args[0])
+        return open(*args, **kwargs)
+
+    qt_py_convert.general.open = counting_open
+    try:
+        fp = _write(folder, "script", "#!/usr/bin/env python\n")
+        assert is_py(fp)
+        assert is_py(fp)
+        assert opened == [fp], "The second call should be cached."
+
+        _write(folder, "script", "#!/bin/sh\n")
+        os.utime(fp, (0, 0))
+        assert not is_py(fp), "A changed file should be read again."
+        assert opened == [fp, fp]
+    finally:
+        del qt_py_convert.general.open
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    import traceback
+    _tests = filter(
+        lambda key: True if key.startswith("test_") else False,
+        globals().keys()
+    )
+
+    failed = []
+    for test in _tests:
+        try:
+            print("Running %s" % test)
+            globals()[test]()
+            print("    %s succeeded!" % test)
+        except AssertionError as err:
+            print("    %s failed!" % test)
+            failed.append((test, traceback.format_exc()))
+        print("")
+    for failure_name, failure_error in failed:
+        print("""
+------------ %s FAILED ------------
+%s
+""" % (failure_name, failure_error))
+
+    print(
+        "\n\n%d failures, %d success, %s%%" % (
+            len(failed),
+            len(_tests)-len(failed),
+            "%.1f" % ((float(len(_tests)-len(failed))/len(_tests))*100)
+        )
+    )
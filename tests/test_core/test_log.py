@@ -0,0 +1,79 @@
+import logging
+
+from qt_py_convert.general import change
+from qt_py_convert.log import LazyMessage, get_logger
+
+
+class _Node(object):
+    """Stands in for a redbaron node and counts how often it is rendered."""
+    def __init__(self):
+        self.rendered = 0
+
+    def __str__(self):
+        self.rendered += 1
+        return "QtGui.QWidget"
+
+
+def _logger(level):
+    logger = get_logger("test_log", level=level)
+    # Keep the test output clean, the level is all that matters here.
+    logger.propagate = False
+    for handler in logger.handlers:
+        handler.setLevel(logging.CRITICAL)
+    return logger
+
+
+def test_lazy_message_is_not_built_when_disabled():
+    built = []
+
+    def build():
+        built.append(True)
+        return "message"
+
+    logger = _logger(logging.INFO)
+    logger.debug(LazyMessage(build))
+    assert not built
+    assert str(LazyMessage("{}-{key}".format, 1, key=2)) == "1-2"
+
+
+def test_change_does_nothing_when_disabled():
+    node = _Node()
+    change(_logger(logging.INFO), node, "QtWidgets.QWidget")
+    assert node.rendered == 0
+
+    change(
+        _logger(logging.DEBUG), node, "QtWidgets.QWidget", skip_lineno=True
+    )
+    assert node.rendered == 1
+
+
+if __name__ == "__main__":
+    import traceback
+    _tests = filter(
+        lambda key: True if key.startswith("test_") else False,
+        globals().keys()
+    )
+
+    failed = []
+    for test in _tests:
+        try:
+            print("Running %s" % test)
+            globals()[test]()
+            print("    %s succeeded!" % test)
+        except AssertionError as err:
+            print("    %s failed!" % test)
+            failed.append((test, traceback.format_exc()))
+        print("")
+    for failure_name, failure_error in failed:
+        print("""
+------------ %s FAILED ------------
+%s
+""" % (failure_name, failure_error))
+
+    print(
+        "\n\n%d failures, %d success, %s%%" % (
+            len(failed),
+            len(_tests)-len(failed),
+            "%.1f" % ((float(len(_tests)-len(failed))/len(_tests))*100)
+        )
+    )
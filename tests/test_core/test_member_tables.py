@@ -0,0 +1,129 @@
+import re
+
+from qt_py_convert.external import Qt
+from qt_py_convert.mappings import convert_attribute, convert_mappings, \
+    is_common_member
+
+
+MODULES = "|".join(re.escape(name) for name in Qt._common_members.keys())
+
+
+def _cascade(template, flags=0):
+    """The per module expressions that the member tables replaced."""
+    return [
+        (
+            re.compile(
+                template.format(
+                    modules=MODULES,
+                    widgets="|".join(
+                        re.escape(widget)
+                        for widget in Qt._common_members[module_name]
+                    )
+                ),
+                flags
+            ),
+            module_name
+        )
+        for module_name in Qt._common_members.keys()
+    ]
+
+
+ATTRIBUTE_EXPRESSIONS = _cascade(
+    r"^(?P<module>{modules})\.(?P<widget>(?:{widgets})(?:[.\[(].*)?)$",
+    re.MULTILINE
+)
+MAPPING_EXPRESSIONS = _cascade(
+    r"(?P<module>{modules})\.(?P<widget>{widgets})$"
+)
+
+
+def _cascade_attribute(text):
+    for expression, module_name in ATTRIBUTE_EXPRESSIONS:
+        modified = expression.sub(r"{}.\2".format(module_name), text)
+        if modified != text:
+            return module_name, modified
+    return None, text
+
+
+def _cascade_mapping(mapping):
+    for expression, module_name in MAPPING_EXPRESSIONS:
+        mapping = expression.sub(r"{}.\2".format(module_name), mapping)
+    return mapping
+
+
+def _sources():
+    members = [
+        member
+        for module_name in Qt._common_members
+        for member in Qt._common_members[module_name]
+    ]
+    for module_name in Qt._common_members:
+        for member in members:
+            yield "{}.{}".format(module_name, member)
+    yield "QtGui.QNotAMember"
+    yield "NotAModule.QWidget"
+    yield "QtGui"
+
+
+def test_attributes_match_cascade():
+    suffixes = ["", "(parent)", ".staticMetaObject", "[0]", "Suffix()"]
+    for source in _sources():
+        for suffix in suffixes:
+            text = source + suffix
+            matched = any(
+                expression.match(text)
+                for expression, _ in ATTRIBUTE_EXPRESSIONS
+            )
+            assert is_common_member(text) == bool(matched), text
+            assert convert_attribute(text) == _cascade_attribute(text), text
+
+
+def test_multiline_attributes_match_cascade():
+    for text in (
+        "QtGui.QWidget(\nQtCore.QObject())",
+        "QtCore.QObject(\nQtGui.QLineEdit(),\nQtGui.QWidget())",
+        "QtWidgets.QWidget(\n    QtGui.QLineEdit())",
+    ):
+        assert convert_attribute(text) == _cascade_attribute(text), text
+
+
+def test_mappings_match_cascade():
+    sources = list(_sources())
+    sources += ["Qt." + source for source in sources]
+    sources += ["MyQtGui.QWidget", "QWidget"]
+    mappings = dict((source, source) for source in sources)
+    converted = convert_mappings({}, dict(mappings))
+    for source in sources:
+        assert converted[source] == _cascade_mapping(source), source
+
+
+if __name__ == "__main__":
+    import traceback
+    _tests = filter(
+        lambda key: True if key.startswith("test_") else False,
+        globals().keys()
+    )
+
+    failed = []
+    for test in _tests:
+        try:
+            print("Running %s" % test)
+            globals()[test]()
+            print("    %s succeeded!" % test)
+        except AssertionError as err:
+            print("    %s failed!" % test)
+            failed.append((test, traceback.format_exc()))
+        print("")
+    for failure_name, failure_error in failed:
+        print("""
+------------ %s FAILED ------------
+%s
+""" % (failure_name, failure_error))
+
+    print(
+        "\n\n%d failures, %d success, %s%%" % (
+            len(failed),
+            len(_tests)-len(failed),
+            "%.1f" % ((float(len(_tests)-len(failed))/len(_tests))*100)
+        )
+    )
@@ -0,0 +1,271 @@
+import re
+
+import baron
+import redbaron
+
+from qt_py_convert.node_index import NodeIndex, _render_items
+
+
+SOURCE = """from PyQt4 import QtGui
+
+w = QtGui.QWidget(QtGui.QWidget())
+d = QtGui.QDialog
+QWidget = w.QWidget
+b = QtGui.QWidget[0].parent()
+"""
+
+
+def _regex(key):
+    return re.compile(r"{}(?:[\.\[\(].*)?$".format(key), re.DOTALL)
+
+
+def _find_dotted(red, key):
+    nodes = red.find_all("AtomTrailersNode")
+    nodes += red.find_all("DottedNameNode")
+    return [node for node in nodes if _regex(key).match(node.dumps())]
+
+
+def _names(index, key):
+    return [
+        node for node in index.find_name(key)
+        if node.type == "name" and node.value == key
+    ]
+
+
+def _dotted(index, key):
+    return [
+        node for node in index.find_name(key)
+        if node.type in NodeIndex.DOTTED_TYPES and
+        _regex(key).match(node.dumps())
+    ]
+
+
+def test_name_lookup_matches_find_all():
+    red = redbaron.RedBaron(SOURCE)
+    index = NodeIndex(red)
+    for key in ("QtGui", "QWidget", "w"):
+        expected = red.find_all("NameNode", value=key)
+        assert _names(index, key) == list(expected), key
+
+
+def test_dotted_lookup_matches_find_all():
+    red = redbaron.RedBaron(SOURCE)
+    index = NodeIndex(red)
+    for key in ("QtGui.QWidget", "QtGui.QDialog", "w.QWidget"):
+        assert _dotted(index, key) == _find_dotted(red, key), key
+
+
+def test_index_follows_replacements():
+    red = redbaron.RedBaron(SOURCE)
+    index = NodeIndex(red)
+    for node in index.find_name("QtGui"):
+        if node.parent_find("FromImportNode"):
+            continue
+        index.replace(node, "QtWidgets")
+    assert _names(index, "QtGui") == list(red.find_all("NameNode", "QtGui"))
+    key = "QtWidgets.QWidget"
+    assert _dotted(index, key) == _find_dotted(red, key)
+    assert len(_find_dotted(red, key)) == 3
+
+
+
+def test_find_all_matches_red():
+    red = redbaron.RedBaron(SOURCE)
+    index = NodeIndex(red)
+    for identifier in ("NameNode", "AtomTrailersNode", "FromImportNode"):
+        assert index.find_all(identifier) == list(red.find_all(identifier))
+    assert index.find_all("NameNode", value="w") == \
+        list(red.find_all("NameNode", value="w"))
+
+
+def test_find_all_after_remove():
+    red = redbaron.RedBaron(SOURCE)
+    index = NodeIndex(red)
+    index.remove(index.find_all("FromImportNode")[0])
+    assert index.find_all("FromImportNode") == []
+    assert index.find_all("NameNode") == list(red.find_all("NameNode"))
+
+
+
+def test_dumps_follows_replacements():
+    red = redbaron.RedBaron(SOURCE)
+    index = NodeIndex(red)
+    assignment = index.find_all("AssignmentNode")[0]
+    call = index.find_all("AtomTrailersNode")[0]
+    assert index.dumps(assignment) == assignment.dumps()
+    assert index.dumps(call.value) == call.value.dumps()
+
+    index.replace(call.value[0], "QtWidgets")
+    assert index.dumps(assignment) == assignment.dumps()
+    assert index.dumps(call.value) == call.value.dumps()
+    assert index.dumps(call).startswith("QtWidgets.QWidget(QtGui")
+
+
+def test_lines_match_bounding_box():
+    source = SOURCE + "c = QtGui.QLabel(\n    'text',\n)\n"
+    red = redbaron.RedBaron(source)
+    index = NodeIndex(red)
+    for identifier in ("NameNode", "AtomTrailersNode", "AssignmentNode"):
+        for node in red.find_all(identifier):
+            box = node.absolute_bounding_box
+            assert index.lines(node) == \
+                (box.top_left.line, box.bottom_right.line), node.dumps()
+    call = index.find_all("AtomTrailersNode")[-1]
+    assert index.lines(call) == (7, 9)
+    assert index.lines(call.value) == (7, 9)
+
+
+def test_lines_after_replacement():
+    red = redbaron.RedBaron(SOURCE)
+    index = NodeIndex(red)
+    call = index.find_all("AtomTrailersNode")[0]
+    index.replace(call.value[0], "QtWidgets")
+    assert index.lines(call) == (3, 3)
+    assert index.lines(call.value[0]) == (3, 3)
+
+
+def test_replace_matches_redbaron():
+    red = redbaron.RedBaron(SOURCE)
+    expected = redbaron.RedBaron(SOURCE)
+    index = NodeIndex(red)
+    replacements = (
+        ("NameNode", "QtWidgets"),
+        ("AtomTrailersNode", "QtWidgets.QWidget(None)"),
+    )
+    for identifier, text in replacements:
+        for node, other in zip(
+                index.find_all(identifier), expected.find_all(identifier)):
+            index.replace(node, text)
+            other.replace(text)
+        assert red.dumps() == expected.dumps()
+        assert index.find_all(identifier) == list(red.find_all(identifier))
+    assert [node.type for node in red.find_all("AtomTrailersNode")] == \
+        [node.type for node in expected.find_all("AtomTrailersNode")]
+
+
+# Has most kinds of node, with the keys that baron leaves out when they are
+#   not set.
+KINDS = """# comment
+@QtCore.pyqtSlot(int, name="slot")
+def f(a, b=1, *args, **kwargs):
+    \"\"\"doc\"\"\"
+    global g
+    print >> sys.stderr, a,
+    x = [i for i in a if i] + {k: v for k, v in b} or (lambda y=2: -y)
+    try:
+        del x[1:2, ::3]
+    except (IOError, OSError) as err:
+        raise ValueError, err
+    else:
+        pass
+    finally:
+        return
+    with open(a) as fh, b:
+        exec "x" in {}
+    while not x:
+        yield x if x else `a`
+    for i, j in x:
+        assert i, j
+    else:
+        continue
+class C(QtGui.QWidget, object):
+    x = 1 if a is not b else u'b' r"c"
+    if a: pass
+    elif b in c: x += 1
+    else: import os.path as p, sys
+"""
+
+
+def _rebuilt(node, rendered=True):
+    """node.dumps(), from the parts that _render_items gives."""
+    parts = []
+    for part in _render_items(node, rendered):
+        if isinstance(part, tuple):
+            parts.append(_rebuilt(*part))
+        elif rendered:
+            parts.append(part)
+    return "".join(parts)
+
+
+def test_render_items_match_dumps():
+    # NodeIndex reads the tree through redbaron's Node._render. A redbaron
+    #   that changes it has to fail here instead of giving wrong lines and
+    #   source.
+    red = redbaron.RedBaron(KINDS)
+    assert "".join(_rebuilt(node) for node in red.node_list) == KINDS
+    for node in red.find_all(None):
+        assert _rebuilt(node) == node.dumps(), node.type
+
+
+def test_replace_node_matches_redbaron():
+    # NodeIndex._replace_node builds a node again in place from a cached
+    #   fst, with redbaron's class names and Node.__init__. A redbaron that
+    #   changes those has to fail here instead of corrupting replacements.
+    texts = (
+        "QtWidgets.QWidget(None)", "QtCompat.wrapInstance", "QtCore.Qt[0]",
+        "None", "1", "'text'", "a + b", "[a, b]", "(a, b)", "{a: b}",
+        "lambda: a", "not a",
+    )
+    source = "".join(
+        "x{} = f(QtGui.QWidget, QtGui.QWidget)\n".format(number)
+        for number in range(len(texts))
+    )
+    red = redbaron.RedBaron(source)
+    expected = redbaron.RedBaron(source)
+    index = NodeIndex(red)
+    calls = index.find_all("CallNode")
+    others = expected.find_all("CallNode")
+    for text, call, other in zip(texts, calls, others):
+        for argument, other_argument in zip(call.value, other.value):
+            index.replace(argument.value, text)
+            other_argument.value.replace(text)
+            node = argument.value
+            assert type(node) is type(other_argument.value), text
+            assert node.fst() == other_argument.value.fst(), text
+            assert node.parent is argument
+            assert node.on_attribute == "value"
+            for child in node.find_all(None):
+                assert child.root is red, (text, child.type)
+        assert red.dumps() == expected.dumps()
+
+        # Both arguments are built from the same cached fst, changing one
+        #   must not change the other or the cache.
+        first, second = [argument.value for argument in call.value]
+        for name in first.find_all("NameNode"):
+            name.value = "changed"
+        for name in other.value[0].value.find_all("NameNode"):
+            name.value = "changed"
+        assert second.dumps() == text
+        assert index._parsed[text] == baron.parse(text)[0]
+
+
+if __name__ == "__main__":
+    import traceback
+    _tests = filter(
+        lambda key: True if key.startswith("test_") else False,
+        globals().keys()
+    )
+
+    failed = []
+    for test in _tests:
+        try:
+            print("Running %s" % test)
+            globals()[test]()
+            print("    %s succeeded!" % test)
+        except AssertionError as err:
+            print("    %s failed!" % test)
+            failed.append((test, traceback.format_exc()))
+        print("")
+    for failure_name, failure_error in failed:
+        print("""
+------------ %s FAILED ------------
+%s
+""" % (failure_name, failure_error))
+
+    print(
+        "\n\n%d failures, %d success, %s%%" % (
+            len(failed),
+            len(_tests)-len(failed),
+            "%.1f" % ((float(len(_tests)-len(failed))/len(_tests))*100)
+        )
+    )
@@ -0,0 +1,87 @@
+import redbaron
+
+import qt_py_convert.run
+from qt_py_convert.run import run
+
+
+PLAIN_SOURCE = """import os
+
+
+def main():
+    return os.getcwd()
+"""
+QT_SOURCE = """from PyQt4 import QtGui
+
+w = QtGui.QLineEdit()
+"""
+TOMETH_SOURCE = """value = thing.toString()
+"""
+
+
+def _run_counting_parses(source, **kwargs):
+    original_parser = qt_py_convert.run.redbaron.RedBaron
+    calls = []
+
+    def counting_parser(*args, **kwargs):
+        calls.append(args)
+        return original_parser(*args, **kwargs)
+
+    redbaron.RedBaron = counting_parser
+    try:
+        aliases, mappings, dumps = run(source, True, **kwargs)
+    finally:
+        redbaron.RedBaron = original_parser
+    return len(calls), aliases, mappings, dumps
+
+
+def test_prescan_skips_plain_file():
+    parses, aliases, mappings, dumps = _run_counting_parses(PLAIN_SOURCE)
+    assert parses == 0, "A file without Qt references should not be parsed."
+    assert dumps == PLAIN_SOURCE
+    assert mappings == {}
+    assert aliases["used"] == set()
+
+
+def test_prescan_parses_qt_file():
+    parses, aliases, mappings, dumps = _run_counting_parses(QT_SOURCE)
+    assert parses == 1
+    assert "QtWidgets.QLineEdit" in dumps
+
+
+def test_prescan_tometh_flag():
+    parses, _, _, _ = _run_counting_parses(TOMETH_SOURCE)
+    assert parses == 0
+    parses, _, _, _ = _run_counting_parses(TOMETH_SOURCE, tometh_flag=True)
+    assert parses == 1
+
+
+if __name__ == "__main__":
+    import traceback
+    _tests = filter(
+        lambda key: True if key.startswith("test_") else False,
+        globals().keys()
+    )
+
+    failed = []
+    for test in _tests:
+        try:
+            print("Running %s" % test)
+            globals()[test]()
+            print("    %s succeeded!" % test)
+        except AssertionError as err:
+            print("    %s failed!" % test)
+            failed.append((test, traceback.format_exc()))
+        print("")
+    for failure_name, failure_error in failed:
+        print("""
+------------ %s FAILED ------------
+%s
+""" % (failure_name, failure_error))
+
+    print(
+        "\n\n%d failures, %d success, %s%%" % (
+            len(failed),
+            len(_tests)-len(failed),
+            "%.1f" % ((float(len(_tests)-len(failed))/len(_tests))*100)
+        )
+    )
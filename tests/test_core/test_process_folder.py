@@ -0,0 +1,198 @@
+import os
+import shutil
+import tempfile
+import time
+
+from qt_py_convert import run as run_module
+from qt_py_convert.run import process_folder, process_files, \
+    TIMEOUT_SKIP, TIMEOUT_TOKENS
+from qt_py_convert.general import WriteFlag
+
+
+SOURCES = {
+    "widget.py": (
+        "from PyQt4 import QtGui\n"
+        "\n"
+        "w = QtGui.QLineEdit()\n",
+        "from Qt import QtWidgets\n"
+        "\n"
+        "w = QtWidgets.QLineEdit()\n",
+    ),
+    "core.py": (
+        "from PySide.QtCore import QObject\n"
+        "\n"
+        "o = QObject()\n",
+        "from Qt import QtCore\n"
+        "\n"
+        "o = QtCore.QObject()\n",
+    ),
+    "plain.py": (
+        "import os\n"
+        "\n"
+        "print(os.getcwd())\n",
+        "import os\n"
+        "\n"
+        "print(os.getcwd())\n",
+    ),
+    os.path.join("sub", "nested.py"): (
+        "from PyQt4.QtGui import QLineEdit\n"
+        "\n"
+        "l = QLineEdit()\n",
+        "from Qt import QtWidgets\n"
+        "\n"
+        "l = QtWidgets.QLineEdit()\n",
+    ),
+}
+
+
+def check_folder(jobs, **kwargs):
+    folder = tempfile.mkdtemp()
+    try:
+        for name, (source, _) in SOURCES.items():
+            fp = os.path.join(folder, name)
+            if not os.path.isdir(os.path.dirname(fp)):
+                os.makedirs(os.path.dirname(fp))
+            with open(fp, "wb") as fh:
+                fh.write(source)
+
+        results = process_folder(
+            folder,
+            recursive=True,
+            write_mode=WriteFlag.WRITE_TO_FILE,
+            skip_lineno=True,
+            jobs=jobs,
+            **kwargs
+        )
+        for name, (_, dest) in SOURCES.items():
+            with open(os.path.join(folder, name), "rb") as fh:
+                assert fh.read() == dest, "%s was not converted" % name
+        return results
+    finally:
+        shutil.rmtree(folder)
+
+
+def test_process_folder_serial():
+    results = check_folder(jobs=1)
+    assert len(results) == len(SOURCES)
+
+
+def test_process_folder_parallel():
+    serial = check_folder(jobs=1)
+    parallel = check_folder(jobs=3)
+    assert [os.path.basename(r.path) for r in serial] == \
+        [os.path.basename(r.path) for r in parallel]
+    for lhs, rhs in zip(serial, parallel):
+        assert lhs.aliases["used"] == rhs.aliases["used"]
+        assert lhs.mappings == rhs.mappings
+        assert lhs.errors == rhs.errors
+
+
+def test_process_folder_recycled():
+    serial = check_folder(jobs=1)
+    for kwargs in ({"max_files_per_worker": 1}, {"max_rss": 1}):
+        recycled = check_folder(jobs=2, **kwargs)
+        assert [os.path.basename(r.path) for r in serial] == \
+            [os.path.basename(r.path) for r in recycled]
+        for result in recycled:
+            assert result.peak_rss > 0
+
+
+
+def test_file_timeout():
+    source, dest = SOURCES["widget.py"]
+    run = run_module.run
+
+    def _slow_run(text, **kwargs):
+        # The workers are forked, so they use this too.
+        if kwargs.get("engine") != run_module._ENGINE_TOKENS_ONLY:
+            time.sleep(30)
+        return run(text, **kwargs)
+
+    folder = tempfile.mkdtemp()
+    run_module.run = _slow_run
+    try:
+        fp = os.path.join(folder, "widget.py")
+        for fallback, expected in ((TIMEOUT_SKIP, source),
+                                   (TIMEOUT_TOKENS, dest)):
+            with open(fp, "wb") as fh:
+                fh.write(source)
+            results = process_files(
+                [fp],
+                write_mode=WriteFlag.WRITE_TO_FILE,
+                skip_lineno=True,
+                file_timeout=0.2,
+                timeout_fallback=fallback,
+            )
+            assert [result.timed_out for result in results] == [True]
+            assert "ran out of" in results[0].errors[0]
+            with open(fp, "rb") as fh:
+                assert fh.read() == expected, fallback
+    finally:
+        run_module.run = run
+        shutil.rmtree(folder)
+
+
+def test_worker_died():
+    run = run_module.run
+
+    def _crashing_run(text, **kwargs):
+        # Like a worker that is killed for running out of memory.
+        if "QLineEdit" in text:
+            os._exit(9)
+        return run(text, **kwargs)
+
+    folder = tempfile.mkdtemp()
+    run_module.run = _crashing_run
+    try:
+        files = []
+        for name in ("widget.py", "core.py"):
+            files.append(os.path.join(folder, name))
+            with open(files[-1], "wb") as fh:
+                fh.write(SOURCES[name][0])
+        results = process_files(
+            files,
+            write_mode=WriteFlag.WRITE_TO_FILE,
+            skip_lineno=True,
+            max_files_per_worker=1,
+        )
+        assert [result.path for result in results] == files
+        assert "exit code 9" in results[0].errors[0]
+        assert not results[1].errors
+        for name, fp in zip(("widget.py", "core.py"), files):
+            with open(fp, "rb") as fh:
+                assert fh.read() == SOURCES[name][name == "core.py"]
+    finally:
+        run_module.run = run
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    import traceback
+    _tests = filter(
+        lambda key: True if key.startswith("test_") else False,
+        globals().keys()
+    )
+
+    failed = []
+    for test in _tests:
+        try:
+            print("Running %s" % test)
+            globals()[test]()
+            print("    %s succeeded!" % test)
+        except AssertionError as err:
+            print("    %s failed!" % test)
+            failed.append((test, traceback.format_exc()))
+        print("")
+    for failure_name, failure_error in failed:
+        print("""
+------------ %s FAILED ------------
+%s
+""" % (failure_name, failure_error))
+
+    print(
+        "\n\n%d failures, %d success, %s%%" % (
+            len(failed),
+            len(_tests)-len(failed),
+            "%.1f" % ((float(len(_tests)-len(failed))/len(_tests))*100)
+        )
+    )
@@ -0,0 +1,96 @@
+from qt_py_convert.profiling import ConversionProfile, build_report
+from qt_py_convert.run import run, FileResult
+
+
+SOURCE = """from PyQt4 import QtGui, QtCore
+
+w = QtGui.QLineEdit()
+s = QtCore.QString("text")
+"""
+
+
+def _profile(source):
+    profile = ConversionProfile()
+    run(source, skip_lineno=True, profile=profile)
+    return profile
+
+
+def test_stages_are_recorded():
+    profile = _profile(SOURCE)
+    names = [entry["name"] for entry in profile.stages]
+    assert names == [
+        "parse",
+        "from_imports",
+        "imports",
+        "misplaced_members",
+        "convert_mappings",
+        "psep0101.QSTRING_PROCESS",
+        "psep0101",
+        "_convert_body",
+        "_convert_root_name_imports",
+        "_convert_attributes",
+        "_cleanup_imports",
+        "unsupported",
+        "dumps",
+    ], names
+    stages = dict((entry["name"], entry) for entry in profile.stages)
+    assert stages["psep0101.QSTRING_PROCESS"]["parent"] == "psep0101"
+    assert stages["psep0101"]["replacements"] == \
+        stages["psep0101.QSTRING_PROCESS"]["replacements"] == 1
+    assert stages["parse"]["nodes"] > 0
+    assert stages["dumps"]["replacements"] == 0
+
+
+def test_nothing_is_recorded_without_qt():
+    assert _profile("import os\n").stages == []
+
+
+def test_report_totals():
+    results = [
+        FileResult("a.py", profile=_profile(SOURCE).stages),
+        None,
+        FileResult("b.py"),
+        FileResult("c.py", profile=_profile(SOURCE).stages),
+    ]
+    report = build_report(results)
+    assert [entry["path"] for entry in report["files"]] == ["a.py", "c.py"]
+    totals = dict((entry["name"], entry) for entry in report["stages"])
+    assert totals["psep0101"]["calls"] == 2
+    assert totals["psep0101"]["replacements"] == 2
+    for entry in report["files"]:
+        assert entry["seconds"] == sum(
+            stage["seconds"] for stage in entry["stages"]
+            if stage["parent"] is None
+        )
+
+
+if __name__ == "__main__":
+    import traceback
+    _tests = filter(
+        lambda key: True if key.startswith("test_") else False,
+        globals().keys()
+    )
+
+    failed = []
+    for test in _tests:
+        try:
+            print("Running %s" % test)
+            globals()[test]()
+            print("    %s succeeded!" % test)
+        except AssertionError as err:
+            print("    %s failed!" % test)
+            failed.append((test, traceback.format_exc()))
+        print("")
+    for failure_name, failure_error in failed:
+        print("""
+------------ %s FAILED ------------
+%s
+""" % (failure_name, failure_error))
+
+    print(
+        "\n\n%d failures, %d success, %s%%" % (
+            len(failed),
+            len(_tests)-len(failed),
+            "%.1f" % ((float(len(_tests)-len(failed))/len(_tests))*100)
+        )
+    )
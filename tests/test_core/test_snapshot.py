@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+
+import qt_py_convert
+from qt_py_convert import external
+from qt_py_convert.external import snapshot
+
+
+def test_round_trip():
+    qt = snapshot.import_qt_py()
+    module = snapshot.loads(snapshot.dumps(qt))
+    for name, value in snapshot.tables(qt):
+        assert getattr(module, name) == value, name
+    # The conversions look the modules up in this order.
+    assert module._common_members.keys() == qt._common_members.keys()
+    assert module._misplaced_members["PyQt4"]["QtGui.QStringListModel"] \
+        == "QtCore.QStringListModel"
+    assert module._misplaced_members["PySide"]["shiboken.wrapInstance"] \
+        == "QtCompat.wrapInstance"
+
+
+def test_snapshot_is_current():
+    with open(snapshot.SNAPSHOT_PATH, "rb") as fh:
+        assert fh.read() == snapshot.dumps(snapshot.import_qt_py()), \
+            "Run python -m qt_py_convert.external.snapshot"
+
+
+def test_loads_without_qt_py():
+    if os.environ.get(snapshot.IMPORT_QT_PY_ENV) != "1":
+        assert external.Qt.__name__ == "qt_py_convert.external._qt_snapshot"
+    env = dict(os.environ)
+    env.pop("QT_PREFERRED_BINDING", None)
+    env.pop(snapshot.IMPORT_QT_PY_ENV, None)
+    # Without the folder that Qt.py is installed in.
+    env["PYTHONPATH"] = os.path.dirname(
+        os.path.dirname(os.path.abspath(qt_py_convert.__file__))
+    )
+    output = subprocess.check_output(
+        [
+            sys.executable, "-c",
+            "import sys\n"
+            "from qt_py_convert.run import run\n"
+            "print(run('from PyQt4 import QtGui\\nQtGui.QWidget()\\n')[2])\n"
+            "print(any(name.endswith('Qt_py') for name in sys.modules))\n"
+        ],
+        env=env
+    )
+    assert output.splitlines() == [
+        "from Qt import QtWidgets", "QtWidgets.QWidget()", "", "False"
+    ], output
+
+
+if __name__ == "__main__":
+    import traceback
+    _tests = filter(
+        lambda key: True if key.startswith("test_") else False,
+        globals().keys()
+    )
+
+    failed = []
+    for test in _tests:
+        try:
+            print("Running %s" % test)
+            globals()[test]()
+            print("    %s succeeded!" % test)
+        except AssertionError as err:
+            print("    %s failed!" % test)
+            failed.append((test, traceback.format_exc()))
+        print("")
+    for failure_name, failure_error in failed:
+        print("""
+------------ %s FAILED ------------
+%s
+""" % (failure_name, failure_error))
+
+    print(
+        "\n\n%d failures, %d success, %s%%" % (
+            len(failed),
+            len(_tests)-len(failed),
+            "%.1f" % ((float(len(_tests)-len(failed))/len(_tests))*100)
+        )
+    )
@@ -0,0 +1,208 @@
+from qt_py_convert import token_engine
+from qt_py_convert.run import run, ENGINE_REDBARON, ENGINE_TOKENS
+
+
+CONVERTED = [
+    """from PyQt4 import QtGui, QtCore
+
+class Window(QtGui.QWidget):
+    changed = QtCore.pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super(Window, self).__init__(parent)
+        self.model = QtGui.QStringListModel()
+        layout = QtGui.QHBoxLayout(QtGui.QWidget(QtCore.QObject()))
+        layout.addWidget(QtGui.QLabel("QtGui.QLabel"))  # QtGui.QLabel
+        self.setWindowTitle(QtGui.QApplication.translate("a", "b"))
+""",
+    """import os
+from PyQt4 import QtGui
+from PyQt4 import QtCore
+
+x = QtCore.QObject()
+y = QtGui.QWidget (1)
+""",
+    """from PyQt5 import QtGui, QtWidgets
+@QtCore.pyqtSlot(QtGui.QWidget)
+def f():
+    pass
+x = QtWidgets.QWidget(
+QtGui.QLabel())
+""",
+    """def f():
+    pass
+from PySide import QtGui
+
+
+class A(QtGui.QWidget):
+    pass
+from PySide import QtCore
+
+
+QtCore.QObject
+""",
+    "from PySide2 import QtGui, QtWidgets\r\n"
+    "QtWidgets.QWidget\r\nQtGui.QColor\r\n",
+    "import os\nfrom PyQt4 import QtGui\n\nx = 1\n",
+    "x = QtGui.QWidget()\n",
+    "from PyQt4 import QtGui\nx = sip.wrapinstance(1, QtGui.QWidget)\n",
+]
+
+# Files that end in a block, which redbaron lays out again when it removes
+#   an import.
+CONVERTED_BLOCKS = [
+    """import sys
+from PyQt4 import QtGui
+from PyQt4 import QtCore
+
+
+def main():
+    app = QtGui.QApplication(sys.argv)
+    window = QtGui.QWidget()
+    window.show()
+    sys.exit(app.exec_())
+
+
+if __name__ == "__main__":
+    main()
+""",
+    """from PyQt4 import QtGui
+import sip
+if x: y = QtGui.QWidget()
+else: y = None
+
+""",
+    """from PyQt4 import QtGui
+if x:
+    y = QtGui.QWidget()
+import sip
+""",
+    """from PyQt4 import QtGui
+from PyQt4 import QtCore
+class Window(QtGui.QWidget):
+    def event(self, event):
+        for child in self.children():
+            pass
+        else:
+            return QtCore.QObject.event(self, event)
+""",
+]
+
+# One for each of the other imports that the engine converts.
+CONVERTED_IMPORTS = [
+    """import PySide.QtCore as QtCore
+from PySide import QtGui
+
+x = QtGui.QWidget(QtCore.QObject())
+y = QtCore
+""",
+    """import PyQt4.QtGui as Gui
+x = 1
+Gui.qApp.quit()
+f(Gui=Gui.QLineEdit(Gui.QLabel()))
+@Gui.pyqtSlot()
+def g(Gui=None):
+    return Gui
+""",
+    """import PyQt4.QtGui
+import PyQt4.QtCore
+x = PyQt4.QtGui.QWidget(PyQt4.QtCore.QObject())
+""",
+    """import sip
+from PyQt4 import QtGui
+x = sip.wrapinstance(long(1), QtGui.QWidget)
+sip.delete(x)
+""",
+]
+
+FALLBACK = [
+    "from PyQt4 import QtGui\nx = QtGui.QString()\n",
+    "from PyQt4 import QtGui as Gui\n",
+    "from PyQt4.QtGui import QWidget\n",
+    "from PyQt4 import QtGui\nfrom PySide import QtCore\n",
+    "import PyQt4.QtGui\n",
+    "from Qt import QtCore\n",
+    "x = Qt.QtCore.QObject()\n",
+    "from PyQt4 import QtGui\n",
+    "from PyQt4 import QtGui\nx = QtGui.QWidget()",
+    "import PyQt4.QtGui as QtGui, os\n",
+    "import PyQt4.QtGui as Gui\ndef Gui():\n    pass\nx = 1\n",
+    "import sip as s\nfrom PyQt4 import QtGui\nx = QtGui.QWidget()\n",
+    # redbaron puts statements joined with ";" on lines of their own when
+    #   it removes an import.
+    "from PyQt4 import QtGui\nfrom PyQt4 import QtCore\na = 1; b = 2\n"
+    "w = QtGui.QWidget()\n",
+    # And it dedents the top-level lines of whitespace and comments, and the
+    #   except of a def that ends in a try.
+    "import sip\nfrom PyQt4 import QtGui\nw = QtGui.QWidget()\n    \nx = 1\n",
+    "import sip\nfrom PyQt4 import QtGui\nw = QtGui.QWidget()\n  # x\nx = 1\n",
+    """import sip
+from PyQt4 import QtGui
+
+
+def main():
+    try:
+        w = QtGui.QWidget()
+    except RuntimeError:
+        pass
+""",
+]
+
+
+def test_same_as_redbaron():
+    for source in CONVERTED + CONVERTED_BLOCKS + CONVERTED_IMPORTS:
+        aliases, mappings, code = run(
+            source, skip_lineno=True, engine=ENGINE_REDBARON
+        )
+        converted = token_engine.convert(source)
+        assert converted is not None, source
+        token_aliases, token_mappings, token_code = converted
+        assert token_code == code, (source, code, token_code)
+        assert token_mappings == mappings
+        for key in ("bindings", "root_aliases", "used"):
+            assert token_aliases[key] == aliases[key], key
+
+
+def test_falls_back():
+    for source in FALLBACK:
+        assert token_engine.convert(source) is None, source
+        assert run(source, skip_lineno=True, engine=ENGINE_TOKENS)[2] == \
+            run(source, skip_lineno=True, engine=ENGINE_REDBARON)[2]
+
+
+def test_tometh_falls_back():
+    source = "from PyQt4 import QtCore\nx = QtCore.QObject().toBool()\n"
+    assert token_engine.convert(source) is not None
+    assert token_engine.convert(source, tometh_flag=True) is None
+
+
+if __name__ == "__main__":
+    import traceback
+    _tests = filter(
+        lambda key: True if key.startswith("test_") else False,
+        globals().keys()
+    )
+
+    failed = []
+    for test in _tests:
+        try:
+            print("Running %s" % test)
+            globals()[test]()
+            print("    %s succeeded!" % test)
+        except AssertionError as err:
+            print("    %s failed!" % test)
+            failed.append((test, traceback.format_exc()))
+        print("")
+    for failure_name, failure_error in failed:
+        print("""
+------------ %s FAILED ------------
+%s
+""" % (failure_name, failure_error))
+
+    print(
+        "\n\n%d failures, %d success, %s%%" % (
+            len(failed),
+            len(_tests)-len(failed),
+            "%.1f" % ((float(len(_tests)-len(failed))/len(_tests))*100)
+        )
+    )
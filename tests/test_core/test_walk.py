@@ -0,0 +1,185 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from StringIO import StringIO
+
+from qt_py_convert.walk import python_files, changed_files, filter_files, \
+    read_file_list, GitError
+
+
+FILES = [
+    "a.py",
+    "script",
+    "data.txt",
+    "pkg/b.py",
+    "pkg/sub/c.py",
+    "pkg/tests/test_b.py",
+    "z.py",
+    ".git/hooks/hook.py",
+    "build/lib/a.py",
+    "venv/lib/site.py",
+]
+
+
+def _make_tree():
+    folder = tempfile.mkdtemp()
+    for name in FILES:
+        fp = os.path.join(folder, name)
+        if not os.path.isdir(os.path.dirname(fp)):
+            os.makedirs(os.path.dirname(fp))
+        with open(fp, "wb") as fh:
+            if name == "script":
+                fh.write("#!/usr/bin/env python\nimport os\n")
+            else:
+                fh.write("import os\n")
+    return folder
+
+
+def _relative(folder, files):
+    return [os.path.relpath(fp, folder).replace(os.sep, "/") for fp in files]
+
+
+def test_python_files():
+    folder = _make_tree()
+    try:
+        files = python_files(folder, recursive=True)
+        assert _relative(folder, files) == [
+            "a.py", "script", "z.py",
+            "pkg/b.py", "pkg/sub/c.py", "pkg/tests/test_b.py",
+        ]
+        files = python_files(folder)
+        assert _relative(folder, files) == ["a.py", "script", "z.py"]
+    finally:
+        shutil.rmtree(folder)
+
+
+def test_python_files_exclude():
+    folder = _make_tree()
+    try:
+        files = python_files(
+            folder, recursive=True, exclude=["tests", "pkg/sub/*", "z*"]
+        )
+        assert _relative(folder, files) == ["a.py", "script", "pkg/b.py"]
+        files = python_files(folder, recursive=True, default_excludes=False)
+        assert "build/lib/a.py" in _relative(folder, files)
+        assert ".git/hooks/hook.py" in _relative(folder, files)
+    finally:
+        shutil.rmtree(folder)
+
+
+def test_python_files_symlinks():
+    folder = _make_tree()
+    try:
+        os.symlink(os.path.join(folder, "pkg"), os.path.join(folder, "link"))
+        # A loop back up the tree.
+        os.symlink(folder, os.path.join(folder, "pkg", "up"))
+        files = _relative(folder, python_files(folder, recursive=True))
+        assert not [fp for fp in files if "link" in fp or "up" in fp]
+
+        files = _relative(
+            folder, python_files(folder, recursive=True, follow_symlinks=True)
+        )
+        assert "link/b.py" in files
+        assert len(files) == len(set(
+            os.path.realpath(os.path.join(folder, fp)) for fp in files
+        ))
+    finally:
+        shutil.rmtree(folder)
+
+
+
+def test_read_file_list():
+    assert read_file_list(StringIO("a.py\r\nb c.py\n\n")) == \
+        ["a.py", "b c.py"]
+    assert read_file_list(StringIO("a.py\0new\nline.py\0")) == \
+        ["a.py", "new\nline.py"]
+
+
+def test_filter_files():
+    folder = _make_tree()
+    try:
+        paths = [os.path.join(folder, name) for name in FILES]
+        paths.append(paths[0])
+        paths.append(os.path.join(folder, "missing.py"))
+        files = filter_files(paths, exclude=["sub"])
+        assert _relative(folder, files) == [
+            "a.py", "script", "pkg/b.py", "pkg/tests/test_b.py", "z.py",
+        ]
+    finally:
+        shutil.rmtree(folder)
+
+
+def _git(folder, *args):
+    subprocess.check_call(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@test"] +
+        list(args),
+        cwd=folder,
+        stdout=open(os.devnull, "wb")
+    )
+
+
+def test_changed_files():
+    folder = _make_tree()
+    try:
+        _git(folder, "init", "-q")
+        with open(os.path.join(folder, ".gitignore"), "wb") as fh:
+            fh.write("ignored.py\n")
+        _git(folder, "add", "a.py", "z.py", "pkg", ".gitignore")
+        _git(folder, "commit", "-q", "-m", "initial")
+
+        with open(os.path.join(folder, "a.py"), "ab") as fh:
+            fh.write("import sys\n")
+        with open(os.path.join(folder, "ignored.py"), "wb") as fh:
+            fh.write("import sys\n")
+        _git(folder, "rm", "-q", "z.py")
+        _git(folder, "mv", "pkg/b.py", "pkg/renamed.py")
+
+        files = changed_files("HEAD", cwd=folder)
+        assert sorted(_relative(folder, files)) == sorted([
+            "a.py", "pkg/renamed.py", "script", "data.txt",
+            "build/lib/a.py", "venv/lib/site.py",
+        ])
+        files = changed_files("HEAD", paths=["pkg"], cwd=folder)
+        assert _relative(folder, files) == ["pkg/renamed.py"]
+
+        try:
+            changed_files("missing", cwd=folder)
+        except GitError:
+            pass
+        else:
+            assert False, "A missing ref should raise a GitError."
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    import traceback
+    _tests = filter(
+        lambda key: True if key.startswith("test_") else False,
+        globals().keys()
+    )
+
+    failed = []
+    for test in _tests:
+        try:
+            print("Running %s" % test)
+            globals()[test]()
+            print("    %s succeeded!" % test)
+        except AssertionError as err:
+            print("    %s failed!" % test)
+            failed.append((test, traceback.format_exc()))
+        print("")
+    for failure_name, failure_error in failed:
+        print("""
+------------ %s FAILED ------------
+%s
+""" % (failure_name, failure_error))
+
+    print(
+        "\n\n%d failures, %d success, %s%%" % (
+            len(failed),
+            len(_tests)-len(failed),
+            "%.1f" % ((float(len(_tests)-len(failed))/len(_tests))*100)
+        )
+    )
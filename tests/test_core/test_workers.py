@@ -0,0 +1,128 @@
+import os
+import time
+import timeit
+
+from qt_py_convert import workers
+
+
+def _pid(task):
+    return task, os.getpid()
+
+
+def _fail(task):
+    if task == 2:
+        raise ValueError("task %d" % task)
+    return task
+
+
+def _crash(task):
+    if task == 2:
+        os._exit(3)
+    return task
+
+
+def _slow(task):
+    if task == 1:
+        time.sleep(30)
+    return task
+
+
+def _slow_write(task):
+    with workers.protected():
+        time.sleep(1)
+    return task
+
+
+def _imap(func, tasks, processes, **kwargs):
+    return list(workers.imap(func, tasks, processes, **kwargs))
+
+
+def test_order():
+    results = _imap(_pid, range(20), 3)
+    assert [task for task, _ in results] == range(20)
+    assert os.getpid() not in [pid for _, pid in results]
+
+
+def test_max_files():
+    results = _imap(_pid, range(9), 2, max_files=2)
+    assert [task for task, _ in results] == range(9)
+    pids = [pid for _, pid in results]
+    assert len(set(pids)) == 5
+    for pid in set(pids):
+        assert pids.count(pid) <= 2
+
+
+def test_max_rss():
+    # Every worker holds more than a megabyte, so none of them is reused.
+    results = _imap(_pid, range(4), 1, max_rss=1)
+    assert len(set(pid for _, pid in results)) == 4
+
+
+def test_errors():
+    for func, message in ((_fail, "ValueError: task 2"), (_crash, "code 3")):
+        try:
+            _imap(func, range(4), 2)
+        except RuntimeError as err:
+            assert message in str(err), str(err)
+        else:
+            assert False, "%s did not raise" % func.__name__
+
+
+def test_exit():
+    results = _imap(
+        _crash, range(4), 2, on_exit=lambda task, code: (task, code)
+    )
+    assert results == [0, 1, (2, 3), 3]
+
+
+def test_timeout():
+    start = timeit.default_timer()
+    results = _imap(
+        _slow, range(4), 2, timeout=0.2, on_timeout=lambda task: -task
+    )
+    assert results == [0, -1, 2, 3]
+    assert timeit.default_timer() - start < 10
+
+
+def test_protected():
+    results = _imap(
+        _slow_write, range(2), 2, timeout=0.2, on_timeout=lambda task: None
+    )
+    assert results == [0, 1]
+
+
+def test_rss():
+    assert workers.current_rss() > 1024 * 1024
+    assert workers.peak_rss() > 1024 * 1024
+
+
+if __name__ == "__main__":
+    import traceback
+    _tests = filter(
+        lambda key: True if key.startswith("test_") else False,
+        globals().keys()
+    )
+
+    failed = []
+    for test in _tests:
+        try:
+            print("Running %s" % test)
+            globals()[test]()
+            print("    %s succeeded!" % test)
+        except AssertionError as err:
+            print("    %s failed!" % test)
+            failed.append((test, traceback.format_exc()))
+        print("")
+    for failure_name, failure_error in failed:
+        print("""
+------------ %s FAILED ------------
+%s
+""" % (failure_name, failure_error))
+
+    print(
+        "\n\n%d failures, %d success, %s%%" % (
+            len(failed),
+            len(_tests)-len(failed),
+            "%.1f" % ((float(len(_tests)-len(failed))/len(_tests))*100)
+        )
+    )
@@ -0,0 +1,129 @@
+import imp
+import os
+import shutil
+import tempfile
+import threading
+
+from qt_py_convert import daemon
+
+
+SOURCE = """from PyQt4 import QtGui
+
+w = QtGui.QLineEdit()
+"""
+
+_MAIN = imp.load_source(
+    "qt_py_convert_main",
+    os.path.join(
+        os.path.dirname(__file__), "..", "..", "src", "bin", "qt_py_convert"
+    )
+)
+
+
+def _tree():
+    folder = tempfile.mkdtemp()
+    os.makedirs(os.path.join(folder, "src", "pkg"))
+    with open(os.path.join(folder, "src", "pkg", "widget.py"), "wb") as fh:
+        fh.write(SOURCE)
+    with open(os.path.join(folder, "files.txt"), "wb") as fh:
+        fh.write("pkg/widget.py\n")
+    return folder
+
+
+def _written(root):
+    found = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            found.append(
+                os.path.relpath(os.path.join(dirpath, name), root)
+            )
+    return sorted(found)
+
+
+def _convert(folder, pathlist, name, **kwargs):
+    cwd = os.getcwd()
+    os.chdir(os.path.join(folder, "src"))
+    try:
+        _MAIN.main(
+            pathlist,
+            path=os.path.join(folder, name),
+            show_lines=False,
+            **kwargs
+        )
+    finally:
+        os.chdir(cwd)
+    with open(os.path.join(folder, "src", "pkg", "widget.py"), "rb") as fh:
+        assert fh.read() == SOURCE, "--write-path should not change the file."
+    return _written(os.path.join(folder, name))
+
+
+def test_write_path():
+    folder = _tree()
+    try:
+        files_from = os.path.join(folder, "files.txt")
+        # A listed file keeps its place under the current folder.
+        assert _convert(folder, [], "listed", files_from=files_from) == \
+            [os.path.join("pkg", "widget.py")]
+        # The files of a folder keep their place under it.
+        assert _convert(folder, ["pkg"], "folder") == ["widget.py"]
+        assert _convert(folder, ["pkg/widget.py"], "file") == ["widget.py"]
+
+        with open(os.path.join(folder, "listed", "pkg", "widget.py")) as fh:
+            assert "QtWidgets.QLineEdit()" in fh.read()
+    finally:
+        shutil.rmtree(folder)
+
+
+def test_write_path_through_server():
+    folder = _tree()
+    server = daemon.ConversionServer(os.path.join(folder, "server.sock"))
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    try:
+        files_from = os.path.join(folder, "files.txt")
+        assert _convert(
+            folder, [], "listed", files_from=files_from, client=True,
+            socket_path=server.socket_path
+        ) == [os.path.join("pkg", "widget.py")]
+        assert _convert(
+            folder, ["pkg"], "folder", client=True,
+            socket_path=server.socket_path
+        ) == ["widget.py"]
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    import traceback
+    _tests = filter(
+        lambda key: True if key.startswith("test_") else False,
+        globals().keys()
+    )
+
+    failed = []
+    for test in _tests:
+        try:
+            print("Running %s" % test)
+            globals()[test]()
+            print("    %s succeeded!" % test)
+        except AssertionError as err:
+            print("    %s failed!" % test)
+            failed.append((test, traceback.format_exc()))
+        print("")
+    for failure_name, failure_error in failed:
+        print("""
+------------ %s FAILED ------------
+%s
+""" % (failure_name, failure_error))
+
+    print(
+        "\n\n%d failures, %d success, %s%%" % (
+            len(failed),
+            len(_tests)-len(failed),
+            "%.1f" % ((float(len(_tests)-len(failed))/len(_tests))*100)
+        )
+    )